@@ -0,0 +1,59 @@
+"""
+Alembic environment. Uses the app's DATABASE_URL and models; when the app
+runs migrations itself (app.core.migrations) it passes in an open
+connection through config.attributes["connection"].
+"""
+from logging.config import fileConfig
+from alembic import context
+from app.core.config import settings
+from app.core.database import Base, engine
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+# Full-text search objects are created from FULLTEXT_DDL and not mapped;
+# keep autogenerate from proposing to drop them
+UNMAPPED = ("candidates_fts", "search_vector", "ix_candidates_search_vector", "search_rowid", "ix_candidates_search_rowid")
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (reflected and compare_to is None and name.startswith(UNMAPPED))
+
+def run_migrations_offline() -> None:
+    """Emit SQL to stdout instead of executing it (alembic upgrade --sql)"""
+    context.configure(
+        url=settings.database_url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        include_object=include_object,
+        render_as_batch=True
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_on(connection) -> None:
+    # Batch mode lets ALTERs run on SQLite by copying the table
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        render_as_batch=True
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        run_migrations_on(connection)
+        return
+    with engine.begin() as connection:
+        run_migrations_on(connection)
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,117 @@
+"""initial schema
+
+Tables exactly as Base.metadata.create_all built them before migrations
+existed. Databases created that way are stamped at this revision by
+app.core.migrations instead of running it, so nothing added since (the
+screening result cache, full-text search) may live here; see 0007.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 19:09:49.490422
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('organizations',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('domain', sa.String(length=255), nullable=True),
+    sa.Column('plan', sa.String(length=50), nullable=True),
+    sa.Column('industry', sa.String(length=100), nullable=True),
+    sa.Column('size', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('users',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('full_name', sa.String(length=255), nullable=True),
+    sa.Column('role', sa.String(length=50), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('organization_id', sa.Uuid(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table('jobs',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('organization_id', sa.Uuid(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('requirements', sa.JSON(), nullable=True),
+    sa.Column('location', sa.String(length=255), nullable=True),
+    sa.Column('job_type', sa.String(length=50), nullable=True),
+    sa.Column('experience_level', sa.String(length=50), nullable=True),
+    sa.Column('salary_min', sa.String(length=50), nullable=True),
+    sa.Column('salary_max', sa.String(length=50), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table('candidates',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=True),
+    sa.Column('phone', sa.String(length=50), nullable=True),
+    sa.Column('location', sa.String(length=255), nullable=True),
+    sa.Column('linkedin_url', sa.String(length=500), nullable=True),
+    sa.Column('linkedin_id', sa.String(length=255), nullable=True),
+    sa.Column('resume_url', sa.String(length=500), nullable=True),
+    sa.Column('resume_text', sa.Text(), nullable=True),
+    sa.Column('parsed_data', sa.JSON(), nullable=True),
+    sa.Column('skills', sa.JSON(), nullable=True),
+    sa.Column('experience_years', sa.String(length=20), nullable=True),
+    sa.Column('source', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('last_matched', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('linkedin_id')
+    )
+    op.create_index('ix_candidates_email', 'candidates', ['email'], unique=False)
+
+    op.create_table('applications',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('job_id', sa.Uuid(), nullable=False),
+    sa.Column('candidate_id', sa.Uuid(), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('ai_score', sa.Float(), nullable=True),
+    sa.Column('ai_analysis', sa.JSON(), nullable=True),
+    sa.Column('ai_screening_result', sa.JSON(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['candidate_id'], ['candidates.id'], ),
+    sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('applications')
+    if op.get_bind().dialect.name == 'sqlite':
+        # Left behind by 0006's downgrade
+        op.execute('DROP TABLE IF EXISTS candidates_fts')
+    op.drop_index('ix_candidates_email', table_name='candidates')
+    op.drop_table('candidates')
+    op.drop_table('jobs')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
+    op.drop_table('organizations')
@@ -0,0 +1,50 @@
+"""query indexes
+
+Composite and partial indexes for the hiring pipeline's hot queries:
+keyset pagination over (created_at, id), active jobs of an organization,
+a job's applicants by status and by match score, and applications still
+waiting for AI screening. IF NOT EXISTS because create_all may already
+have built some of them on databases stamped at 0001.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 19:20:11.108342
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_candidates_created', 'candidates', ['created_at', 'id'], if_not_exists=True)
+    op.create_index('ix_jobs_organization_created', 'jobs', ['organization_id', 'created_at', 'id'], if_not_exists=True)
+    op.create_index('ix_jobs_organization_status', 'jobs', ['organization_id', 'status', 'created_at', 'id'], if_not_exists=True)
+    op.create_index('ix_applications_created', 'applications', ['created_at', 'id'], if_not_exists=True)
+    op.create_index('ix_applications_job_created', 'applications', ['job_id', 'created_at', 'id'], if_not_exists=True)
+    op.create_index('ix_applications_candidate', 'applications', ['candidate_id'], if_not_exists=True)
+    op.create_index('ix_applications_job_status', 'applications', ['job_id', 'status'], if_not_exists=True)
+    op.create_index(
+        'ix_applications_job_score', 'applications', ['job_id', sa.text('ai_score DESC')], if_not_exists=True,
+        postgresql_where=sa.text('ai_score IS NOT NULL'), sqlite_where=sa.text('ai_score IS NOT NULL')
+    )
+    op.create_index(
+        'ix_applications_job_unscreened', 'applications', ['job_id'], if_not_exists=True,
+        postgresql_where=sa.text('ai_score IS NULL'), sqlite_where=sa.text('ai_score IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_applications_job_unscreened', table_name='applications')
+    op.drop_index('ix_applications_job_score', table_name='applications')
+    op.drop_index('ix_applications_job_status', table_name='applications')
+    op.drop_index('ix_applications_candidate', table_name='applications')
+    op.drop_index('ix_applications_job_created', table_name='applications')
+    op.drop_index('ix_applications_created', table_name='applications')
+    op.drop_index('ix_jobs_organization_status', table_name='jobs')
+    op.drop_index('ix_jobs_organization_created', table_name='jobs')
+    op.drop_index('ix_candidates_created', table_name='candidates')
@@ -0,0 +1,75 @@
+"""pipeline stats
+
+Table of per-job and per-organization application counts by status and
+score decile (app.services.pipeline_stats), filled from existing
+applications.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 20:02:37.512904
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+# Table stubs as of this revision, so the backfill does not depend on the app's models
+applications = sa.table(
+    'applications',
+    sa.column('job_id', sa.Uuid()),
+    sa.column('status', sa.String()),
+    sa.column('ai_score', sa.Float()),
+)
+jobs = sa.table(
+    'jobs',
+    sa.column('id', sa.Uuid()),
+    sa.column('organization_id', sa.Uuid()),
+)
+pipeline_stats = sa.table(
+    'pipeline_stats',
+    sa.column('scope_id', sa.Uuid()),
+    sa.column('metric', sa.String()),
+    sa.column('bucket', sa.String()),
+    sa.column('count', sa.Integer()),
+)
+
+
+def _backfill():
+    # Same buckets as app.services.pipeline_stats at this revision
+    score_bucket = sa.case(
+        (applications.c.ai_score.is_(None), 'unscored'),
+        *[(applications.c.ai_score >= bucket, str(bucket)) for bucket in range(90, 0, -10)],
+        else_='0'
+    )
+    status_bucket = sa.func.coalesce(applications.c.status, 'unknown')
+    counts = []
+    for metric, bucket in (('status', status_bucket), ('score', score_bucket)):
+        for scope in (applications.c.job_id, jobs.c.organization_id):
+            counts.append(
+                sa.select(scope, sa.literal(metric, sa.String()), bucket, sa.func.count())
+                .select_from(applications.join(jobs, jobs.c.id == applications.c.job_id))
+                .where(scope.isnot(None))
+                .group_by(scope, bucket)
+            )
+    op.execute(pipeline_stats.insert().from_select(
+        ['scope_id', 'metric', 'bucket', 'count'], sa.union_all(*counts)
+    ))
+
+
+def upgrade() -> None:
+    op.create_table('pipeline_stats',
+    sa.Column('scope_id', sa.Uuid(), nullable=False),
+    sa.Column('metric', sa.String(length=20), nullable=False),
+    sa.Column('bucket', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('scope_id', 'metric', 'bucket')
+    )
+    _backfill()
+
+
+def downgrade() -> None:
+    op.drop_table('pipeline_stats')
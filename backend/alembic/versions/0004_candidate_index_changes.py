@@ -0,0 +1,29 @@
+"""candidate index changes
+
+Outbox of candidates whose embeddings must be refreshed, drained by the
+single candidate index writer (app.services.candidate_matching).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 09:12:40.381205
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('candidate_index_changes',
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=True, nullable=False),
+    sa.Column('candidate_id', sa.Uuid(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('candidate_index_changes')
@@ -0,0 +1,25 @@
+"""candidate email lower index
+
+Expression index on lower(email) for the case-insensitive candidate
+lookups of bulk imports and resume ingestion.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 14:27:05.918362
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_candidates_email_lower', 'candidates', [sa.text('lower(email)')], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_candidates_email_lower', table_name='candidates')
@@ -0,0 +1,79 @@
+"""candidate fts search rowid
+
+Keys the SQLite FTS5 index of candidates on a stable search_rowid column
+instead of the implicit rowid, which VACUUM may renumber because the
+primary key is a UUID. An existing rowid-keyed index (databases built by
+create_all) is replaced; existing rows keep their current rowid as
+search_rowid and the index is rebuilt. Postgres gets its full-text
+objects in 0007.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 15:02:51.207733
+"""
+from alembic import op
+
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+TRIGGERS = ('candidates_fts_insert', 'candidates_fts_delete', 'candidates_fts_update')
+
+
+def _fts(key: str, insert_trigger: str):
+    """FTS5 table and sync triggers keyed by `key` (rowid or search_rowid)"""
+    return [
+        f"""CREATE VIRTUAL TABLE candidates_fts USING fts5(
+               name, resume_text, content='candidates', content_rowid='{key}',
+               tokenize='porter unicode61'
+           )""",
+        insert_trigger,
+        f"""CREATE TRIGGER candidates_fts_delete AFTER DELETE ON candidates BEGIN
+               INSERT INTO candidates_fts(candidates_fts, rowid, name, resume_text)
+               VALUES ('delete', old.{key}, old.name, old.resume_text);
+           END""",
+        f"""CREATE TRIGGER candidates_fts_update AFTER UPDATE OF name, resume_text ON candidates BEGIN
+               INSERT INTO candidates_fts(candidates_fts, rowid, name, resume_text)
+               VALUES ('delete', old.{key}, old.name, old.resume_text);
+               INSERT INTO candidates_fts(rowid, name, resume_text)
+               VALUES (new.{key}, new.name, new.resume_text);
+           END""",
+        "INSERT INTO candidates_fts(candidates_fts) VALUES ('rebuild')",
+    ]
+
+
+def _drop_fts():
+    for trigger in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.execute('DROP TABLE IF EXISTS candidates_fts')
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    _drop_fts()
+    op.execute('ALTER TABLE candidates ADD COLUMN search_rowid INTEGER')
+    op.execute('UPDATE candidates SET search_rowid = rowid')
+    op.execute('CREATE UNIQUE INDEX ix_candidates_search_rowid ON candidates (search_rowid)')
+    for statement in _fts('search_rowid', """CREATE TRIGGER candidates_fts_insert AFTER INSERT ON candidates BEGIN
+               UPDATE candidates SET search_rowid = (SELECT coalesce(max(search_rowid), 0) + 1 FROM candidates)
+               WHERE rowid = new.rowid;
+               INSERT INTO candidates_fts(rowid, name, resume_text)
+               SELECT search_rowid, name, resume_text FROM candidates WHERE rowid = new.rowid;
+           END"""):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    _drop_fts()
+    op.execute('DROP INDEX ix_candidates_search_rowid')
+    op.execute('ALTER TABLE candidates DROP COLUMN search_rowid')
+    for statement in _fts('rowid', """CREATE TRIGGER candidates_fts_insert AFTER INSERT ON candidates BEGIN
+               INSERT INTO candidates_fts(rowid, name, resume_text)
+               VALUES (new.rowid, new.name, new.resume_text);
+           END"""):
+        op.execute(statement)
@@ -0,0 +1,53 @@
+"""screening cache and fulltext
+
+The screening result cache table and the Postgres full-text search
+column and index. They used to be created by 0001, which databases built
+by create_all are stamped at without running it; created here only where
+missing, so such databases get them and the others are left as they are.
+(SQLite's FTS5 table is created by 0006.)
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 17:40:12.664018
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('screening_results'):
+        op.create_table('screening_results',
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('prompt_version', sa.String(length=50), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('analysis', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('key')
+        )
+    op.create_index(
+        'ix_screening_results_prompt_version', 'screening_results', ['prompt_version'],
+        unique=False, if_not_exists=True
+    )
+    if bind.dialect.name == 'postgresql':
+        op.execute("""ALTER TABLE candidates ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(resume_text, '')), 'B')
+            ) STORED""")
+        op.execute('CREATE INDEX IF NOT EXISTS ix_candidates_search_vector ON candidates USING GIN (search_vector)')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_candidates_search_vector')
+        op.execute('ALTER TABLE candidates DROP COLUMN IF EXISTS search_vector')
+    op.drop_index('ix_screening_results_prompt_version', table_name='screening_results')
+    op.drop_table('screening_results')
@@ -1,7 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from app.api import auth, users, jobs, candidates, applications
+from app.utils.rate_limit import enforce_rate_limit
 
-api_router = APIRouter()
+api_router = APIRouter(dependencies=[Depends(enforce_rate_limit)])
 
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
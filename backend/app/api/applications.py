@@ -1,9 +1,97 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
 from app.api.auth import get_current_user
-from app.models import User
+from app.models import User, Application, Job
+from app.schemas import ApplicationPage, ApplicationResponse, PipelineStats, ScreeningRequest, ScreeningQueued
+from app.services.pagination import InvalidCursor, export_ndjson, keyset_page, schema_columns
+from app.services.pipeline_stats import get_pipeline_stats
+from app.services.screening import get_screening_scheduler, schedule_screening, screening_query
+from typing import Optional
+from uuid import UUID
 
 router = APIRouter()
 
-# Placeholder for application endpoints
\ No newline at end of file
+def _organization_applications(query, organization_id: UUID, job_id: Optional[UUID], status_filter: Optional[str]):
+    query = query.join(Job, Application.job_id == Job.id).where(Job.organization_id == organization_id)
+    if job_id:
+        query = query.where(Application.job_id == job_id)
+    if status_filter:
+        query = query.where(Application.status == status_filter)
+    return query
+
+@router.get("", response_model=ApplicationPage)
+async def list_applications(
+    job_id: Optional[UUID] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Applications to my organization's jobs, newest first"""
+    query = _organization_applications(select(Application), current_user.organization_id, job_id, status_filter)
+    try:
+        return await keyset_page(db, query, Application, ApplicationResponse, cursor, limit)
+    except InvalidCursor as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.get("/export")
+async def export_applications(
+    job_id: Optional[UUID] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """All applications to my organization's jobs as NDJSON, newest first"""
+    query = _organization_applications(
+        select(*schema_columns(Application, ApplicationResponse)),
+        current_user.organization_id, job_id, status_filter
+    )
+    return StreamingResponse(
+        export_ndjson(db, query, Application, ApplicationResponse, settings.export_batch_size),
+        media_type="application/x-ndjson"
+    )
+
+@router.get("/stats", response_model=PipelineStats)
+async def organization_pipeline_stats(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Application counts by status and score histogram across my organization's jobs"""
+    return await get_pipeline_stats(db, current_user.organization_id)
+
+@router.post("/screen", response_model=ScreeningQueued, status_code=status.HTTP_202_ACCEPTED)
+async def screen_applications(
+    request: ScreeningRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Queue applications for AI screening; results fill ai_score and ai_analysis"""
+    if not settings.enable_ai_screening:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI screening is disabled"
+        )
+    if request.application_ids is None and not settings.enable_batch_processing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Batch processing is disabled; pass application_ids"
+        )
+
+    query = screening_query(
+        current_user.organization_id,
+        job_id=request.job_id,
+        application_ids=request.application_ids,
+        rescreen=request.rescreen
+    )
+    queued = (await db.execute(select(func.count()).select_from(query.subquery()))).scalar_one()
+    if queued:
+        schedule_screening(query)
+    return {"queued": queued, "pending": get_screening_scheduler().pending}
@@ -1,20 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
-from app.core.security import verify_password, create_access_token, decode_access_token
+from app.core.revocation import revoke_token
+from app.core.security import (
+    verify_password_async,
+    get_password_hash_async,
+    create_access_token,
+    decode_access_token
+)
 from app.models import User, Organization
+from app.services.principals import get_principal
 from app.schemas import UserCreate, UserLogin, Token, UserResponse
+from app.utils.rate_limit import rate_limit
 from typing import Optional
+from uuid import UUID
 
 router = APIRouter()
 security = HTTPBearer()
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+@rate_limit(per_minute=5, per_hour=20, scope="ip")
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user"""
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    result = await db.execute(select(User).where(User.email == user_data.email))
+    existing_user = result.scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -26,30 +38,38 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     if user_data.organization_name:
         organization = Organization(name=user_data.organization_name)
         db.add(organization)
-        db.flush()
+        await db.flush()
     
     # Create user
-    from app.core.security import get_password_hash
     user = User(
         email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=await get_password_hash_async(user_data.password),
         full_name=user_data.full_name,
         role=user_data.role,
         organization_id=organization.id if organization else None
     )
     
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     
     return user
 
 @router.post("/login", response_model=Token)
-async def login(login_data: UserLogin, db: Session = Depends(get_db)):
+@rate_limit(per_minute=10, per_hour=100, scope="ip")
+async def login(login_data: UserLogin, db: AsyncSession = Depends(get_db)):
     """Login with email and password"""
     # Find user
-    user = db.query(User).filter(User.email == login_data.email).first()
-    if not user or not verify_password(login_data.password, user.password_hash):
+    result = await db.execute(select(User).where(User.email == login_data.email))
+    user = result.scalars().first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password"
+        )
+
+    valid, new_hash = await verify_password_async(login_data.password, user.password_hash)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -62,16 +82,22 @@ async def login(login_data: UserLogin, db: Session = Depends(get_db)):
             detail="User account is inactive"
         )
     
-    # Create access token
-    access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email}
-    )
+    # Upgrade the stored hash if the configured cost has changed
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+
+    # Create access token; org lets rate limits be keyed per organization
+    claims = {"sub": str(user.id), "email": user.email}
+    if user.organization_id:
+        claims["org"] = str(user.organization_id)
+    access_token = create_access_token(data=claims)
     
     return {"access_token": access_token, "token_type": "bearer"}
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """Get current authenticated user"""
     token = credentials.credentials
@@ -83,23 +109,43 @@ async def get_current_user(
             detail="Invalid authentication credentials"
         )
     
-    user_id = payload.get("sub")
+    try:
+        user_id = UUID(payload.get("sub"))
+    except (TypeError, ValueError):
+        user_id = None
     if not user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials"
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await get_principal(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is inactive"
+        )
+    
     return user
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """Get current user information"""
-    return current_user
\ No newline at end of file
+    return current_user
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: User = Depends(get_current_user)
+):
+    """Revoke the bearer token used for this request"""
+    claims = decode_access_token(credentials.credentials)
+    if claims:
+        await revoke_token(claims)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,9 +1,181 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
 from app.core.database import get_db
 from app.api.auth import get_current_user
-from app.models import User
+from app.models import User, Candidate
+from app.schemas import CandidateFilterResult, CandidatePage, CandidateResponse, IngestionJobStatus
+from app.services.candidate_import import FORMATS, detect_format, import_candidates
+from app.services.fulltext import search_candidates
+from app.services.pagination import InvalidCursor, export_ndjson, keyset_page, schema_columns
+from app.services.resume_ingestion import UploadError, get_ingestion_status, receive_upload, start_ingestion
+from app.services.skill_index import get_skill_index, SkillQueryError
+from typing import Optional
+from uuid import UUID
+import aiofiles
+import json
+import os
+import tempfile
 
 router = APIRouter()
 
-# Placeholder for candidate endpoints
\ No newline at end of file
+@router.get("", response_model=CandidatePage)
+async def list_candidates(
+    source: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Candidates, newest first"""
+    query = select(Candidate)
+    if source:
+        query = query.where(Candidate.source == source)
+    try:
+        return await keyset_page(db, query, Candidate, CandidateResponse, cursor, limit)
+    except InvalidCursor as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.get("/export")
+async def export_candidates(
+    source: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """All candidates as NDJSON, newest first"""
+    query = select(*schema_columns(Candidate, CandidateResponse))
+    if source:
+        query = query.where(Candidate.source == source)
+    return StreamingResponse(
+        export_ndjson(db, query, Candidate, CandidateResponse, settings.export_batch_size),
+        media_type="application/x-ndjson"
+    )
+
+@router.get("/filter", response_model=CandidateFilterResult)
+async def filter_candidates(
+    skills: Optional[str] = Query(None, description='Boolean skill expression, e.g. "python AND (aws OR gcp) AND NOT php"'),
+    location: Optional[str] = None,
+    my_organization: bool = Query(False, description="Only candidates who applied to my organization's jobs"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Filter candidates by skills, location and organization"""
+    index = get_skill_index()
+    if index is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Skill index is still being built, please retry",
+            headers={"Retry-After": "5"}
+        )
+    try:
+        count, candidate_ids = index.search(
+            skills,
+            offset=offset,
+            limit=limit,
+            organization_id=current_user.organization_id if my_organization else None,
+            location=location
+        )
+    except SkillQueryError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid skill expression: {e}"
+        )
+
+    candidates = []
+    if candidate_ids:
+        result = await db.execute(select(Candidate).where(Candidate.id.in_(candidate_ids)))
+        by_id = {candidate.id: candidate for candidate in result.scalars()}
+        candidates = [by_id[candidate_id] for candidate_id in candidate_ids if candidate_id in by_id]
+    return {"count": count, "candidates": candidates}
+
+@router.get("/search")
+async def search_resumes(
+    q: str = Query(..., min_length=1, description='Web-search syntax: words, "phrases", OR, -exclude'),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Full-text resume search, streamed as ranked NDJSON hits with highlighted snippets"""
+    async def hits():
+        async for hit in search_candidates(db, q, offset=offset, limit=limit):
+            yield json.dumps(hit) + "\n"
+
+    return StreamingResponse(hits(), media_type="application/x-ndjson")
+
+@router.post("/ingest", response_model=IngestionJobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def ingest_resumes(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Upload resumes (PDF, DOCX, TXT or zips of them) as multipart files and ingest them in the background"""
+    # Don't hold a database connection while the upload streams in
+    await db.close()
+    try:
+        job = await receive_upload(request.headers.get("content-type"), request.stream(), current_user.id)
+    except UploadError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    start_ingestion(job)
+    return job.to_dict()
+
+@router.get("/ingest/{job_id}", response_model=IngestionJobStatus)
+async def get_ingestion_job(
+    job_id: UUID,
+    current_user: User = Depends(get_current_user)
+):
+    """Progress and per-file status of a resume ingestion job"""
+    job = await get_ingestion_status(job_id)
+    if not job or str(job["owner_id"]) != str(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ingestion job not found"
+        )
+    return job
+
+@router.post("/import")
+async def import_candidates_file(
+    request: Request,
+    format: Optional[str] = Query(None, description="csv or jsonl; defaults to the Content-Type"),
+    batch_size: Optional[int] = Query(None, ge=1, le=2000),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Bulk import candidates from a CSV or JSONL request body, streaming progress and row errors as NDJSON"""
+    fmt = format or detect_format(content_type=request.headers.get("content-type"))
+    if fmt not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Send text/csv or application/x-ndjson, or pass format=csv|jsonl"
+        )
+    await db.close()
+
+    # Spool the body to disk so the import reads it in constant memory
+    fd, path = tempfile.mkstemp(suffix=f".{fmt}")
+    os.close(fd)
+    try:
+        async with aiofiles.open(path, "wb") as f:
+            async for chunk in request.stream():
+                await f.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+
+    async def events():
+        try:
+            async for event in import_candidates(path, fmt, batch_size):
+                yield json.dumps(event) + "\n"
+        finally:
+            os.remove(path)
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
@@ -1,9 +1,102 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
 from app.core.database import get_db
 from app.api.auth import get_current_user
-from app.models import User
+from app.models import User, Job, Candidate
+from app.schemas import CandidateMatch, JobPage, JobResponse, PipelineStats
+from app.services.candidate_matching import find_matching_candidates
+from app.services.pagination import InvalidCursor, export_ndjson, keyset_page, schema_columns
+from app.services.pipeline_stats import get_pipeline_stats
+from typing import List, Optional
+from uuid import UUID
 
 router = APIRouter()
 
-# Placeholder for job endpoints
\ No newline at end of file
+@router.get("", response_model=JobPage)
+async def list_jobs(
+    status_filter: Optional[str] = Query(None, alias="status"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Jobs of my organization, newest first"""
+    query = select(Job).where(Job.organization_id == current_user.organization_id)
+    if status_filter:
+        query = query.where(Job.status == status_filter)
+    try:
+        return await keyset_page(db, query, Job, JobResponse, cursor, limit)
+    except InvalidCursor as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.get("/export")
+async def export_jobs(
+    status_filter: Optional[str] = Query(None, alias="status"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """All jobs of my organization as NDJSON, newest first"""
+    query = select(*schema_columns(Job, JobResponse)).where(Job.organization_id == current_user.organization_id)
+    if status_filter:
+        query = query.where(Job.status == status_filter)
+    return StreamingResponse(
+        export_ndjson(db, query, Job, JobResponse, settings.export_batch_size),
+        media_type="application/x-ndjson"
+    )
+
+@router.get("/{job_id}/matches", response_model=List[CandidateMatch])
+async def match_candidates(
+    job_id: UUID,
+    k: int = Query(20, ge=1, le=200),
+    exact: bool = Query(False, description="Brute-force search instead of the ANN index"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Find the candidates whose resumes best match a job description"""
+    result = await db.execute(
+        select(Job).where(Job.id == job_id, Job.organization_id == current_user.organization_id)
+    )
+    job = result.scalars().first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    matches = await find_matching_candidates(job, k=k, exact=exact)
+    if not matches:
+        return []
+
+    result = await db.execute(
+        select(Candidate).where(Candidate.id.in_([candidate_id for candidate_id, _ in matches]))
+    )
+    candidates = {candidate.id: candidate for candidate in result.scalars()}
+    return [
+        {"candidate": candidates[candidate_id], "score": score}
+        for candidate_id, score in matches
+        if candidate_id in candidates
+    ]
+
+
+@router.get("/{job_id}/stats", response_model=PipelineStats)
+async def job_pipeline_stats(
+    job_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Application counts by status and score histogram for one job"""
+    result = await db.execute(
+        select(Job.id).where(Job.id == job_id, Job.organization_id == current_user.organization_id)
+    )
+    if result.scalar() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return await get_pipeline_stats(db, job_id)
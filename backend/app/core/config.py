@@ -13,22 +13,50 @@ class Settings(BaseSettings):
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     api_prefix: str = "/api/v1"
+    web_workers: int = 0  # serve.py worker processes; 0 = one per CPU core
+    worker_max_requests: int = 10000  # recycle a worker after this many requests (+ up to the jitter); 0 = never
+    worker_max_requests_jitter: int = 1000
+    worker_timeout: int = 60
+    worker_graceful_timeout: int = 30
     allowed_hosts: List[str] = ["localhost"]
     
     # Security
     secret_key: str
     jwt_algorithm: str = "HS256"
     jwt_expiration_hours: int = 24
+    token_cache_max_entries: int = 10000  # verified JWT claims kept per worker; 0 disables
+    token_revocation_capacity: int = 100000  # Bloom filter sized for this many live revocations
+    token_revocation_error_rate: float = 0.001
     bcrypt_rounds: int = 12
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
     
     # Database
     database_url: str
     database_pool_size: int = 20
     database_max_overflow: int = 40
+    database_connection_budget: int = 0  # connections shared by all serve.py workers; 0 = pool_size + max_overflow each
+    database_reserved_connections: int = 10  # kept free for migrations, scripts and admin sessions
+    database_replica_urls: List[str] = []  # Postgres read replicas for GET requests
+    replica_max_lag_seconds: float = 5.0  # replicas further behind leave the rotation until they catch up
+    replica_check_interval: float = 2.0
+    read_your_writes_seconds: float = 10.0  # a user's reads stay on the primary this long after they write
+    migrate_on_startup: Optional[bool] = None  # unset: migrate outside production, only check the version in production
     
     # Redis
     redis_url: str
     redis_cache_ttl: int = 3600
+    redis_max_connections: int = 50
+    redis_connect_timeout: float = 2.0
+    cache_codec: str = "msgpack"
+    cache_compress_threshold: int = 1024
+    cache_compress_level: int = 6
+    principal_cache_ttl: int = 60
+    memory_cache_max_entries: int = 10000
+    memory_cache_max_bytes: int = 64 * 1024 * 1024
+    l1_cache_max_entries: int = 1000
+    l1_cache_ttl: int = 5
+    cache_recompute_lock_timeout: int = 10
     
     # OpenAI
     openai_api_key: str
@@ -36,6 +64,49 @@ class Settings(BaseSettings):
     openai_max_tokens: int = 500
     openai_temperature: float = 0.3
     
+    # AI screening
+    llm_backend: str = "openai"  # openai, stub
+    ai_screening_concurrency: int = 8
+    ai_screening_rpm: int = 500
+    ai_screening_tpm: int = 60000
+    ai_screening_max_retries: int = 5
+    ai_screening_backoff_base: float = 1.0
+    ai_screening_backoff_max: float = 60.0
+    ai_screening_batch_size: int = 50
+    ai_screening_flush_interval: float = 2.0
+    ai_screening_queue_size: int = 1000
+    ai_screening_max_resume_chars: int = 12000
+    screening_cache_enabled: bool = True
+    screening_cache_ttl: int = 7 * 24 * 3600
+    
+    # Semantic search
+    embedding_backend: str = "hashing"  # hashing, openai
+    embedding_model: str = "text-embedding-ada-002"
+    embedding_dim: Optional[int] = None  # unset: the model's own size (hashing: 384)
+    ann_index_path: str = "data/candidate_index"
+    ann_nlist: int = 1024
+    ann_nprobe: int = 16
+    ann_index_poll_interval: float = 2.0  # seconds between outbox checks by the index writer
+    candidate_match_cache_ttl: int = 60  # job matches are reused across workers for this long
+    skill_index_refresh_interval: int = 30
+    skill_index_refresh_overlap: int = 60  # seconds re-read before the last refresh, for slow commits
+    skill_index_rebuild_interval: int = 600  # full rebuilds drop rows deleted by other workers
+    skill_index_batch_size: int = 5000
+    
+    # Resume ingestion
+    resume_upload_dir: str = "data/uploads"
+    resume_max_file_bytes: int = 10 * 1024 * 1024
+    resume_max_archive_bytes: int = 1024 * 1024 * 1024
+    resume_ingest_max_files: int = 10000  # including files expanded from zips
+    resume_max_extracted_bytes: int = 4 * 1024 * 1024 * 1024  # per upload, across its zips
+    resume_ingest_workers: int = 0  # 0 = one per CPU core
+    resume_ingest_queue_size: int = 64
+    resume_ingest_batch_size: int = 200
+    resume_ingest_status_ttl: int = 86400
+    upload_chunk_size: int = 1024 * 1024
+    candidate_import_batch_size: int = 1000  # rows per transaction; INSERTs are split at 32767 bind parameters
+    export_batch_size: int = 1000  # rows per server-side cursor fetch in NDJSON exports
+    
     # Email
     smtp_host: str
     smtp_port: int = 587
@@ -46,11 +117,19 @@ class Settings(BaseSettings):
     # Rate Limiting
     rate_limit_per_minute: int = 60
     rate_limit_per_hour: int = 1000
+    rate_limit_enabled: bool = True
+    rate_limit_scope: str = "user"  # user, organization or ip
+    rate_limit_local_max_keys: int = 100000
+    rate_limit_redis_retry: float = 5.0
+    
+    # Monitoring
+    metrics_enabled: bool = True  # Prometheus text format at /metrics
     
     # Feature Flags
     enable_ai_screening: bool = True
     enable_batch_processing: bool = True
     enable_websockets: bool = True
+    enable_semantic_search: bool = True
     
     class Config:
         env_file = ".env"
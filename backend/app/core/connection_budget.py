@@ -0,0 +1,90 @@
+"""
+Per-worker database pool sizing for multi-worker deployments.
+
+Every API worker has its own async engine, so N workers can open
+N x (pool_size + max_overflow) connections. `plan_pools` divides a global
+DATABASE_CONNECTION_BUDGET between the workers, keeping the configured
+pool_size : max_overflow ratio, and `check_budget` compares the budget
+(plus DATABASE_RESERVED_CONNECTIONS for migrations, scripts and admin
+sessions) with max_connections of the primary and of every read replica,
+whose engines use the same pool sizes. serve.py applies both
+before any worker imports app.core.database.
+"""
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ConnectionBudgetError(RuntimeError):
+    """The workers could open more connections than the database allows"""
+
+@dataclass
+class PoolPlan:
+    workers: int
+    pool_size: int
+    max_overflow: int
+
+    @property
+    def per_worker(self) -> int:
+        return self.pool_size + self.max_overflow
+
+    @property
+    def total(self) -> int:
+        return self.workers * self.per_worker
+
+def plan_pools(workers: int, budget: Optional[int] = None) -> PoolPlan:
+    """Split `budget` connections between `workers` workers (0/None: keep the configured pool per worker)"""
+    budget = settings.database_connection_budget if budget is None else budget
+    if not budget:
+        return PoolPlan(workers, settings.database_pool_size, settings.database_max_overflow)
+    per_worker = budget // workers
+    if per_worker < 1:
+        raise ConnectionBudgetError(
+            f"A budget of {budget} connections is less than one per worker for {workers} workers"
+        )
+    configured = settings.database_pool_size + settings.database_max_overflow
+    pool_size = max(min(round(per_worker * settings.database_pool_size / configured), per_worker), 1)
+    return PoolPlan(workers, pool_size, per_worker - pool_size)
+
+def server_connection_limit(database_url: str) -> Optional[int]:
+    """Connections available to ordinary roles on the server, or None if it has no limit (SQLite)"""
+    if make_url(database_url).get_backend_name() != "postgresql":
+        return None
+    engine = create_engine(database_url, poolclass=NullPool)
+    try:
+        with engine.connect() as conn:
+            max_connections = int(conn.execute(text("SHOW max_connections")).scalar())
+            superuser_reserved = int(conn.execute(text("SHOW superuser_reserved_connections")).scalar())
+    finally:
+        engine.dispose()
+    return max_connections - superuser_reserved
+
+def check_budget(plan: PoolPlan, database_url: Optional[str] = None):
+    """Raise ConnectionBudgetError if the plan plus reserved connections exceeds
+    the limit of `database_url`, or by default of the primary or any read replica"""
+    urls = [database_url] if database_url else [settings.database_url, *settings.database_replica_urls]
+    needed = plan.total + settings.database_reserved_connections
+    for url in urls:
+        limit = server_connection_limit(url)
+        if limit is None:
+            continue
+        server = make_url(url).render_as_string(hide_password=True)
+        if needed > limit:
+            raise ConnectionBudgetError(
+                f"{plan.workers} workers x {plan.per_worker} connections + {settings.database_reserved_connections} reserved "
+                f"= {needed}, but {server} accepts {limit} (max_connections minus superuser_reserved_connections). "
+                f"Lower DATABASE_CONNECTION_BUDGET or WEB_WORKERS, or raise max_connections"
+            )
+        logger.info(f"Connection budget on {server}: {plan.total} of {limit} connections ({plan.workers} workers x {plan.per_worker})")
+
+def apply_plan(plan: PoolPlan):
+    """Use the planned pool sizes; must run before app.core.database is imported"""
+    # Per-worker shares of other limits (e.g. the screening rate budget) use the count
+    settings.web_workers = plan.workers
+    settings.database_pool_size = plan.pool_size
+    settings.database_max_overflow = plan.max_overflow
@@ -1,13 +1,42 @@
 from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncAttrs, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 from sqlalchemy.pool import QueuePool, StaticPool
+from starlette.requests import Request
 from app.core.config import settings
+from app.core.replicas import replicas, route_session
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Create engine with appropriate configuration based on database type
+def get_async_database_url(database_url: str) -> str:
+    """Map a database URL onto its asyncio driver (asyncpg / aiosqlite)"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    elif backend == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+# INSERT constructs with ON CONFLICT support, per supported backend
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def require_dialect(dialect: str) -> str:
+    """`dialect` if it is a supported backend, else NotImplementedError"""
+    if dialect not in _DIALECT_INSERTS:
+        raise NotImplementedError(f"Database backend {dialect!r} is not supported; use PostgreSQL or SQLite")
+    return dialect
+
+def dialect_insert(dialect: str):
+    """The dialect's insert(), which has on_conflict_do_update/do_nothing"""
+    return _DIALECT_INSERTS[require_dialect(dialect)]
+
+# Create engines with appropriate configuration based on database type.
+# The async engine serves the API; the sync engine is kept for scripts
+# (db_check.py, quick_start.py) and background workers.
 if settings.database_url.startswith("sqlite"):
     # SQLite specific settings
     connect_args = {"check_same_thread": False}
@@ -17,6 +46,12 @@ if settings.database_url.startswith("sqlite"):
         poolclass=StaticPool,
         echo=settings.debug
     )
+    async_engine = create_async_engine(
+        get_async_database_url(settings.database_url),
+        connect_args=connect_args,
+        poolclass=StaticPool,
+        echo=settings.debug
+    )
 else:
     # PostgreSQL with connection pooling
     engine = create_engine(
@@ -28,17 +63,59 @@ else:
         pool_recycle=3600,
         echo=settings.debug
     )
+    async_engine = create_async_engine(
+        get_async_database_url(settings.database_url),
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        echo=settings.debug
+    )
+
+class RoutingSession(Session):
+    """Reads from the replica a request pinned the session to (app.core.replicas);
+    flushes, DML and every statement after the first write go to the primary"""
 
-# Create session factory
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or (clause is not None and clause.is_dml):
+            self.info["wrote"] = True
+        else:
+            replica = self.info.get("replica")
+            if replica is not None and not self.info.get("wrote"):
+                return replica
+        return super().get_bind(mapper, clause=clause, **kw)
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: handlers return ORM objects after commit, and an
+# expired attribute cannot be lazily refreshed outside of an awaited call
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Create base class for models.
+# AsyncAttrs exposes `await obj.awaitable_attrs.<relationship>` for lazy
+# relationships, which cannot load implicitly under an AsyncSession.
+class Base(AsyncAttrs, DeclarativeBase):
+    pass
 
-# Create base class for models
-Base = declarative_base()
+READ_METHODS = ("GET", "HEAD")
+
+# Dependency to get database session; GET/HEAD requests read from a
+# replica when DATABASE_REPLICA_URLS is set
+async def get_db(request: Request):
+    async with AsyncSessionLocal() as db:
+        if replicas:
+            await route_session(db, request, read_only=request.method in READ_METHODS)
+        yield db
 
-# Dependency to get database session
-async def get_db():
-    db = SessionLocal()
-    try:
+# For routes and dependencies that only read, whatever the request method
+async def get_read_db(request: Request):
+    async with AsyncSessionLocal() as db:
+        if replicas:
+            await route_session(db, request, read_only=True)
         yield db
-    finally:
-        db.close()
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""
+Schema migrations with Alembic (backend/alembic).
+
+`migrate_database` brings the configured database to the latest revision.
+Databases that predate migrations (built by create_all) are stamped at the
+baseline revision first, so only the later revisions run.
+
+`prepare_database` is what the API runs on startup: it migrates outside
+production, and in production (or with MIGRATE_ON_STARTUP=false) only
+checks that the database is at the head revision, so workers start
+without running DDL and refuse to serve an outdated schema. Alembic is
+imported on first use to keep it out of worker import time.
+"""
+import os
+from typing import Optional
+from sqlalchemy import inspect, text
+from app.core.config import settings
+from app.core.database import async_engine
+import logging
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic.ini")
+BASELINE_REVISION = "0001"
+
+class SchemaVersionError(RuntimeError):
+    """The database is not at the revision this code expects"""
+
+def alembic_config(connection=None):
+    from alembic.config import Config
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "alembic"))
+    # Keep the app's logging setup when migrating in-process
+    config.attributes["configure_logger"] = False
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+def upgrade(connection, revision: str = "head"):
+    """Migrate on an open (sync) connection; usable with run_sync"""
+    from alembic import command
+    config = alembic_config(connection)
+    tables = set(inspect(connection).get_table_names())
+    if "alembic_version" not in tables and "users" in tables:
+        logger.info(f"Existing schema without migration history; stamping {BASELINE_REVISION}")
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, revision)
+
+def head_revision() -> str:
+    from alembic.script import ScriptDirectory
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+def current_revision(connection) -> Optional[str]:
+    """Revision recorded in the database, or None if it was never migrated"""
+    if not inspect(connection).has_table("alembic_version"):
+        return None
+    return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+async def migrate_database():
+    async with async_engine.begin() as conn:
+        await conn.run_sync(upgrade)
+
+async def check_database_version():
+    """Raise SchemaVersionError unless the database is at the head revision"""
+    async with async_engine.connect() as conn:
+        current = await conn.run_sync(current_revision)
+    head = head_revision()
+    if current != head:
+        raise SchemaVersionError(
+            f"Database schema is at revision {current or 'none'}, this release expects {head}; "
+            f"run `alembic upgrade head` first"
+        )
+
+def migrates_on_startup() -> bool:
+    if settings.migrate_on_startup is None:
+        return settings.environment != "production"
+    return settings.migrate_on_startup
+
+async def prepare_database():
+    """Migrate, or only verify the schema version (production)"""
+    if migrates_on_startup():
+        await migrate_database()
+    else:
+        await check_database_version()
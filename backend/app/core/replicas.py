@@ -0,0 +1,201 @@
+"""
+Read replicas for GET requests.
+
+With DATABASE_REPLICA_URLS set, `get_db` pins GET/HEAD request sessions
+(and `get_read_db` any session) to a replica picked from the ones in
+rotation; RoutingSession in app.core.database still sends flushes, DML and
+everything after them to the primary. Background jobs and scripts use
+AsyncSessionLocal directly and always read from the primary.
+
+Read-your-writes: a session that wrote marks its user as sticky on commit,
+and that user's reads stay on the primary for READ_YOUR_WRITES_SECONDS (at
+least REPLICA_MAX_LAG_SECONDS). The mark is shared through Redis so it
+holds on every worker; without Redis it applies to the writing worker only.
+
+`start_replica_monitor` measures each replica's replay lag every
+REPLICA_CHECK_INTERVAL seconds; replicas that lag more than
+REPLICA_MAX_LAG_SECONDS or fail the check leave the rotation until they
+catch up. Each replica gets the same per-worker pool as the primary.
+"""
+import asyncio
+import random
+import time
+from typing import Any, Dict, List, Optional, Set
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+from app.core.config import settings
+from app.core.security import decode_access_token
+from app.utils.cache import get_async_redis
+import logging
+
+logger = logging.getLogger(__name__)
+
+STICKY_PREFIX = "db:primary"
+
+# Seconds the replica is behind; 0 when it has replayed everything it received
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+class Replica:
+    def __init__(self, url: str):
+        url = make_url(url).set(drivername="postgresql+asyncpg")
+        self.name = f"{url.host}:{url.port or 5432}"
+        self.engine: AsyncEngine = create_async_engine(
+            url,
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow,
+            pool_pre_ping=True,
+            pool_recycle=3600,
+            echo=settings.debug
+        )
+        self.healthy = True
+        self.lag: Optional[float] = None
+
+    async def _lag(self):
+        async with self.engine.connect() as conn:
+            return await conn.scalar(LAG_QUERY)
+
+    async def check(self):
+        """Measure replay lag; take the replica out of rotation if it is too far behind or down"""
+        try:
+            lag = await asyncio.wait_for(self._lag(), timeout=settings.replica_check_interval)
+            self.lag = float(lag)
+            healthy = self.lag <= settings.replica_max_lag_seconds
+            reason = f"{self.lag:.1f}s behind"
+        except Exception as e:
+            self.lag = None
+            healthy = False
+            reason = str(e) or type(e).__name__
+        if healthy != self.healthy:
+            if healthy:
+                logger.info(f"Replica {self.name} back in rotation ({reason})")
+            else:
+                logger.warning(f"Replica {self.name} out of rotation: {reason}")
+        self.healthy = healthy
+
+class ReplicaSet:
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def pick(self) -> Optional[AsyncEngine]:
+        """A replica in rotation, or None if there is none"""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        return random.choice(healthy).engine if healthy else None
+
+    async def check(self):
+        await asyncio.gather(*(replica.check() for replica in self.replicas))
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [{"replica": r.name, "healthy": r.healthy, "lag": r.lag} for r in self.replicas]
+
+    async def dispose(self):
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+replicas = ReplicaSet(settings.database_replica_urls)
+_monitor: Optional[asyncio.Task] = None
+
+# user id -> until when their reads stay on the primary (this worker)
+_sticky: Dict[str, float] = {}
+# Pending Redis writes of those marks
+_sharing: Set[asyncio.Task] = set()
+
+def _sticky_seconds() -> float:
+    return max(settings.read_your_writes_seconds, settings.replica_max_lag_seconds)
+
+def stick_to_primary(user_id: str):
+    """Keep the user's reads on the primary until replicas have their writes"""
+    now = time.time()
+    if len(_sticky) > 10000:
+        for key in [key for key, until in _sticky.items() if until <= now]:
+            del _sticky[key]
+    _sticky[user_id] = now + _sticky_seconds()
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Outside the API (scripts): no other worker to tell
+        return
+    # Called from ORM hooks on the event loop: share the mark without blocking it
+    task = loop.create_task(_share_sticky(user_id))
+    _sharing.add(task)
+    task.add_done_callback(_sharing.discard)
+
+async def _share_sticky(user_id: str):
+    client = await get_async_redis()
+    if client is None:
+        return
+    try:
+        await client.set(f"{STICKY_PREFIX}:{user_id}", 1, px=int(_sticky_seconds() * 1000))
+    except Exception as e:
+        logger.error(f"Failed to share read-your-writes mark for user {user_id}: {e}")
+
+async def sticks_to_primary(user_id: str) -> bool:
+    if _sticky.get(user_id, 0) > time.time():
+        return True
+    client = await get_async_redis()
+    if client is None:
+        return False
+    try:
+        return bool(await client.exists(f"{STICKY_PREFIX}:{user_id}"))
+    except Exception:
+        # Unknown: the primary is always up to date
+        return True
+
+def _request_user(request: Request) -> Optional[str]:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    claims = decode_access_token(token)
+    return claims.get("sub") if claims else None
+
+async def route_session(db: AsyncSession, request: Request, read_only: bool):
+    """Pin a read-only request session to a replica unless its user wrote recently"""
+    user_id = _request_user(request)
+    db.info["user_id"] = user_id
+    if not read_only or (user_id and await sticks_to_primary(user_id)):
+        return
+    engine = replicas.pick()
+    if engine is not None:
+        db.info["replica"] = engine.sync_engine
+
+@event.listens_for(Session, "after_commit")
+def _stick_after_write(session):
+    if session.info.get("wrote") and session.info.get("user_id"):
+        stick_to_primary(session.info["user_id"])
+
+async def _monitor_replicas():
+    while True:
+        await asyncio.sleep(settings.replica_check_interval)
+        await replicas.check()
+
+async def start_replica_monitor():
+    """Check replica lag now, then keep checking in the background"""
+    global _monitor
+    if not replicas or _monitor is not None:
+        return
+    await replicas.check()
+    in_rotation = [replica.name for replica in replicas.replicas if replica.healthy]
+    logger.info(f"Read replicas in rotation: {len(in_rotation)} of {len(replicas.replicas)} ({', '.join(in_rotation)})")
+    _monitor = asyncio.create_task(_monitor_replicas())
+
+async def stop_replica_monitor():
+    global _monitor
+    if _monitor is not None:
+        task, _monitor = _monitor, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    await replicas.dispose()
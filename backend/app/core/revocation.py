@@ -0,0 +1,254 @@
+"""
+Access-token revocation (logout, deactivated users).
+
+Every worker holds the revocations that can still matter (until the
+affected tokens expire) in a Bloom filter backed by an exact set, so the
+per-request check is in-process: a token that was never revoked is ruled
+out by a few bit probes, and the rare filter hits are confirmed against
+the exact set, which has no false positives.
+
+Two kinds of entries:
+- "jti:<id>": one token (logout), kept until the token's exp.
+- "sub:<user id>": every token of a user issued at or before the
+  revocation (deactivation), kept for one token lifetime.
+
+Revocations are written to Redis with the same lifetime and published on
+REVOCATION_CHANNEL; `start_revocation_listener` loads the stored ones and
+applies published ones as they arrive, so all workers agree. Without Redis
+revocations apply only to the worker that made them.
+"""
+import asyncio
+import math
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+from app.core.config import settings
+from app.utils.cache import get_async_redis, get_redis
+import logging
+
+logger = logging.getLogger(__name__)
+
+REVOKED_PREFIX = "revoked"
+REVOCATION_CHANNEL = "auth:revoked"
+
+class BloomFilter:
+    """Fixed-size Bloom filter; no false negatives, ~error_rate false positives at capacity"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 64)
+        self.hashes = max(int(round(self.size / capacity * math.log(2))), 1)
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    @staticmethod
+    def _hashes(key: str) -> Tuple[int, int]:
+        # Double hashing (h1 + i*h2) from the two halves of Python's own
+        # string hash: keyed per process, which is fine for a filter that
+        # each worker builds for itself, and several times cheaper than a
+        # cryptographic digest on the per-request path
+        value = hash(key) & 0xFFFFFFFFFFFFFFFF
+        return value & 0xFFFFFFFF, (value >> 32) | 1
+
+    def add(self, key: str):
+        h1, h2 = self._hashes(key)
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % self.size
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        # Stops at the first clear bit, usually the first or second probe
+        h1, h2 = self._hashes(key)
+        bits, size = self._bits, self.size
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+class RevocationList:
+    """Bloom filter over revoked keys plus the exact (revoked_at, expires_at) per key"""
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        self.error_rate = error_rate
+        self._exact: Dict[str, Tuple[float, float]] = {}
+        self._bloom = BloomFilter(capacity, error_rate)
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def add(self, key: str, revoked_at: float, expires_at: float):
+        current = self._exact.get(key)
+        if current is not None:
+            revoked_at, expires_at = max(current[0], revoked_at), max(current[1], expires_at)
+        else:
+            self._bloom.add(key)
+        self._exact[key] = (revoked_at, expires_at)
+        if self._bloom.count > self._bloom.capacity:
+            self._rebuild()
+
+    def _rebuild(self):
+        # A Bloom filter cannot forget: drop expired keys and refill a fresh
+        # one, growing it if live revocations alone fill the old capacity
+        now = time.time()
+        self._exact = {key: entry for key, entry in self._exact.items() if entry[1] > now}
+        capacity = self._bloom.capacity
+        while len(self._exact) > capacity // 2:
+            capacity *= 2
+        self._bloom = BloomFilter(capacity, self.error_rate)
+        for key in self._exact:
+            self._bloom.add(key)
+
+    def revoked_at(self, key: str) -> Optional[float]:
+        """When `key` was revoked, or None if it is not (or no longer) revoked"""
+        if key not in self._bloom:
+            return None
+        entry = self._exact.get(key)
+        if entry is None or entry[1] <= time.time():
+            return None
+        return entry[0]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._exact), "capacity": self._bloom.capacity, "bloom_bytes": len(self._bloom._bits)}
+
+revocations = RevocationList(settings.token_revocation_capacity, settings.token_revocation_error_rate)
+_listener: Optional[asyncio.Task] = None
+# Revocations made from ORM hooks, still being published
+_publishing: Set[asyncio.Task] = set()
+
+def is_revoked(claims: Dict[str, Any]) -> bool:
+    """Whether verified token claims belong to a revoked token or user"""
+    jti = claims.get("jti")
+    if jti and revocations.revoked_at(f"jti:{jti}") is not None:
+        return True
+    sub = claims.get("sub")
+    if sub:
+        revoked_at = revocations.revoked_at(f"sub:{sub}")
+        # Tokens without iat predate revocation support; treat them as older
+        if revoked_at is not None and claims.get("iat", 0) <= revoked_at:
+            return True
+    return False
+
+def _token_entry(claims: Dict[str, Any]) -> Tuple[str, float, float]:
+    return f"jti:{claims['jti']}", time.time(), float(claims["exp"])
+
+def _user_entry(user_id: Any) -> Tuple[str, float, float]:
+    now = time.time()
+    return f"sub:{user_id}", now, now + settings.jwt_expiration_hours * 3600
+
+def _message(key: str, revoked_at: float, expires_at: float) -> str:
+    return f"{key}|{revoked_at}|{expires_at}"
+
+def _publish_blocking(key: str, revoked_at: float, expires_at: float):
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline()
+        pipe.set(f"{REVOKED_PREFIX}:{key}", _message(key, revoked_at, expires_at), ex=max(math.ceil(expires_at - revoked_at), 1))
+        pipe.publish(REVOCATION_CHANNEL, _message(key, revoked_at, expires_at))
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"Failed to publish revocation of {key}: {e}")
+
+async def _publish(key: str, revoked_at: float, expires_at: float):
+    client = await get_async_redis()
+    if client is None:
+        return
+    try:
+        async with client.pipeline() as pipe:
+            pipe.set(f"{REVOKED_PREFIX}:{key}", _message(key, revoked_at, expires_at), ex=max(math.ceil(expires_at - revoked_at), 1))
+            pipe.publish(REVOCATION_CHANNEL, _message(key, revoked_at, expires_at))
+            await pipe.execute()
+    except Exception as e:
+        logger.error(f"Failed to publish revocation of {key}: {e}")
+
+async def revoke_token(claims: Dict[str, Any]):
+    """Revoke one token (logout) until it expires"""
+    if claims.get("jti") and claims.get("exp"):
+        entry = _token_entry(claims)
+        revocations.add(*entry)
+        await _publish(*entry)
+
+def revoke_user(user_id: Any):
+    """Revoke every token issued to a user so far (usable from ORM hooks)"""
+    entry = _user_entry(user_id)
+    # In effect on this worker at once; other workers follow the publish
+    revocations.add(*entry)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Scripts: no event loop to keep responsive
+        _publish_blocking(*entry)
+        return
+    task = loop.create_task(_publish(*entry))
+    _publishing.add(task)
+    task.add_done_callback(_publishing.discard)
+
+def _apply(message: bytes):
+    key, revoked_at, expires_at = message.decode().split("|")
+    revocations.add(key, float(revoked_at), float(expires_at))
+
+async def _load(client):
+    async for name in client.scan_iter(match=f"{REVOKED_PREFIX}:*", count=1000):
+        value = await client.get(name)
+        if value:
+            _apply(value)
+
+async def _subscribe(client):
+    # Subscribe before loading so nothing published in between is missed
+    pubsub = client.pubsub()
+    try:
+        await pubsub.subscribe(REVOCATION_CHANNEL)
+        await _load(client)
+    except Exception:
+        await pubsub.aclose()
+        raise
+    logger.info(f"Following token revocations ({len(revocations)} loaded)")
+    return pubsub
+
+async def _listen_for_revocations(client, pubsub):
+    try:
+        while True:
+            try:
+                if pubsub is None:
+                    pubsub = await _subscribe(client)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        _apply(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Revocations from other workers would be missed: resubscribe
+                logger.warning(f"Token revocation listener failed: {e}. Resubscribing.")
+                if pubsub is not None:
+                    await pubsub.aclose()
+                    pubsub = None
+                await asyncio.sleep(1)
+    finally:
+        if pubsub is not None:
+            await pubsub.aclose()
+
+async def start_revocation_listener():
+    """Load stored revocations, then follow new ones from other workers"""
+    global _listener
+    client = await get_async_redis()
+    if client is None or _listener is not None:
+        return
+    try:
+        pubsub = await _subscribe(client)
+    except Exception as e:
+        logger.warning(f"Token revocations not loaded: {e}. Retrying in the background.")
+        pubsub = None
+    _listener = asyncio.create_task(_listen_for_revocations(client, pubsub))
+
+async def stop_revocation_listener():
+    global _listener
+    if _listener is None:
+        return
+    task, _listener = _listener, None
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
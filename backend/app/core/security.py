@@ -1,10 +1,32 @@
+import asyncio
+import hashlib
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.revocation import is_revoked
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.bcrypt_rounds
+)
+
+# bcrypt releases the GIL, so a small thread pool gives real parallelism
+# while keeping the ~250ms of CPU per hash off the event loop
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="password-hash"
+)
+_hash_pending = 0
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many password hashes are already queued"""
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
@@ -14,6 +36,30 @@ def get_password_hash(password: str) -> str:
     """Hash a password"""
     return pwd_context.hash(password)
 
+async def _run_hash_job(func, *args):
+    """Run a hashing call on the executor, rejecting it if the queue is full"""
+    global _hash_pending
+    if _hash_pending >= settings.password_hash_max_pending:
+        raise PasswordHasherBusy()
+    _hash_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, func, *args)
+    finally:
+        _hash_pending -= 1
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password off the event loop.
+
+    Returns (valid, new_hash); new_hash is set when the stored hash uses
+    outdated parameters (e.g. bcrypt_rounds changed) and should be saved.
+    """
+    return await _run_hash_job(pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password off the event loop"""
+    return await _run_hash_job(pwd_context.hash, password)
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -22,7 +68,10 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     else:
         expire = datetime.utcnow() + timedelta(hours=settings.jwt_expiration_hours)
     
-    to_encode.update({"exp": expire})
+    # jti lets a single token be revoked (logout); iat is compared with
+    # per-user revocations. iat keeps sub-second precision so a token issued
+    # right after a revocation is not caught by it.
+    to_encode.update({"exp": expire, "iat": time.time(), "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(
         to_encode, 
         settings.secret_key, 
@@ -30,8 +79,55 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     )
     return encoded_jwt
 
-def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
-    """Decode a JWT access token"""
+class VerifiedTokenCache:
+    """
+    Claims of recently verified tokens, keyed by a digest of the token.
+
+    A hit skips signature verification; entries are dropped once the
+    token's exp passes, so an expired token never authenticates from here.
+    Bounded LRU, per worker.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        # digest -> (claims, exp)
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, digest: bytes) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(digest)
+        if entry is None:
+            self.misses += 1
+            return None
+        claims, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[digest]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return claims
+
+    def set(self, digest: bytes, claims: Dict[str, Any]):
+        expires_at = claims.get("exp")
+        if not self.max_entries or not isinstance(expires_at, (int, float)):
+            return
+        self._entries[digest] = (claims, expires_at)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+token_cache = VerifiedTokenCache(settings.token_cache_max_entries)
+
+def _verify_access_token(token: str) -> Optional[Dict[str, Any]]:
     try:
         payload = jwt.decode(
             token, 
@@ -40,4 +136,18 @@ def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
         )
         return payload
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+
+def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
+    """Decode a JWT access token; None if invalid, expired or revoked"""
+    digest = token_cache.digest(token)
+    claims = token_cache.get(digest)
+    if claims is None:
+        claims = _verify_access_token(token)
+        if claims is None:
+            return None
+        token_cache.set(digest, claims)
+    if is_revoked(claims):
+        return None
+    # Callers get their own copy; the cached claims stay as verified
+    return dict(claims)
@@ -1,27 +1,82 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+import math
 import time
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import async_engine
+from app.core.migrations import prepare_database
+from app.core.revocation import start_revocation_listener, stop_revocation_listener
+from app.core.replicas import start_replica_monitor, stop_replica_monitor
+from app.core.security import PasswordHasherBusy
+from app.utils.cache import start_invalidation_listener, stop_invalidation_listener, close_cache
+from app.utils.rate_limit import RateLimitExceeded, RateLimitHeadersMiddleware
+from app.utils.middleware import RequestLoggingMiddleware, SecurityHeadersMiddleware
+from app.utils.metrics import CONTENT_TYPE, MetricsMiddleware, render as render_metrics
+from app.services.resume_ingestion import shutdown_ingestion
+from app.services.candidate_matching import start_candidate_index_updater, stop_candidate_index_updater
+from app.services.screening import stop_screening_scheduler
+from app.services.skill_index import start_skill_index, stop_skill_index
 from app.api import api_router
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Seconds spent in each startup step (reported by `run.py --profile-startup`)
+startup_timings: Dict[str, float] = {}
+
+@contextmanager
+def startup_step(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        startup_timings[name] = time.perf_counter() - started
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up Hireova AI API")
-    # Create database tables
-    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    # Upgrade the schema (alembic), or in production only verify its version
+    with startup_step("database"):
+        await prepare_database()
+    # Enable the per-worker L1 cache once invalidations can reach us. Redis
+    # is first contacted here, so an unreachable server costs at most
+    # redis_connect_timeout once.
+    with startup_step("cache invalidation listener"):
+        await start_invalidation_listener()
+    # Load token revocations and follow those made by other workers
+    with startup_step("token revocations"):
+        await start_revocation_listener()
+    # One worker drains the candidate index outbox; the others read the index
+    with startup_step("candidate index updater"):
+        await start_candidate_index_updater()
+    # Build the skill filter index in the background; /candidates/filter
+    # answers 503 until it is ready
+    with startup_step("skill index"):
+        await start_skill_index()
+    # Measure read replica lag before sending reads to them
+    with startup_step("read replicas"):
+        await start_replica_monitor()
+    logger.info(f"Startup complete in {time.perf_counter() - started:.3f}s")
     yield
     # Shutdown
     logger.info("Shutting down Hireova AI API")
+    shutdown_ingestion()
+    await stop_screening_scheduler()
+    await stop_candidate_index_updater()
+    await stop_skill_index()
+    await stop_invalidation_listener()
+    await stop_revocation_listener()
+    await stop_replica_monitor()
+    await close_cache()
+    await async_engine.dispose()
 
 app = FastAPI(
     title=settings.app_name,
@@ -33,14 +88,7 @@ app = FastAPI(
 )
 
 # Security Headers Middleware
-@app.middleware("http")
-async def add_security_headers(request: Request, call_next):
-    response = await call_next(request)
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-    return response
+app.add_middleware(SecurityHeadersMiddleware)
 
 # CORS Configuration
 app.add_middleware(
@@ -58,18 +106,34 @@ app.add_middleware(
     allowed_hosts=settings.allowed_hosts
 )
 
+# X-RateLimit-* headers for requests checked by the API rate limiter
+app.add_middleware(RateLimitHeadersMiddleware)
+
 # Request Logging Middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    logger.info(
-        f"{request.method} {request.url.path} "
-        f"completed in {process_time:.3f}s "
-        f"with status {response.status_code}"
+app.add_middleware(RequestLoggingMiddleware)
+
+# Request/DB metrics per route template; added last so it is outermost and
+# times the whole middleware stack
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+# Password hashing queue is full (login/register flood)
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many authentication requests, please retry", "type": "overloaded"},
+        headers={"Retry-After": "1"}
+    )
+
+# Per-user/organization/IP request budget exhausted
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Rate limit exceeded, please retry later", "type": "rate_limited"},
+        headers={"Retry-After": str(max(math.ceil(exc.result.retry_after), 1))}
     )
-    return response
 
 # Global Exception Handler
 @app.exception_handler(Exception)
@@ -89,6 +153,12 @@ async def health_check():
         "version": settings.app_version
     }
 
+# Prometheus scrape endpoint (values of this worker process)
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return Response(render_metrics(), media_type=CONTENT_TYPE)
+
 # Root endpoint
 @app.get("/")
 async def root():
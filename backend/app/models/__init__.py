@@ -3,5 +3,8 @@ from app.models.organization import Organization
 from app.models.job import Job
 from app.models.candidate import Candidate
 from app.models.application import Application
+from app.models.screening_result import ScreeningResult
+from app.models.pipeline_stat import PipelineStat
+from app.models.candidate_index_change import CandidateIndexChange
 
-__all__ = ["User", "Organization", "Job", "Candidate", "Application"]
\ No newline at end of file
+__all__ = ["User", "Organization", "Job", "Candidate", "Application", "ScreeningResult", "PipelineStat", "CandidateIndexChange"]
\ No newline at end of file
@@ -1,5 +1,4 @@
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey, JSON, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, JSON, Text, Uuid, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 import uuid
@@ -8,9 +7,9 @@ from datetime import datetime
 class Application(Base):
     __tablename__ = "applications"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id"), nullable=False)
-    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id"), nullable=False)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    job_id = Column(Uuid, ForeignKey("jobs.id"), nullable=False)
+    candidate_id = Column(Uuid, ForeignKey("candidates.id"), nullable=False)
     status = Column(String(50), default="pending")  # pending, screening, interviewed, rejected, hired
     ai_score = Column(Float)  # Match score 0-100
     ai_analysis = Column(JSON)  # Detailed AI analysis
@@ -21,4 +20,23 @@ class Application(Base):
     
     # Relationships
     job = relationship("Job", back_populates="applications")
-    candidate = relationship("Candidate", back_populates="applications")
\ No newline at end of file
+    candidate = relationship("Candidate", back_populates="applications")
+
+    __table_args__ = (
+        # Keyset pagination: newest first overall and per job
+        Index("ix_applications_created", "created_at", "id"),
+        Index("ix_applications_job_created", "job_id", "created_at", "id"),
+        # Pipeline views: a candidate's applications, a job's applications by stage
+        Index("ix_applications_candidate", "candidate_id"),
+        Index("ix_applications_job_status", "job_id", "status"),
+        # Top applicants for a job by match score
+        Index(
+            "ix_applications_job_score", job_id, ai_score.desc(),
+            postgresql_where=ai_score.isnot(None), sqlite_where=ai_score.isnot(None)
+        ),
+        # Applications still waiting for AI screening
+        Index(
+            "ix_applications_job_unscreened", job_id,
+            postgresql_where=ai_score.is_(None), sqlite_where=ai_score.is_(None)
+        ),
+    )
\ No newline at end of file
@@ -1,5 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, DateTime, JSON, Uuid, DDL, Index, event, func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 import uuid
@@ -8,7 +7,7 @@ from datetime import datetime
 class Candidate(Base):
     __tablename__ = "candidates"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     email = Column(String(255), nullable=False, index=True)
     name = Column(String(255))
     phone = Column(String(50))
@@ -26,4 +25,61 @@ class Candidate(Base):
     last_matched = Column(DateTime)
     
     # Relationships
-    applications = relationship("Application", back_populates="candidate")
\ No newline at end of file
+    applications = relationship("Application", back_populates="candidate")
+
+    __table_args__ = (
+        # Keyset pagination: newest first
+        Index("ix_candidates_created", "created_at", "id"),
+        # Case-insensitive lookups by email (imports, resume ingestion)
+        Index("ix_candidates_email_lower", func.lower(email)),
+    )
+
+# Full-text search over name and resume_text: a generated tsvector column
+# with a GIN index on Postgres, an FTS5 external-content table kept in sync
+# by triggers on SQLite. Neither is mapped; app.services.fulltext queries
+# them directly. FTS5 rows are keyed by search_rowid rather than the
+# implicit rowid of candidates, which VACUUM may renumber (the primary key
+# is a UUID); new rows take the next number in the insert trigger.
+FULLTEXT_DDL = {
+    "postgresql": [
+        """ALTER TABLE candidates ADD COLUMN IF NOT EXISTS search_vector tsvector
+           GENERATED ALWAYS AS (
+               setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+               setweight(to_tsvector('english', coalesce(resume_text, '')), 'B')
+           ) STORED""",
+        "CREATE INDEX IF NOT EXISTS ix_candidates_search_vector ON candidates USING GIN (search_vector)",
+    ],
+    "sqlite": [
+        "ALTER TABLE candidates ADD COLUMN search_rowid INTEGER",
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_candidates_search_rowid ON candidates (search_rowid)",
+        """CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5(
+               name, resume_text, content='candidates', content_rowid='search_rowid',
+               tokenize='porter unicode61'
+           )""",
+        """CREATE TRIGGER IF NOT EXISTS candidates_fts_insert AFTER INSERT ON candidates BEGIN
+               UPDATE candidates SET search_rowid = (SELECT coalesce(max(search_rowid), 0) + 1 FROM candidates)
+               WHERE rowid = new.rowid;
+               INSERT INTO candidates_fts(rowid, name, resume_text)
+               SELECT search_rowid, name, resume_text FROM candidates WHERE rowid = new.rowid;
+           END""",
+        """CREATE TRIGGER IF NOT EXISTS candidates_fts_delete AFTER DELETE ON candidates BEGIN
+               INSERT INTO candidates_fts(candidates_fts, rowid, name, resume_text)
+               VALUES ('delete', old.search_rowid, old.name, old.resume_text);
+           END""",
+        """CREATE TRIGGER IF NOT EXISTS candidates_fts_update AFTER UPDATE OF name, resume_text ON candidates BEGIN
+               INSERT INTO candidates_fts(candidates_fts, rowid, name, resume_text)
+               VALUES ('delete', old.search_rowid, old.name, old.resume_text);
+               INSERT INTO candidates_fts(rowid, name, resume_text)
+               VALUES (new.search_rowid, new.name, new.resume_text);
+           END""",
+    ],
+}
+
+for _dialect, _statements in FULLTEXT_DDL.items():
+    for _statement in _statements:
+        event.listen(Candidate.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+event.listen(
+    Candidate.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS candidates_fts").execute_if(dialect="sqlite")
+)
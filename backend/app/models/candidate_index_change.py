@@ -0,0 +1,13 @@
+from sqlalchemy import BigInteger, Column, Integer, Uuid
+from app.core.database import Base
+
+class CandidateIndexChange(Base):
+    """
+    Outbox of candidates to re-embed: written in the same transaction as the
+    change, drained by the candidate index writer
+    (app.services.candidate_matching), which reads the current row.
+    """
+    __tablename__ = "candidate_index_changes"
+    
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    candidate_id = Column(Uuid, nullable=False)  # no foreign key: deleted candidates are queued too
@@ -1,5 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, JSON, Uuid, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 import uuid
@@ -8,8 +7,8 @@ from datetime import datetime
 class Job(Base):
     __tablename__ = "jobs"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    organization_id = Column(Uuid, ForeignKey("organizations.id"), nullable=False)
     title = Column(String(255), nullable=False)
     description = Column(Text)
     requirements = Column(JSON)
@@ -24,4 +23,10 @@ class Job(Base):
     
     # Relationships
     organization = relationship("Organization", back_populates="jobs")
-    applications = relationship("Application", back_populates="job")
\ No newline at end of file
+    applications = relationship("Application", back_populates="job")
+
+    # Keyset pagination: newest first within an organization, optionally by status
+    __table_args__ = (
+        Index("ix_jobs_organization_created", "organization_id", "created_at", "id"),
+        Index("ix_jobs_organization_status", "organization_id", "status", "created_at", "id"),
+    )
\ No newline at end of file
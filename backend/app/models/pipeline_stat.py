@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, Integer, Uuid
+from app.core.database import Base
+
+class PipelineStat(Base):
+    """
+    Application counts per job and per organization, kept up to date by
+    app.services.pipeline_stats; one row per (scope, metric, bucket).
+    """
+    __tablename__ = "pipeline_stats"
+    
+    scope_id = Column(Uuid, primary_key=True)  # job id, or organization id for organization totals
+    metric = Column(String(20), primary_key=True)  # status, score
+    bucket = Column(String(50), primary_key=True)  # status value; score decile "0".."90" or "unscored"
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, Float, DateTime, JSON
+from app.core.database import Base
+from datetime import datetime
+
+class ScreeningResult(Base):
+    """LLM screening output, addressed by a hash of everything that shaped it"""
+    __tablename__ = "screening_results"
+    
+    key = Column(String(64), primary_key=True)  # sha256 of prompt version, model, temperature, job and resume
+    prompt_version = Column(String(50), nullable=False, index=True)
+    model = Column(String(100), nullable=False)
+    score = Column(Float, nullable=False)
+    analysis = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
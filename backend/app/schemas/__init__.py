@@ -1,15 +1,16 @@
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserLogin
 from app.schemas.organization import OrganizationCreate, OrganizationUpdate, OrganizationResponse
-from app.schemas.job import JobCreate, JobUpdate, JobResponse
-from app.schemas.candidate import CandidateCreate, CandidateUpdate, CandidateResponse
-from app.schemas.application import ApplicationCreate, ApplicationUpdate, ApplicationResponse
+from app.schemas.job import JobCreate, JobUpdate, JobResponse, JobPage
+from app.schemas.candidate import CandidateCreate, CandidateImport, CandidateUpdate, CandidateResponse, CandidateMatch, CandidateFilterResult, CandidatePage, IngestionFileStatus, IngestionJobStatus
+from app.schemas.application import ApplicationCreate, ApplicationUpdate, ApplicationResponse, ApplicationPage, PipelineStats, ScreeningRequest, ScreeningQueued
 from app.schemas.auth import Token, TokenData
 
 __all__ = [
     "UserCreate", "UserUpdate", "UserResponse", "UserLogin",
     "OrganizationCreate", "OrganizationUpdate", "OrganizationResponse",
-    "JobCreate", "JobUpdate", "JobResponse",
-    "CandidateCreate", "CandidateUpdate", "CandidateResponse",
-    "ApplicationCreate", "ApplicationUpdate", "ApplicationResponse",
+    "JobCreate", "JobUpdate", "JobResponse", "JobPage",
+    "CandidateCreate", "CandidateImport", "CandidateUpdate", "CandidateResponse", "CandidateMatch", "CandidateFilterResult", "CandidatePage",
+    "IngestionFileStatus", "IngestionJobStatus",
+    "ApplicationCreate", "ApplicationUpdate", "ApplicationResponse", "ApplicationPage", "PipelineStats", "ScreeningRequest", "ScreeningQueued",
     "Token", "TokenData"
 ]
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from uuid import UUID
 from datetime import datetime
 
@@ -22,4 +22,22 @@ class ApplicationResponse(ApplicationBase):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ApplicationPage(BaseModel):
+    items: List[ApplicationResponse]
+    next_cursor: Optional[str] = None
+
+class PipelineStats(BaseModel):
+    total: int
+    status: Dict[str, int]  # applications per status
+    score: Dict[str, int]  # ai_score histogram: deciles "0".."90" and "unscored"
+
+class ScreeningRequest(BaseModel):
+    job_id: Optional[UUID] = None
+    application_ids: Optional[List[UUID]] = None
+    rescreen: bool = False
+
+class ScreeningQueued(BaseModel):
+    queued: int
+    pending: int
\ No newline at end of file
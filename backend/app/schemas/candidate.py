@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 from datetime import datetime
@@ -14,6 +14,17 @@ class CandidateCreate(CandidateBase):
     resume_text: Optional[str] = None
     source: str = "upload"
 
+class CandidateImport(CandidateCreate):
+    """One row of a bulk import; lengths match the candidates columns"""
+    name: Optional[str] = Field(None, max_length=255)
+    phone: Optional[str] = Field(None, max_length=50)
+    location: Optional[str] = Field(None, max_length=255)
+    linkedin_url: Optional[str] = Field(None, max_length=500)
+    linkedin_id: Optional[str] = Field(None, max_length=255)
+    skills: Optional[List[str]] = None
+    experience_years: Optional[str] = Field(None, max_length=20)
+    source: str = Field("import", max_length=50)
+
 class CandidateUpdate(BaseModel):
     name: Optional[str] = None
     phone: Optional[str] = None
@@ -30,4 +41,31 @@ class CandidateResponse(CandidateBase):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class CandidateMatch(BaseModel):
+    candidate: CandidateResponse
+    score: float
+
+class CandidateFilterResult(BaseModel):
+    count: int
+    candidates: List[CandidateResponse]
+
+class IngestionFileStatus(BaseModel):
+    name: str
+    status: str  # queued, processing, done, failed, skipped
+    candidate_id: Optional[UUID] = None
+    error: Optional[str] = None
+
+class IngestionJobStatus(BaseModel):
+    id: UUID
+    status: str
+    total: int
+    counts: Dict[str, int]
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    files: List[IngestionFileStatus]
+
+class CandidatePage(BaseModel):
+    items: List[CandidateResponse]
+    next_cursor: Optional[str] = None
\ No newline at end of file
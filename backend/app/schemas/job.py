@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from uuid import UUID
 from datetime import datetime
 
@@ -34,4 +34,8 @@ class JobResponse(JobBase):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class JobPage(BaseModel):
+    items: List[JobResponse]
+    next_cursor: Optional[str] = None
\ No newline at end of file
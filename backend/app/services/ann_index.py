@@ -0,0 +1,368 @@
+"""
+Approximate-nearest-neighbour index over candidate embeddings.
+
+An IVF-Flat index built on NumPy: vectors are L2-normalised (cosine
+similarity), clustered into `nlist` inverted lists by k-means, and a query
+scans only the `nprobe` lists whose centroids are closest. Everything lives
+in memory-mapped files under one directory, so a worker opens a
+million-vector index without reading it into RAM:
+
+    meta.json       dim, nlist, row count, trained flag, generation
+    vectors.f32     float32 [capacity, dim]
+    ids.u8          uint8   [capacity, 16]   candidate UUID bytes
+    lists.i32       int32   [capacity]       inverted list per row
+    centroids.f32   float32 [nlist, dim]     (after training)
+
+Inserts append rows; deletes tombstone them (lists = DELETED) and
+`compact()` reclaims the space. Until the index has been trained, and
+whenever `exact=True` is passed, search scans every live row, which is the
+ground truth for recall measurement.
+
+One process writes (it holds `acquire_lock(path + ".lock")`); others open
+the index with readonly=True and call `refresh()` to map the rows it has
+appended since. Training, compaction and rebuilds start a new generation,
+which readers reload from scratch.
+"""
+import json
+import os
+import threading
+import uuid
+from typing import IO, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: run a single worker, which owns the index
+    fcntl = None
+
+UNASSIGNED = -1
+DELETED = -2
+_MIN_CAPACITY = 1024
+_KMEANS_ITERATIONS = 10
+_CHUNK = 65536
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+def acquire_lock(lock_path: str) -> Optional[IO]:
+    """Exclusive lock on `lock_path`, or None if another process holds it.
+
+    Held until the returned file is closed or the process exits.
+    """
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    lock_file = open(lock_path, "a")
+    if fcntl is None:
+        return lock_file
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return None
+    return lock_file
+
+class IVFIndex:
+    def __init__(self, path: str, dim: int, nlist: int = 1024, nprobe: int = 16, readonly: bool = False):
+        """Open the index at `path`; a writable index is created if it does not exist"""
+        self.path = path
+        self.nprobe = nprobe
+        self.readonly = readonly
+        self._lock = threading.RLock()
+        meta = self._read_meta()
+        if meta is not None:
+            if meta["dim"] != dim:
+                raise ValueError(
+                    f"Index at {path} holds {meta['dim']}-d vectors but the embedder produces {dim}-d; "
+                    f"rebuild it with rebuild_candidate_index.py"
+                )
+            self.dim = meta["dim"]
+            self.nlist = meta["nlist"]
+            self.trained = meta["trained"]
+            self.generation = meta.get("generation", "")
+            self._count = meta["count"]
+            capacity = meta["capacity"]
+        else:
+            self.dim = dim
+            self.nlist = nlist
+            self.trained = False
+            self.generation = uuid.uuid4().hex
+            self._count = 0
+            capacity = _MIN_CAPACITY
+            if not readonly:
+                os.makedirs(path, exist_ok=True)
+        self._meta = meta
+        self._open_arrays(capacity)
+        self._centroids = None
+        if self.trained:
+            self._centroids = np.fromfile(self._file("centroids.f32"), dtype=np.float32).reshape(self.nlist, self.dim)
+        self._load_mappings()
+
+    # Storage
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            with open(self._file("meta.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _open_arrays(self, capacity: int):
+        self._capacity = capacity
+        self._vectors = self._memmap("vectors.f32", np.float32, (capacity, self.dim))
+        self._ids = self._memmap("ids.u8", np.uint8, (capacity, 16))
+        self._lists = self._memmap("lists.i32", np.int32, (capacity,), fill=UNASSIGNED)
+
+    def _memmap(self, name: str, dtype, shape, fill=None) -> np.memmap:
+        filename = self._file(name)
+        if self.readonly:
+            if not os.path.exists(filename):
+                # Nothing written yet: an empty index until refresh() sees one
+                return np.full(shape, 0 if fill is None else fill, dtype=dtype)
+            return np.memmap(filename, dtype=dtype, mode="r", shape=shape)
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        existing = os.path.getsize(filename) if os.path.exists(filename) else 0
+        if existing < size:
+            with open(filename, "ab") as f:
+                f.truncate(size)
+        array = np.memmap(filename, dtype=dtype, mode="r+", shape=shape)
+        if fill is not None and existing < size:
+            array.reshape(-1)[existing // np.dtype(dtype).itemsize:] = fill
+        return array
+
+    def _grow(self, needed: int):
+        if needed <= self._capacity:
+            return
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        self.flush()
+        del self._vectors, self._ids, self._lists
+        self._open_arrays(capacity)
+
+    def _load_mappings(self):
+        """Rebuild id -> row and per-list row arrays from the mapped files"""
+        lists = np.asarray(self._lists[:self._count])
+        live = np.flatnonzero(lists != DELETED)
+        self._row_of: Dict[bytes, int] = {
+            self._ids[row].tobytes(): int(row) for row in live
+        }
+        self._list_rows: List[np.ndarray] = []
+        self._pending_rows: List[List[int]] = [[] for _ in range(self.nlist)]
+        if self.trained:
+            order = np.argsort(lists, kind="stable")
+            boundaries = np.searchsorted(lists[order], np.arange(self.nlist + 1))
+            self._list_rows = [
+                order[boundaries[i]:boundaries[i + 1]].astype(np.int64) for i in range(self.nlist)
+            ]
+
+    def flush(self):
+        """Persist mapped arrays, then metadata (which publishes the rows to readers)"""
+        with self._lock:
+            for array in (self._vectors, self._ids, self._lists):
+                array.flush()
+            meta = {
+                "dim": self.dim,
+                "nlist": self.nlist,
+                "trained": self.trained,
+                "generation": self.generation,
+                "count": self._count,
+                "capacity": self._capacity,
+            }
+            tmp = self._file("meta.json.tmp")
+            with open(tmp, "w") as f:
+                json.dump(meta, f)
+            os.replace(tmp, self._file("meta.json"))
+            self._meta = meta
+
+    def refresh(self) -> bool:
+        """Pick up what the writer has published since (readers); True if anything changed"""
+        try:
+            meta = self._read_meta()
+        except ValueError:
+            # Caught between the writer's write and rename; next time
+            return False
+        if meta is None or meta == self._meta:
+            return False
+        with self._lock:
+            if meta.get("generation", "") != self.generation:
+                try:
+                    fresh = IVFIndex(self.path, self.dim, self.nlist, self.nprobe, readonly=self.readonly)
+                except FileNotFoundError:
+                    # A rebuild is being swapped in; keep serving this one
+                    return False
+                fresh_state = dict(fresh.__dict__)
+                fresh_state["_lock"] = self._lock
+                self.__dict__.update(fresh_state)
+                return True
+            if meta["capacity"] != self._capacity:
+                self._open_arrays(meta["capacity"])
+            start, end = self._count, meta["count"]
+            lists = np.asarray(self._lists[start:end])
+            ids = np.asarray(self._ids[start:end])
+            for offset in np.flatnonzero(lists != DELETED):
+                row = start + int(offset)
+                # A re-added id moves to its new row; the old one is tombstoned
+                self._row_of[ids[offset].tobytes()] = row
+                if self.trained:
+                    self._pending_rows[lists[offset]].append(row)
+            self._count = end
+            self._meta = meta
+            return True
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    @property
+    def tombstones(self) -> int:
+        return self._count - len(self._row_of)
+
+    # Mutation
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), _CHUNK):
+            chunk = vectors[start:start + _CHUNK]
+            assignments[start:start + _CHUNK] = np.argmax(chunk @ self._centroids.T, axis=1)
+        return assignments
+
+    def add(self, ids: Sequence[UUID], vectors: np.ndarray):
+        """Insert or replace vectors for the given candidate ids"""
+        if len(ids) == 0:
+            return
+        vectors = _normalize(vectors).reshape(len(ids), self.dim)
+        with self._lock:
+            self.remove(ids)
+            start = self._count
+            self._grow(start + len(ids))
+            end = start + len(ids)
+            self._vectors[start:end] = vectors
+            self._ids[start:end] = np.frombuffer(b"".join(i.bytes for i in ids), dtype=np.uint8).reshape(-1, 16)
+            if self.trained:
+                assignments = self._assign(vectors)
+                self._lists[start:end] = assignments
+                for row, list_id in zip(range(start, end), assignments):
+                    self._pending_rows[list_id].append(row)
+            else:
+                self._lists[start:end] = UNASSIGNED
+            for row, candidate_id in zip(range(start, end), ids):
+                self._row_of[candidate_id.bytes] = row
+            self._count = end
+
+    def remove(self, ids: Iterable[UUID]) -> int:
+        """Tombstone vectors; returns how many were present"""
+        removed = 0
+        with self._lock:
+            for candidate_id in ids:
+                row = self._row_of.pop(candidate_id.bytes, None)
+                if row is not None:
+                    self._lists[row] = DELETED
+                    removed += 1
+        return removed
+
+    def __contains__(self, candidate_id: UUID) -> bool:
+        return candidate_id.bytes in self._row_of
+
+    def train(self, sample_size: Optional[int] = None, seed: int = 0):
+        """Cluster live vectors into nlist lists (k-means) and assign all rows"""
+        with self._lock:
+            live = np.fromiter(self._row_of.values(), dtype=np.int64, count=len(self._row_of))
+            live.sort()
+            if len(live) < self.nlist:
+                raise ValueError(f"Need at least nlist={self.nlist} vectors to train, have {len(live)}")
+            rng = np.random.default_rng(seed)
+            sample_size = min(len(live), sample_size or self.nlist * 64)
+            sample = np.asarray(self._vectors[np.sort(rng.choice(live, sample_size, replace=False))])
+            centroids = sample[rng.choice(len(sample), self.nlist, replace=False)].copy()
+            for _ in range(_KMEANS_ITERATIONS):
+                assignments = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assignments, sample)
+                counts = np.bincount(assignments, minlength=self.nlist)
+                empty = counts == 0
+                # Re-seed empty clusters from random sample points
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+                centroids = _normalize(sums)
+
+            self._centroids = centroids.astype(np.float32)
+            self._centroids.tofile(self._file("centroids.f32"))
+            for start in range(0, len(live), _CHUNK):
+                rows = live[start:start + _CHUNK]
+                self._lists[rows] = self._assign(np.asarray(self._vectors[rows]))
+            self.trained = True
+            self.generation = uuid.uuid4().hex
+            self._load_mappings()
+            self.flush()
+
+    def compact(self):
+        """Rewrite the files without tombstoned rows"""
+        with self._lock:
+            live = np.fromiter(self._row_of.values(), dtype=np.int64, count=len(self._row_of))
+            live.sort()
+            count = len(live)
+            vectors = np.asarray(self._vectors[live])
+            ids = np.asarray(self._ids[live])
+            lists = np.asarray(self._lists[live])
+            capacity = max(_MIN_CAPACITY, count)
+            del self._vectors, self._ids, self._lists
+            for name in ("vectors.f32", "ids.u8", "lists.i32"):
+                os.remove(self._file(name))
+            self._open_arrays(capacity)
+            self._vectors[:count] = vectors
+            self._ids[:count] = ids
+            self._lists[:count] = lists
+            self._count = count
+            self.generation = uuid.uuid4().hex
+            self._load_mappings()
+            self.flush()
+
+    # Search
+
+    def _candidate_rows(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        scores = self._centroids @ query
+        nprobe = min(nprobe, self.nlist)
+        probe = np.argpartition(-scores, nprobe - 1)[:nprobe]
+        for list_id in probe:
+            pending = self._pending_rows[list_id]
+            if pending:
+                self._list_rows[list_id] = np.concatenate(
+                    (self._list_rows[list_id], np.asarray(pending, dtype=np.int64))
+                )
+                pending.clear()
+        rows = np.concatenate([self._list_rows[list_id] for list_id in probe])
+        return rows[np.asarray(self._lists[rows]) != DELETED]
+
+    def search(self, query: np.ndarray, k: int = 10, nprobe: Optional[int] = None, exact: bool = False) -> List[Tuple[UUID, float]]:
+        """Top-k (candidate_id, cosine similarity), best first"""
+        query = _normalize(query).reshape(self.dim)
+        with self._lock:
+            if exact or not self.trained:
+                rows = np.fromiter(self._row_of.values(), dtype=np.int64, count=len(self._row_of))
+                rows.sort()
+                # Readers only learn of the writer's deletes through the lists file
+                rows = rows[np.asarray(self._lists[rows]) != DELETED]
+            else:
+                rows = self._candidate_rows(query, nprobe or self.nprobe)
+            if len(rows) == 0:
+                return []
+            scores = np.asarray(self._vectors[rows]) @ query
+            k = min(k, len(rows))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                (UUID(bytes=self._ids[rows[i]].tobytes()), float(scores[i])) for i in top
+            ]
+
+    def recall(self, queries: np.ndarray, k: int = 10, nprobe: Optional[int] = None) -> float:
+        """Fraction of exact top-k neighbours that the ANN search also returns"""
+        hits = 0
+        for query in np.atleast_2d(queries):
+            expected = {candidate_id for candidate_id, _ in self.search(query, k, exact=True)}
+            found = {candidate_id for candidate_id, _ in self.search(query, k, nprobe=nprobe)}
+            hits += len(expected & found)
+        return hits / (k * len(np.atleast_2d(queries)))
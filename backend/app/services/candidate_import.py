@@ -0,0 +1,233 @@
+"""
+Bulk candidate import from CSV or JSONL (e.g. an ATS export).
+
+The file is read lazily from disk in batches of
+`candidate_import_batch_size` rows, so memory use does not depend on its
+size. Each batch is validated against CandidateImport, de-duplicated on
+email and linkedin_id, and written in one transaction: an executemany
+UPDATE (by primary key) for candidates that already exist, and
+multi-row INSERT ... VALUES (...), (...) ON CONFLICT (linkedin_id) DO UPDATE
+statements for new ones, each kept under the driver's bind parameter limit.
+
+`import_candidates` yields progress and per-row error events, used by both
+POST /candidates/import and the import_candidates.py script.
+"""
+import asyncio
+import csv
+import itertools
+import json
+import uuid
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import bindparam, func, or_, select, update
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, dialect_insert
+from app.models import Candidate
+from app.schemas import CandidateImport
+from app.services.candidate_matching import queue_candidate_updates
+import logging
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "jsonl")
+FIELDS = tuple(CandidateImport.model_fields)
+_batch_adapter = TypeAdapter(List[CandidateImport])
+
+# Rows are (row number, raw dict) or (row number, error message)
+Row = Tuple[int, Any]
+
+def detect_format(filename: Optional[str] = None, content_type: Optional[str] = None) -> Optional[str]:
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in ("text/csv", "application/csv"):
+        return "csv"
+    if content_type in ("application/x-ndjson", "application/jsonl", "application/json-lines"):
+        return "jsonl"
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return None
+
+def _clean(row: Dict[str, Any]) -> Dict[str, Any]:
+    cleaned = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        key = key.strip().lower()
+        if isinstance(value, str):
+            value = value.strip() or None
+        if key == "skills" and isinstance(value, str):
+            value = [skill.strip() for skill in value.replace(";", ",").split(",") if skill.strip()]
+        if value is not None:
+            cleaned[key] = value
+    return cleaned
+
+def read_rows(path: str, fmt: str) -> Iterator[Row]:
+    """Lazily yield rows from a CSV (with header) or JSONL file"""
+    with open(path, encoding="utf-8-sig", errors="replace", newline="") as f:
+        if fmt == "csv":
+            # Row numbers as a spreadsheet shows them: the header is row 1
+            for row_number, row in enumerate(csv.DictReader(f), start=2):
+                yield row_number, _clean(row)
+        elif fmt == "jsonl":
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, f"Invalid JSON: {e.msg}"
+                    continue
+                yield line_number, _clean(row) if isinstance(row, dict) else "Expected a JSON object"
+        else:
+            raise ValueError(f"Unsupported import format: {fmt}")
+
+def _errors(error: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}" for e in error.errors()]
+
+def validate_batch(rows: List[Row]) -> Tuple[List[Tuple[int, CandidateImport]], List[Tuple[int, List[str]]]]:
+    """Validate a whole batch at once, falling back to row by row on errors"""
+    parsed = [(line, raw) for line, raw in rows if isinstance(raw, dict)]
+    errors = [(line, [raw]) for line, raw in rows if not isinstance(raw, dict)]
+    try:
+        models = _batch_adapter.validate_python([raw for _, raw in parsed])
+        return [(line, model) for (line, _), model in zip(parsed, models)], errors
+    except ValidationError:
+        pass
+    valid = []
+    for line, raw in parsed:
+        try:
+            valid.append((line, CandidateImport.model_validate(raw)))
+        except ValidationError as e:
+            errors.append((line, _errors(e)))
+    errors.sort()
+    return valid, errors
+
+def _values(candidate: CandidateImport) -> Dict[str, Any]:
+    values = candidate.model_dump(include=set(FIELDS))
+    values["email"] = values["email"].lower()
+    return values
+
+def _dedupe(rows: List[Tuple[int, CandidateImport]]) -> Tuple[List[Dict[str, Any]], int]:
+    """Merge rows sharing an email or linkedin_id; later rows win per field"""
+    merged: Dict[str, Dict[str, Any]] = {}
+    email_of_linkedin: Dict[str, str] = {}
+    for _, candidate in rows:
+        values = _values(candidate)
+        key = values["email"]
+        if values["linkedin_id"] and values["linkedin_id"] in email_of_linkedin:
+            key = email_of_linkedin[values["linkedin_id"]]
+        current = merged.setdefault(key, {})
+        current.update({field: value for field, value in values.items() if value is not None or field not in current})
+        if current.get("linkedin_id"):
+            email_of_linkedin[current["linkedin_id"]] = key
+    return list(merged.values()), len(rows) - len(merged)
+
+# asyncpg (Postgres' wire protocol) accepts at most 32767 bind parameters per statement
+MAX_BIND_PARAMS = 32767
+
+def _insert_statements(dialect: str, rows: List[Dict[str, Any]]):
+    """Multi-row INSERT ... ON CONFLICT statements, each under MAX_BIND_PARAMS"""
+    insert = dialect_insert(dialect)
+    # Every column may take a parameter (Python-side defaults included)
+    per_statement = MAX_BIND_PARAMS // len(Candidate.__table__.columns)
+    for start in range(0, len(rows), per_statement):
+        statement = insert(Candidate).values(rows[start:start + per_statement])
+        # A concurrent import may have created the same linkedin_id meanwhile
+        yield statement.on_conflict_do_update(
+            index_elements=[Candidate.linkedin_id],
+            set_={
+                **{field: func.coalesce(statement.excluded[field], Candidate.__table__.c[field]) for field in FIELDS if field != "linkedin_id"},
+                "updated_at": statement.excluded.updated_at,
+            }
+        )
+
+def _update_statements(rows: List[Dict[str, Any]]):
+    """One UPDATE ... WHERE id = :_id per distinct set of columns"""
+    table = Candidate.__table__
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for row in rows:
+        columns = tuple(sorted(field for field in row if field != "id"))
+        groups.setdefault(columns, []).append({**row, "_id": row["id"]})
+    for columns, params in groups.items():
+        statement = update(table).where(table.c.id == bindparam("_id")).values({column: bindparam(column) for column in columns})
+        yield statement, params
+
+async def write_batch(rows: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """Upsert merged rows; returns (inserted, updated)"""
+    emails = [row["email"] for row in rows]
+    linkedin_ids = [row["linkedin_id"] for row in rows if row["linkedin_id"]]
+    now = datetime.utcnow()
+    async with AsyncSessionLocal() as db:
+        # Imported emails are lowercase; stored ones may not be (ix_candidates_email_lower)
+        match = func.lower(Candidate.email).in_(emails)
+        if linkedin_ids:
+            match = or_(match, Candidate.linkedin_id.in_(linkedin_ids))
+        existing = (await db.execute(select(Candidate.id, Candidate.email, Candidate.linkedin_id).where(match))).all()
+        by_email = {row.email.lower(): row.id for row in existing}
+        by_linkedin = {row.linkedin_id: row.id for row in existing if row.linkedin_id}
+
+        updates, inserts = [], []
+        for row in rows:
+            candidate_id = by_linkedin.get(row["linkedin_id"]) or by_email.get(row["email"])
+            if candidate_id is None:
+                inserts.append({**row, "id": uuid.uuid4(), "created_at": now, "updated_at": now})
+            else:
+                # Columns missing from the import keep their current values
+                updates.append({
+                    **{field: value for field, value in row.items() if value is not None},
+                    "id": candidate_id,
+                    "updated_at": now,
+                })
+        # Core rather than the ORM bulk paths, which fall back to one
+        # statement per row for ON CONFLICT. UPDATEs run as driver
+        # executemany; INSERTs are real multi-row statements
+        connection = await db.connection()
+        for statement, params in _update_statements(updates):
+            await connection.execute(statement, params)
+        if inserts:
+            for statement in _insert_statements(connection.dialect.name, inserts):
+                await connection.execute(statement)
+        await queue_candidate_updates(connection, [
+            row["id"] for row in updates + inserts
+            if row.get("resume_text") is not None or row.get("skills") is not None
+        ])
+        await db.commit()
+    return len(inserts), len(updates)
+
+async def import_candidates(path: str, fmt: str, batch_size: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Import a CSV/JSONL file, yielding events as it goes:
+    {"row": n, "errors": [...]} for each rejected row, and
+    {"processed", "inserted", "updated", "duplicates", "failed"} after each batch
+    (with "done": true on the last one).
+    """
+    batch_size = batch_size or settings.candidate_import_batch_size
+    stats = {"processed": 0, "inserted": 0, "updated": 0, "duplicates": 0, "failed": 0}
+    rows = read_rows(path, fmt)
+    while True:
+        batch = await asyncio.to_thread(lambda: list(itertools.islice(rows, batch_size)))
+        if not batch:
+            break
+        valid, errors = validate_batch(batch)
+        merged, duplicates = _dedupe(valid)
+        if merged:
+            try:
+                inserted, updated = await write_batch(merged)
+            except Exception as e:
+                logger.error(f"Candidate import batch failed: {e}")
+                errors = sorted(errors + [(line, [f"Could not save batch: {type(e).__name__}"]) for line, _ in valid])
+                inserted = updated = duplicates = 0
+        else:
+            inserted = updated = 0
+        for line, messages in errors:
+            yield {"row": line, "errors": messages}
+        stats["processed"] += len(batch)
+        stats["inserted"] += inserted
+        stats["updated"] += updated
+        stats["duplicates"] += duplicates
+        stats["failed"] += len(errors)
+        yield dict(stats)
+    yield {**stats, "done": True}
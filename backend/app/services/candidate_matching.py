@@ -0,0 +1,315 @@
+"""
+Semantic candidate matching for jobs.
+
+Candidates are embedded (app.services.embeddings) into the on-disk IVF
+index (app.services.ann_index). The index has a single writer:
+
+- ORM hooks (and bulk imports, via `queue_candidate_updates`) record the
+  ids of candidates whose resume or skills changed in the
+  candidate_index_changes outbox, in the same transaction as the change.
+- Every API worker runs `start_candidate_index_updater`; the one holding
+  the index's file lock drains the outbox, re-embedding the current rows,
+  and publishes the new rows through meta.json. When it exits (worker
+  recycling) the lock passes to another worker.
+- The other workers open the index read-only and refresh it before each
+  search.
+
+`rebuild_candidate_index` (rebuild_candidate_index.py) re-embeds every
+candidate into a side directory. The writer stops draining while it runs,
+swaps the build in between two batches and then catches up from the
+outbox, so no change made during the rebuild is lost.
+"""
+import asyncio
+import os
+import shutil
+import threading
+from typing import IO, TYPE_CHECKING, Any, Iterable, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import delete, event, insert, inspect, select
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import Candidate, CandidateIndexChange, Job
+from app.utils.cache import cached
+import logging
+
+# The index and embedders pull in numpy; they are imported on first use so
+# API workers that never match candidates do not pay for it at startup
+if TYPE_CHECKING:
+    from app.services.ann_index import IVFIndex
+
+logger = logging.getLogger(__name__)
+
+BUILD_SUFFIX = ".build"
+REBUILD_READY = "READY"
+DRAIN_BATCH_SIZE = 256
+
+_index: Optional["IVFIndex"] = None
+_index_lock = threading.Lock()
+# Lock file held while this process is the index writer
+_writer_lock: Optional[IO] = None
+_updater: Optional[asyncio.Task] = None
+
+def _open_index(readonly: bool) -> "IVFIndex":
+    from app.services.ann_index import IVFIndex
+    from app.services.embeddings import get_embedder
+    return IVFIndex(
+        settings.ann_index_path,
+        dim=get_embedder().dim,
+        nlist=settings.ann_nlist,
+        nprobe=settings.ann_nprobe,
+        readonly=readonly
+    )
+
+def get_candidate_index() -> "IVFIndex":
+    """Open the candidate index on first use (read-only unless this process writes it)"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = _open_index(readonly=_writer_lock is None)
+        return _index
+
+def _flatten(value: Any) -> str:
+    if isinstance(value, dict):
+        return " ".join(f"{k} {_flatten(v)}" for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return " ".join(_flatten(v) for v in value)
+    return "" if value is None else str(value)
+
+def candidate_text(resume_text: Optional[str], skills: Optional[List[str]]) -> str:
+    return f"{_flatten(skills)}\n{resume_text or ''}"
+
+def job_text(job: Job) -> str:
+    return f"{job.title}\n{job.description or ''}\n{_flatten(job.requirements)}"
+
+def _train_if_ready(index: "IVFIndex"):
+    # k-means wants a few dozen points per list to be meaningful
+    if not index.trained and len(index) >= index.nlist * 39:
+        index.train()
+
+def _match_key(job: Job, k: int, exact: bool) -> str:
+    # A job edit changes updated_at, so it never sees matches of the old text
+    return f"{job.id}:{job.updated_at.isoformat() if job.updated_at else ''}:{k}:{exact}"
+
+async def find_matching_candidates(job: Job, k: int = 20, exact: bool = False) -> List[Tuple[UUID, float]]:
+    """Top-k (candidate_id, similarity) for a job description"""
+    matches = await _search(job, k, exact)
+    return [(UUID(candidate_id), score) for candidate_id, score in matches]
+
+# Embedding the job (an API call with the OpenAI backend) and searching
+# cost far more than a cache hit; the index itself lags the outbox by a
+# poll interval, so a short TTL adds little staleness
+@cached("job_matches", ttl=settings.candidate_match_cache_ttl, key_builder=_match_key)
+async def _search(job: Job, k: int, exact: bool) -> List[Tuple[UUID, float]]:
+    from app.services.embeddings import get_embedder
+    embedder = get_embedder()
+    vectors = await asyncio.to_thread(embedder.embed, [job_text(job)])
+    index = get_candidate_index()
+
+    def search():
+        index.refresh()
+        return index.search(vectors[0], k, exact=exact)
+
+    return await asyncio.to_thread(search)
+
+# Rebuild
+
+def _build_path() -> str:
+    return settings.ann_index_path + BUILD_SUFFIX
+
+def _swap_in_rebuild():
+    """Replace the live index with the finished build (writer only, between batches)"""
+    global _index
+    live, build, old = settings.ann_index_path, _build_path(), settings.ann_index_path + ".old"
+    shutil.rmtree(old, ignore_errors=True)
+    if os.path.exists(live):
+        os.replace(live, old)
+    os.replace(build, live)
+    os.remove(os.path.join(live, REBUILD_READY))
+    # Readers still map the old files; they reload on the new generation
+    shutil.rmtree(old, ignore_errors=True)
+    with _index_lock:
+        _index = _open_index(readonly=False)
+
+async def rebuild_candidate_index(batch_size: int = 1000) -> int:
+    """Re-embed every candidate into a fresh index and swap it in; returns its size"""
+    from app.services.ann_index import IVFIndex, acquire_lock
+    from app.services.embeddings import get_embedder
+    rebuild_lock = acquire_lock(_build_path() + ".lock")
+    if rebuild_lock is None:
+        raise RuntimeError("Another candidate index rebuild is running")
+    try:
+        embedder = get_embedder()
+        build_path = _build_path()
+        shutil.rmtree(build_path, ignore_errors=True)
+        index = IVFIndex(build_path, dim=embedder.dim, nlist=settings.ann_nlist, nprobe=settings.ann_nprobe)
+        async with AsyncSessionLocal() as db:
+            stream = await db.stream(
+                select(Candidate.id, Candidate.resume_text, Candidate.skills)
+                .execution_options(yield_per=batch_size)
+            )
+            async for rows in stream.partitions():
+                texts = [candidate_text(row.resume_text, row.skills) for row in rows]
+                vectors = await asyncio.to_thread(embedder.embed, texts)
+                await asyncio.to_thread(index.add, [row.id for row in rows], vectors)
+        await asyncio.to_thread(_train_if_ready, index)
+        index.flush()
+        size = len(index)
+        open(os.path.join(build_path, REBUILD_READY), "w").close()
+
+        writer_lock = acquire_lock(settings.ann_index_path + ".lock")
+        if writer_lock is not None:
+            # No API worker maintains the index: swap it in ourselves
+            try:
+                _swap_in_rebuild()
+            finally:
+                writer_lock.close()
+        else:
+            logger.info("Waiting for the candidate index writer to swap in the rebuild")
+            while os.path.exists(build_path):
+                await asyncio.sleep(settings.ann_index_poll_interval)
+        return size
+    except BaseException:
+        shutil.rmtree(_build_path(), ignore_errors=True)
+        raise
+    finally:
+        rebuild_lock.close()
+
+def _rebuild_running() -> bool:
+    """Whether a rebuild holds its lock; a build directory without one was abandoned"""
+    from app.services.ann_index import acquire_lock
+    lock = acquire_lock(_build_path() + ".lock")
+    if lock is None:
+        return True
+    lock.close()
+    shutil.rmtree(_build_path(), ignore_errors=True)
+    return False
+
+# Incremental maintenance: the outbox, drained by the single writer
+
+async def queue_candidate_updates(connection: AsyncConnection, candidate_ids: Iterable[UUID]):
+    """Queue re-embedding of candidates written outside the ORM (e.g. bulk imports), in the caller's transaction"""
+    rows = [{"candidate_id": candidate_id} for candidate_id in candidate_ids]
+    if settings.enable_semantic_search and rows:
+        await connection.execute(insert(CandidateIndexChange), rows)
+
+@event.listens_for(Session, "after_flush")
+def _record_candidate_changes(session, flush_context):
+    if not settings.enable_semantic_search:
+        return
+    changed = {
+        obj.id for obj in session.new
+        if isinstance(obj, Candidate)
+    } | {
+        obj.id for obj in session.dirty
+        if isinstance(obj, Candidate) and _text_changed(obj)
+    } | {
+        obj.id for obj in session.deleted
+        if isinstance(obj, Candidate)
+    }
+    if changed:
+        session.connection().execute(
+            insert(CandidateIndexChange), [{"candidate_id": candidate_id} for candidate_id in changed]
+        )
+
+def _text_changed(candidate: Candidate) -> bool:
+    attrs = inspect(candidate).attrs
+    return any(attrs[name].history.has_changes() for name in ("resume_text", "skills"))
+
+def _apply_changes(index: "IVFIndex", candidate_ids: List[UUID], rows):
+    from app.services.embeddings import get_embedder
+    # Candidates no longer in the table were deleted
+    index.remove(candidate_ids)
+    if rows:
+        vectors = get_embedder().embed([candidate_text(row.resume_text, row.skills) for row in rows])
+        index.add([row.id for row in rows], vectors)
+    _train_if_ready(index)
+    if index.tombstones > len(index):
+        index.compact()
+    index.flush()
+
+async def _drain() -> int:
+    """Apply one batch of queued changes; returns how many outbox rows it consumed"""
+    if os.path.exists(os.path.join(_build_path(), REBUILD_READY)):
+        await asyncio.to_thread(_swap_in_rebuild)
+        logger.info("Swapped in the rebuilt candidate index")
+    elif os.path.exists(_build_path()) and _rebuild_running():
+        # Changes stay queued and are applied to the rebuilt index
+        return 0
+    index = get_candidate_index()
+    async with AsyncSessionLocal() as db:
+        changes = (await db.execute(
+            select(CandidateIndexChange.id, CandidateIndexChange.candidate_id)
+            .order_by(CandidateIndexChange.id)
+            .limit(DRAIN_BATCH_SIZE)
+        )).all()
+        if not changes:
+            return 0
+        candidate_ids = list({change.candidate_id for change in changes})
+        rows = (await db.execute(
+            select(Candidate.id, Candidate.resume_text, Candidate.skills).where(Candidate.id.in_(candidate_ids))
+        )).all()
+    # Embedding can take a while; no connection is held meanwhile
+    await asyncio.to_thread(_apply_changes, index, candidate_ids, rows)
+    async with AsyncSessionLocal() as db:
+        # By id, not up to the highest: a lower id can still commit later
+        await db.execute(delete(CandidateIndexChange).where(CandidateIndexChange.id.in_([change.id for change in changes])))
+        await db.commit()
+    return len(changes)
+
+async def _become_writer() -> bool:
+    global _index, _writer_lock
+    if _writer_lock is not None:
+        return True
+    from app.services.ann_index import acquire_lock
+    lock = await asyncio.to_thread(acquire_lock, settings.ann_index_path + ".lock")
+    if lock is None:
+        return False
+    try:
+        index = await asyncio.to_thread(_open_index, False)
+    except Exception:
+        lock.close()
+        raise
+    _writer_lock = lock
+    with _index_lock:
+        _index = index
+    logger.info("This worker now maintains the candidate index")
+    return True
+
+async def _update_candidate_index():
+    try:
+        # Fails if the index on disk was built for another embedding size
+        await asyncio.to_thread(get_candidate_index)
+    except ValueError as e:
+        logger.error(f"Candidate index not maintained: {e}")
+        return
+    while True:
+        try:
+            if await _become_writer():
+                while await _drain() == DRAIN_BATCH_SIZE:
+                    pass
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Candidate index update failed: {e}", exc_info=True)
+        await asyncio.sleep(settings.ann_index_poll_interval)
+
+async def start_candidate_index_updater():
+    """Compete for the index writer role and, once held, drain the outbox"""
+    global _updater
+    if settings.enable_semantic_search and _updater is None:
+        _updater = asyncio.create_task(_update_candidate_index())
+
+async def stop_candidate_index_updater():
+    global _updater, _writer_lock
+    if _updater is not None:
+        task, _updater = _updater, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    if _writer_lock is not None:
+        lock, _writer_lock = _writer_lock, None
+        lock.close()
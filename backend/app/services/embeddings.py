@@ -0,0 +1,83 @@
+"""
+Text embedders for semantic candidate search.
+
+`hashing` is a deterministic local embedder (signed feature hashing of
+word unigrams and bigrams) that needs no network and is good enough for
+keyword-heavy resumes; `openai` calls the embeddings API. Pick one with
+settings.embedding_backend. The vector size follows the model unless
+EMBEDDING_DIM sets it (hashing, or text-embedding-3 models, which can
+shorten their vectors).
+"""
+import re
+import zlib
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import List, Optional
+import numpy as np
+from app.core.config import settings
+
+_TOKEN = re.compile(r"[a-z0-9+#.]+")
+
+HASHING_DIM = 384
+# Native vector size of the OpenAI embedding models
+OPENAI_EMBEDDING_DIMS = {
+    "text-embedding-ada-002": 1536,
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+}
+
+class Embedder(ABC):
+    dim: int
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Return a float32 array of shape [len(texts), dim]"""
+
+class HashingEmbedder(Embedder):
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def _features(self, text: str):
+        tokens = _TOKEN.findall(text.lower())
+        yield from tokens
+        yield from (f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text or ""):
+                h = zlib.crc32(feature.encode())
+                vectors[row, h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        return vectors
+
+class OpenAIEmbedder(Embedder):
+    def __init__(self, model: str, dim: Optional[int] = None):
+        native = OPENAI_EMBEDDING_DIMS.get(model)
+        if dim is None:
+            if native is None:
+                raise ValueError(f"Unknown vector size for embedding model {model}; set EMBEDDING_DIM")
+            dim = native
+        elif native is not None and dim != native and not model.startswith("text-embedding-3"):
+            raise ValueError(f"{model} returns {native}-d vectors, EMBEDDING_DIM={dim} cannot shorten them")
+        self.model = model
+        self.dim = dim
+        # Only text-embedding-3 models accept a reduced size
+        self._dimensions = dim if model.startswith("text-embedding-3") and dim != native else None
+        self._client = None
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=settings.openai_api_key)
+        options = {"dimensions": self._dimensions} if self._dimensions else {}
+        response = self._client.embeddings.create(model=self.model, input=[t or " " for t in texts], **options)
+        vectors = np.asarray([item.embedding for item in response.data], dtype=np.float32)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"{self.model} returned {vectors.shape[1]}-d vectors, expected {self.dim}; set EMBEDDING_DIM")
+        return vectors
+
+@lru_cache()
+def get_embedder() -> Embedder:
+    if settings.embedding_backend == "openai":
+        return OpenAIEmbedder(settings.embedding_model, settings.embedding_dim)
+    return HashingEmbedder(settings.embedding_dim or HASHING_DIM)
@@ -0,0 +1,90 @@
+"""
+Ranked full-text search over candidate resumes.
+
+Uses the database's own index (see FULLTEXT_DDL in app.models.candidate):
+tsvector/GIN with ts_rank_cd on Postgres, FTS5 with BM25 on SQLite.
+Queries use web-search syntax on both: words are ANDed, "quoted phrases",
+OR, and -excluded words.
+"""
+import re
+from typing import Any, AsyncIterator, Dict
+from uuid import UUID
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import require_dialect
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+
+_POSTGRES_SEARCH = text(f"""
+    SELECT ranked.id, ranked.name, ranked.email, ranked.score,
+           ts_headline('english', coalesce(c.resume_text, ''), ranked.query,
+                       'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxFragments=2, MaxWords=20, MinWords=5')
+               AS snippet
+    FROM (
+        SELECT c.id, c.name, c.email, q AS query, ts_rank_cd(c.search_vector, q, 32) AS score
+        FROM candidates c, websearch_to_tsquery('english', :query) q
+        WHERE c.search_vector @@ q
+        ORDER BY score DESC, c.id
+        LIMIT :limit OFFSET :offset
+    ) ranked
+    JOIN candidates c ON c.id = ranked.id
+    ORDER BY ranked.score DESC, ranked.id
+""")
+
+# bm25() is lower-is-better; column weights favour name over resume_text
+_SQLITE_SEARCH = text(f"""
+    SELECT c.id, c.name, c.email, -bm25(candidates_fts, 2.0, 1.0) AS score,
+           snippet(candidates_fts, 1, '{HIGHLIGHT_START}', '{HIGHLIGHT_STOP}', '…', 16) AS snippet
+    FROM candidates_fts
+    JOIN candidates c ON c.search_rowid = candidates_fts.rowid
+    WHERE candidates_fts MATCH :query
+    ORDER BY bm25(candidates_fts, 2.0, 1.0), c.id
+    LIMIT :limit OFFSET :offset
+""")
+
+_WEB_TOKEN = re.compile(r'-?"[^"]*"|\S+')
+
+def to_fts5_query(query: str) -> str:
+    """Translate web-search syntax into a safe FTS5 MATCH expression"""
+    positive, negative = [], []
+    for token in _WEB_TOKEN.findall(query):
+        if token == "OR":
+            if positive and positive[-1] != "OR":
+                positive.append("OR")
+            continue
+        excluded = token.startswith("-") and len(token) > 1
+        term = token[1:] if excluded else token
+        term = term.strip('"')
+        if not term:
+            continue
+        quoted = '"' + term.replace('"', '""') + '"'
+        (negative if excluded else positive).append(quoted)
+    while positive and positive[-1] == "OR":
+        positive.pop()
+    if not positive:
+        return ""
+    expression = " ".join(positive)
+    for term in negative:
+        expression = f"({expression}) NOT {term}"
+    return expression
+
+async def search_candidates(db: AsyncSession, query: str, offset: int = 0, limit: int = 20) -> AsyncIterator[Dict[str, Any]]:
+    """Yield ranked hits (id, name, email, score, snippet), best first"""
+    if require_dialect(db.get_bind().dialect.name) == "postgresql":
+        statement, params = _POSTGRES_SEARCH, {"query": query}
+    else:
+        match = to_fts5_query(query)
+        if not match:
+            return
+        statement, params = _SQLITE_SEARCH, {"query": match}
+
+    result = await db.stream(statement, {**params, "limit": limit, "offset": offset})
+    async for row in result:
+        yield {
+            "id": str(row.id if isinstance(row.id, UUID) else UUID(row.id)),
+            "name": row.name,
+            "email": row.email,
+            "score": float(row.score),
+            "snippet": row.snippet,
+        }
@@ -0,0 +1,128 @@
+"""
+Chat-completion clients for AI screening.
+
+`openai` calls the Chat Completions API; `stub` is a deterministic local
+client that scores by keyword overlap, so the screening pipeline can be
+run and benchmarked offline. Pick one with settings.llm_backend.
+"""
+import asyncio
+import hashlib
+import json
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, List, Optional
+from app.core.config import settings
+
+Messages = List[Dict[str, str]]
+
+class LLMError(Exception):
+    """A failed completion; `retryable` errors may succeed if sent again"""
+
+    def __init__(self, message: str, retryable: bool = False, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+class LLMResponse:
+    def __init__(self, text: str, prompt_tokens: int, completion_tokens: int, model: str):
+        self.text = text
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.model = model
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English with the OpenAI tokenizers
+    return len(text) // 4 + 1
+
+def estimate_prompt_tokens(messages: Messages) -> int:
+    return sum(estimate_tokens(message["content"]) + 4 for message in messages)
+
+class LLMClient(ABC):
+    model: str
+
+    @abstractmethod
+    async def complete(self, messages: Messages, max_tokens: int, temperature: float) -> LLMResponse:
+        """One chat completion; raises LLMError on failure"""
+
+class OpenAIClient(LLMClient):
+    def __init__(self, model: str):
+        self.model = model
+        self._client = None
+
+    async def complete(self, messages: Messages, max_tokens: int, temperature: float) -> LLMResponse:
+        import openai
+        if self._client is None:
+            self._client = openai.AsyncOpenAI(api_key=settings.openai_api_key, max_retries=0)
+        try:
+            response = await self._client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                response_format={"type": "json_object"}
+            )
+        except openai.RateLimitError as e:
+            retry_after = e.response.headers.get("retry-after") if e.response is not None else None
+            raise LLMError(str(e), retryable=True, retry_after=float(retry_after) if retry_after else None)
+        except (openai.APITimeoutError, openai.APIConnectionError, openai.InternalServerError) as e:
+            raise LLMError(str(e), retryable=True)
+        except openai.APIError as e:
+            raise LLMError(str(e))
+        usage = response.usage
+        return LLMResponse(
+            response.choices[0].message.content or "",
+            usage.prompt_tokens if usage else estimate_prompt_tokens(messages),
+            usage.completion_tokens if usage else 0,
+            response.model
+        )
+
+_WORD = re.compile(r"[a-z0-9+#]+")
+_PROMPT_LABELS = {"job", "requirements", "resume", "skills"}
+
+class StubClient(LLMClient):
+    """
+    Deterministic offline client. Scores the share of job words found in
+    the resume; `latency` simulates API round trips and `failure_rate` a
+    share of retryable errors, chosen by prompt hash so runs repeat.
+    """
+
+    def __init__(self, model: str = "stub", latency: float = 0.0, failure_rate: float = 0.0):
+        self.model = model
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._attempts: Dict[str, int] = {}
+
+    async def complete(self, messages: Messages, max_tokens: int, temperature: float) -> LLMResponse:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        prompt = messages[-1]["content"]
+        digest = hashlib.sha256(prompt.encode()).digest()
+        if self.failure_rate and digest[0] / 256 < self.failure_rate:
+            attempt = self._attempts.get(prompt, 0)
+            self._attempts[prompt] = attempt + 1
+            if attempt == 0:
+                raise LLMError("Simulated rate limit", retryable=True)
+
+        job, _, resume = prompt.partition("RESUME:")
+        job_words = set(_WORD.findall(job.lower())) - _PROMPT_LABELS
+        resume_words = set(_WORD.findall(resume.lower())) - _PROMPT_LABELS
+        matched = sorted(job_words & resume_words)
+        score = round(100 * len(matched) / max(len(job_words), 1), 1)
+        text = json.dumps({
+            "score": score,
+            "summary": f"Matches {len(matched)} of {len(job_words)} job terms",
+            "strengths": matched[:5],
+            "concerns": sorted(job_words - resume_words)[:5],
+        })
+        return LLMResponse(text, estimate_prompt_tokens(messages), estimate_tokens(text), self.model)
+
+@lru_cache()
+def get_llm_client() -> LLMClient:
+    if settings.llm_backend == "stub":
+        return StubClient()
+    return OpenAIClient(settings.openai_model)
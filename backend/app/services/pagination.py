@@ -0,0 +1,80 @@
+"""
+Keyset pagination and NDJSON export for list endpoints.
+
+Lists are ordered newest first by (created_at, id) and resumed from an
+opaque cursor holding the last row's key, so every page costs one index
+range scan no matter how deep it is (OFFSET re-reads all skipped rows).
+
+Exports stream the same ordering through a server-side cursor in
+`yield_per` batches: memory stays constant and the first bytes go out as
+soon as the first batch is fetched.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type
+from uuid import UUID
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+class InvalidCursor(ValueError):
+    pass
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), id.hex], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(raw)
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Invalid pagination cursor") from e
+
+def keyset_order(query: Select, model) -> Select:
+    return query.order_by(model.created_at.desc(), model.id.desc())
+
+async def keyset_page(
+    db: AsyncSession,
+    query: Select,
+    model,
+    schema: Type[BaseModel],
+    cursor: Optional[str],
+    limit: int
+) -> Dict[str, Any]:
+    """
+    One page of `query` (selecting `model` rows) after `cursor`; returns
+    {"items", "next_cursor"}, where next_cursor is None on the last page.
+    """
+    if cursor:
+        query = query.where(tuple_(model.created_at, model.id) < decode_cursor(cursor))
+    # Fetch one extra row to know whether another page exists
+    rows = list((await db.execute(keyset_order(query, model).limit(limit + 1))).scalars())
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return {"items": [schema.model_validate(row) for row in rows], "next_cursor": next_cursor}
+
+async def export_ndjson(
+    db: AsyncSession,
+    query: Select,
+    model,
+    schema: Type[BaseModel],
+    batch_size: int
+) -> AsyncIterator[str]:
+    """
+    Stream every row of `query` as NDJSON, one chunk per batch. `query`
+    should select only the schema's columns so rows skip the ORM identity map.
+    """
+    result = await db.stream(keyset_order(query, model).execution_options(yield_per=batch_size))
+    async for partition in result.partitions():
+        lines: List[str] = [schema.model_validate(row, from_attributes=True).model_dump_json() for row in partition]
+        lines.append("")
+        yield "\n".join(lines)
+
+def schema_columns(model, schema: Type[BaseModel]) -> list:
+    """Columns of `model` backing the fields of a response schema"""
+    return [getattr(model, name) for name in schema.model_fields]
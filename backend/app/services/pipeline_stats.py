@@ -0,0 +1,238 @@
+"""
+Per-job and per-organization pipeline statistics for dashboards.
+
+pipeline_stats holds, for every job and every organization, the number of
+applications in each status and in each ai_score decile, so a dashboard
+read is a primary-key range lookup instead of a GROUP BY over applications.
+
+Writers keep it current in the same transaction as the change: the ORM
+hook below covers session flushes, and Core bulk writers (screening
+write-back) snapshot `application_states` before updating and apply the
+difference. Changes are summed per flush or batch and written with one
+executemany upsert, so a batch of results for one job touches a handful of
+rows. `rebuild` recomputes everything from applications and corrects any
+drift, e.g. from raw SQL writes; run it periodically with
+rebuild_pipeline_stats.py.
+"""
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import bindparam, case, delete, event, func, inspect, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.database import AsyncSessionLocal, dialect_insert
+from app.models import Application, Job, PipelineStat
+
+STATUS = "status"
+SCORE = "score"
+UNSCORED = "unscored"
+UNKNOWN_STATUS = "unknown"
+SCORE_BUCKETS = [str(bucket) for bucket in range(0, 100, 10)] + [UNSCORED]
+
+# (job_id, status, ai_score) of one application
+State = Tuple[UUID, Optional[str], Optional[float]]
+
+def score_bucket(score: Optional[float]) -> str:
+    """Decile of a 0-100 match score: "0", "10", ... "90", or "unscored" """
+    if score is None:
+        return UNSCORED
+    return str(min(max(int(score // 10), 0), 9) * 10)
+
+def _score_bucket_sql():
+    # Same buckets as score_bucket, evaluated by the database
+    return case(
+        (Application.ai_score.is_(None), UNSCORED),
+        *[(Application.ai_score >= bucket, str(bucket)) for bucket in range(90, 0, -10)],
+        else_="0"
+    )
+
+class PipelineDeltas:
+    """Count changes per (job, metric, bucket), summed before writing"""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+
+    def add(self, state: State, sign: int):
+        job_id, status, score = state
+        self.counts[(job_id, STATUS, status or UNKNOWN_STATUS)] += sign
+        self.counts[(job_id, SCORE, score_bucket(score))] += sign
+
+    def move(self, old: Optional[State], new: Optional[State]):
+        if old == new:
+            return
+        if old is not None:
+            self.add(old, -1)
+        if new is not None:
+            self.add(new, 1)
+
+    def __bool__(self) -> bool:
+        return any(self.counts.values())
+
+def _upsert(dialect: str, increment: bool):
+    statement = dialect_insert(dialect)(PipelineStat)
+    count = PipelineStat.count + statement.excluded.count if increment else statement.excluded.count
+    return statement.on_conflict_do_update(index_elements=["scope_id", "metric", "bucket"], set_={"count": count})
+
+def _params(counts: Dict[Tuple[UUID, str, str], int]) -> list:
+    # Fixed order so concurrent writers lock rows in the same sequence
+    return [
+        {"scope_id": scope_id, "metric": metric, "bucket": bucket, "count": count}
+        for (scope_id, metric, bucket), count in sorted(counts.items(), key=lambda item: (str(item[0][0]), item[0][1], item[0][2]))
+    ]
+
+def apply_deltas(connection, deltas: PipelineDeltas):
+    """Add the deltas to each job's and its organization's rows (sync connection)"""
+    changes = {key: delta for key, delta in deltas.counts.items() if delta}
+    if not changes:
+        return
+    job_ids = {job_id for job_id, _, _ in changes}
+    organizations = dict(connection.execute(select(Job.id, Job.organization_id).where(Job.id.in_(job_ids))).all())
+    counts: Counter = Counter()
+    for (job_id, metric, bucket), delta in changes.items():
+        counts[(job_id, metric, bucket)] += delta
+        organization_id = organizations.get(job_id)
+        if organization_id is not None:
+            counts[(organization_id, metric, bucket)] += delta
+    connection.execute(_upsert(connection.dialect.name, increment=True), _params(counts))
+
+def application_states(connection, application_ids: Iterable[UUID]) -> Dict[UUID, State]:
+    """Current state of applications about to be updated, locked until commit"""
+    result = connection.execute(
+        select(Application.id, Application.job_id, Application.status, Application.ai_score)
+        .where(Application.id.in_(list(application_ids)))
+        .order_by(Application.id)
+        .with_for_update()
+    )
+    return {row.id: (row.job_id, row.status, row.ai_score) for row in result}
+
+def rebuild(connection, organization_id: Optional[UUID] = None) -> Dict[str, int]:
+    """
+    Recompute the stats of one organization (or all) from applications and
+    write only the rows that differ; returns row and correction counts.
+    """
+    if connection.dialect.name == "postgresql":
+        # Concurrent writers wait, so no delta lands between count and write
+        connection.execute(text("LOCK TABLE pipeline_stats IN EXCLUSIVE MODE"))
+
+    expected: Counter = Counter()
+    for metric, bucket in ((STATUS, func.coalesce(Application.status, UNKNOWN_STATUS)), (SCORE, _score_bucket_sql())):
+        query = (
+            select(Application.job_id, Job.organization_id, bucket.label("bucket"), func.count().label("count"))
+            .join(Job, Job.id == Application.job_id)
+            .group_by(Application.job_id, Job.organization_id, bucket)
+        )
+        if organization_id is not None:
+            query = query.where(Job.organization_id == organization_id)
+        for row in connection.execute(query):
+            expected[(row.job_id, metric, row.bucket)] += row.count
+            expected[(row.organization_id, metric, row.bucket)] += row.count
+
+    current_query = select(PipelineStat.scope_id, PipelineStat.metric, PipelineStat.bucket, PipelineStat.count)
+    if organization_id is not None:
+        current_query = current_query.where(or_(
+            PipelineStat.scope_id == organization_id,
+            PipelineStat.scope_id.in_(select(Job.id).where(Job.organization_id == organization_id))
+        ))
+    current = {(row.scope_id, row.metric, row.bucket): row.count for row in connection.execute(current_query)}
+
+    changed = {key: count for key, count in expected.items() if current.get(key) != count}
+    stale = [key for key in current if key not in expected]
+    if changed:
+        connection.execute(_upsert(connection.dialect.name, increment=False), _params(changed))
+    if stale:
+        table = PipelineStat.__table__
+        connection.execute(
+            delete(table).where(
+                table.c.scope_id == bindparam("_scope_id"),
+                table.c.metric == bindparam("_metric"),
+                table.c.bucket == bindparam("_bucket")
+            ),
+            [{"_scope_id": scope_id, "_metric": metric, "_bucket": bucket} for scope_id, metric, bucket in stale]
+        )
+    # Rows that merely dropped to zero are cleaned up, not counted as drift
+    return {"rows": len(expected), "corrected": len(changed) + sum(1 for key in stale if current[key])}
+
+async def rebuild_pipeline_stats(organization_id: Optional[UUID] = None) -> Dict[str, int]:
+    async with AsyncSessionLocal() as db:
+        connection = await db.connection()
+        result = await connection.run_sync(rebuild, organization_id)
+        await db.commit()
+    return result
+
+async def get_pipeline_stats(db: AsyncSession, scope_id: UUID) -> Dict[str, Any]:
+    """Status counts and score histogram of a job or organization"""
+    result = await db.execute(
+        select(PipelineStat.metric, PipelineStat.bucket, PipelineStat.count).where(PipelineStat.scope_id == scope_id)
+    )
+    statuses: Dict[str, int] = {}
+    scores = dict.fromkeys(SCORE_BUCKETS, 0)
+    for metric, bucket, count in result:
+        if metric == STATUS and count:
+            statuses[bucket] = count
+        elif metric == SCORE:
+            scores[bucket] = count
+    return {"total": sum(statuses.values()), "status": statuses, "score": scores}
+
+# ORM hook: apply the changes of each flush inside its own transaction.
+# AsyncSession runs this on its underlying sync Session.
+def _state(obj: Application) -> State:
+    return (obj.job_id, obj.status, obj.ai_score)
+
+_TRACKED = ("job_id", "status", "ai_score")
+
+def _loaded(history) -> bool:
+    return bool(history.deleted or history.unchanged)
+
+def _previous_state(obj: Application, committed: Dict[UUID, State]) -> Optional[State]:
+    attrs = inspect(obj).attrs
+    values = []
+    for index, name in enumerate(_TRACKED):
+        history = attrs[name].history
+        if _loaded(history):
+            values.append((history.deleted or history.unchanged)[0])
+            continue
+        state = committed.get(inspect(obj).identity[0])
+        if state is not None:
+            values.append(state[index])
+        elif not history.added:
+            # Never loaded and not changed: still the stored value
+            values.append(getattr(obj, name))
+        else:
+            return None
+    return tuple(values)
+
+def _needs_committed_state(obj: Application, deleted: bool) -> bool:
+    """Whether an old value the deltas need was never loaded"""
+    attrs = inspect(obj).attrs
+    return any(
+        not _loaded(history) and (deleted or history.added)
+        for history in (attrs[name].history for name in _TRACKED)
+    )
+
+@event.listens_for(Session, "before_flush")
+def _load_committed_states(session, flush_context, instances):
+    # E.g. a status assigned to an expired application: its old value has to
+    # be read before the flush overwrites it
+    unloaded = [
+        inspect(obj).identity[0]
+        for objs, deleted in ((session.dirty, False), (session.deleted, True))
+        for obj in objs
+        if isinstance(obj, Application) and inspect(obj).identity is not None and _needs_committed_state(obj, deleted)
+    ]
+    session.info["pipeline_committed"] = application_states(session.connection(), unloaded) if unloaded else {}
+
+@event.listens_for(Session, "after_flush")
+def _track_application_changes(session, flush_context):
+    committed = session.info.pop("pipeline_committed", {})
+    deltas = PipelineDeltas()
+    for obj in session.new:
+        if isinstance(obj, Application):
+            deltas.add(_state(obj), 1)
+    for obj in session.dirty:
+        if isinstance(obj, Application) and session.is_modified(obj, include_collections=False):
+            deltas.move(_previous_state(obj, committed), _state(obj))
+    for obj in session.deleted:
+        if isinstance(obj, Application):
+            deltas.move(_previous_state(obj, committed), None)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
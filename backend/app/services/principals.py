@@ -0,0 +1,145 @@
+"""
+Cached principal resolution for authenticated requests.
+
+get_current_user resolves the token's `sub` through here: a short-lived
+snapshot of the user's columns is kept in app.utils.cache, so the common
+case authenticates without a database round trip. Any ORM change to a
+User (deactivation, role or organization change, ...) drops the snapshot
+once the transaction commits; deactivating or deleting a user also
+revokes the tokens already issued to them.
+
+Invalidation also replaces the user's generation token, read in the same
+MGET as the snapshot and stored in it: a request that read the user just
+before the commit cannot write a stale snapshot back, because it carries
+the old generation and is ignored.
+"""
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Optional, Dict, Any, Set
+from uuid import UUID
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.core.config import settings
+from app.core.revocation import revoke_user
+from app.models import User
+from app.utils.cache import cache_key, delete_cached, delete_cached_async, get_many, set_cached, set_cached_async, set_many
+
+PRINCIPAL_CACHE_PREFIX = "principal"
+PRINCIPAL_GENERATION_PREFIX = "principal_generation"
+
+# password_hash is deliberately not cached; on a cache hit it is left
+# unloaded and must be fetched with `await user.awaitable_attrs.password_hash`
+_UUID_FIELDS = ("id", "organization_id")
+_DATETIME_FIELDS = ("created_at", "updated_at")
+_PLAIN_FIELDS = ("email", "full_name", "role", "is_active", "is_verified")
+
+def _serialize(user: User) -> Dict[str, Any]:
+    data = {field: getattr(user, field) for field in _PLAIN_FIELDS}
+    for field in _UUID_FIELDS:
+        value = getattr(user, field)
+        data[field] = str(value) if value else None
+    for field in _DATETIME_FIELDS:
+        value = getattr(user, field)
+        data[field] = value.isoformat() if value else None
+    return data
+
+def _deserialize(data: Dict[str, Any]) -> User:
+    values = {field: data.get(field) for field in _PLAIN_FIELDS}
+    for field in _UUID_FIELDS:
+        values[field] = UUID(data[field]) if data.get(field) else None
+    for field in _DATETIME_FIELDS:
+        values[field] = datetime.fromisoformat(data[field]) if data.get(field) else None
+    return User(**values)
+
+def _generation_ttl() -> int:
+    # Outlives any snapshot written under the previous generation
+    return settings.principal_cache_ttl * 2
+
+def invalidate_principal(user_id) -> None:
+    """Drop the cached principal for a user (blocking; for scripts).
+
+    ORM updates invalidate automatically; call this after bulk UPDATE or
+    DELETE statements that bypass the unit of work.
+    """
+    set_cached(cache_key(PRINCIPAL_GENERATION_PREFIX, str(user_id)), uuid.uuid4().hex, expire=_generation_ttl())
+    delete_cached(cache_key(PRINCIPAL_CACHE_PREFIX, str(user_id)))
+
+async def invalidate_principal_async(user_id) -> None:
+    """Drop the cached principal for a user without blocking the event loop"""
+    await set_many({cache_key(PRINCIPAL_GENERATION_PREFIX, str(user_id)): uuid.uuid4().hex}, expire=_generation_ttl())
+    await delete_cached_async(cache_key(PRINCIPAL_CACHE_PREFIX, str(user_id)))
+
+async def get_principal(db: AsyncSession, user_id: UUID) -> Optional[User]:
+    """Resolve a user by id, serving from the principal cache when possible.
+
+    A cached user is merged into `db` without loading, so handlers get a
+    regular persistent instance they can modify and commit.
+    """
+    key = cache_key(PRINCIPAL_CACHE_PREFIX, str(user_id))
+    generation_key = cache_key(PRINCIPAL_GENERATION_PREFIX, str(user_id))
+    cached = await get_many([key, generation_key])
+    data, generation = cached[key], cached[generation_key]
+    if data and data.get("generation") == generation:
+        user = _deserialize(data)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalars().first()
+    # Not from a read replica: it may predate the commit that just
+    # invalidated the snapshot, which would then stay stale for the full TTL
+    if user and not db.info.get("replica"):
+        await set_cached_async(key, {**_serialize(user), "generation": generation}, expire=settings.principal_cache_ttl)
+    return user
+
+# Invalidation: remember which users a flush touched, drop them on commit.
+# AsyncSession runs these hooks on its underlying sync Session.
+_PENDING_KEY = "principals_to_invalidate"
+_DEACTIVATED_KEY = "principals_to_revoke"
+
+def _deactivated(obj: User) -> bool:
+    history = inspect(obj).attrs.is_active.history
+    return bool(history.added) and not history.added[0]
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_principals(session, flush_context):
+    changed = session.info.setdefault(_PENDING_KEY, set())
+    for obj in session.dirty:
+        if isinstance(obj, User) and session.is_modified(obj, include_collections=False):
+            user_id = inspect(obj).identity[0]
+            changed.add(user_id)
+            if _deactivated(obj):
+                session.info.setdefault(_DEACTIVATED_KEY, set()).add(user_id)
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            user_id = inspect(obj).identity[0]
+            changed.add(user_id)
+            session.info.setdefault(_DEACTIVATED_KEY, set()).add(user_id)
+
+# Invalidations scheduled from the commit hook, still running
+_invalidating: Set[asyncio.Task] = set()
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_principals(session):
+    for user_id in session.info.pop(_DEACTIVATED_KEY, ()):
+        revoke_user(user_id)
+    changed = session.info.pop(_PENDING_KEY, ())
+    if not changed:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        for user_id in changed:
+            invalidate_principal(user_id)
+        return
+    for user_id in changed:
+        task = loop.create_task(invalidate_principal_async(user_id))
+        _invalidating.add(task)
+        task.add_done_callback(_invalidating.discard)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_principals(session):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_DEACTIVATED_KEY, None)
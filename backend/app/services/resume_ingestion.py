@@ -0,0 +1,450 @@
+"""
+Bulk resume ingestion: uploaded PDF/DOCX/TXT files (or zips of them)
+become candidates with resume_text and parsed_data filled in.
+
+    upload ──► disk ──► file queue ──► process pool ──► result queue ──► DB
+              (chunks)  (bounded)      (parse_resume)   (bounded)       (batches)
+
+Multipart bodies are parsed as they stream in and each file is written to
+disk chunk by chunk, so an upload of thousands of resumes never sits in
+memory. Zips are expanded one member at a time as the file queue drains;
+the bounded queues are the backpressure, so a slow database pauses
+extraction and a busy pool pauses expansion. Candidates are upserted by
+email in batches, and per-file status is kept on an IngestionJob that is
+also published to the cache for other workers.
+"""
+import asyncio
+import multiprocessing
+import os
+import shutil
+import uuid
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import aiofiles
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+from sqlalchemy import func, select
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import Candidate
+from app.utils.cache import get_cached_async, set_cached_async
+from app.utils.resume_parser import is_supported, parse_resume
+import logging
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+PROCESSING = "processing"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+class UploadError(ValueError):
+    """Raised for a request that is not a usable resume upload"""
+
+class IngestionFile:
+    def __init__(self, name: str, path: Optional[str] = None):
+        self.name = name
+        self.path = path
+        self.status = QUEUED
+        self.candidate_id: Optional[uuid.UUID] = None
+        self.error: Optional[str] = None
+
+    def finish(self, status: str, error: Optional[str] = None):
+        self.status = status
+        self.error = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "status": self.status,
+            "candidate_id": self.candidate_id,
+            "error": self.error,
+        }
+
+class IngestionJob:
+    def __init__(self, directory: str, owner_id: Optional[uuid.UUID] = None):
+        self.id = uuid.uuid4()
+        self.owner_id = owner_id
+        self.directory = directory
+        self.status = QUEUED
+        self.files: List[IngestionFile] = []
+        self.extracted_bytes = 0  # expanded from zips, against resume_max_extracted_bytes
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+
+    def add_file(self, name: str, path: Optional[str] = None) -> IngestionFile:
+        item = IngestionFile(name, path)
+        self.files.append(item)
+        return item
+
+    def counts(self) -> Dict[str, int]:
+        counts = {status: 0 for status in (QUEUED, PROCESSING, DONE, FAILED, SKIPPED)}
+        for item in self.files:
+            counts[item.status] += 1
+        return counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "owner_id": self.owner_id,
+            "status": self.status,
+            "total": len(self.files),
+            "counts": self.counts(),
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "files": [item.to_dict() for item in self.files],
+        }
+
+# Recent jobs of this worker; other workers read the cached snapshot
+_jobs: "OrderedDict[uuid.UUID, IngestionJob]" = OrderedDict()
+_MAX_JOBS = 100
+_tasks = set()
+
+def _status_key(job_id: uuid.UUID) -> str:
+    return f"ingest:{job_id}"
+
+async def _publish(job: IngestionJob):
+    try:
+        await set_cached_async(_status_key(job.id), job.to_dict(), expire=settings.resume_ingest_status_ttl)
+    except Exception as e:
+        logger.warning(f"Could not publish ingestion status for {job.id}: {e}")
+
+async def get_ingestion_status(job_id: uuid.UUID) -> Optional[Dict[str, Any]]:
+    job = _jobs.get(job_id)
+    if job is not None:
+        return job.to_dict()
+    return await get_cached_async(_status_key(job_id))
+
+# Text extraction runs in a process pool; PDF parsing is CPU bound
+_pool: Optional[ProcessPoolExecutor] = None
+
+def ingest_workers() -> int:
+    return settings.resume_ingest_workers or os.cpu_count() or 1
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: forking a process with running threads and an event loop is unsafe
+        _pool = ProcessPoolExecutor(max_workers=ingest_workers(), mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+def shutdown_ingestion():
+    global _pool
+    for task in list(_tasks):
+        task.cancel()
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+# Streaming multipart upload
+class _MultipartReceiver:
+    """Collects parser callbacks so file parts can be written asynchronously"""
+
+    def __init__(self, boundary: bytes):
+        self.events: List[Tuple[str, Any]] = []
+        self._headers: Dict[bytes, bytes] = {}
+        self._field = b""
+        self._value = b""
+        self.parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    def _on_part_begin(self):
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._field.lower()] = self._value
+        self._field = b""
+        self._value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        filename = options.get(b"filename")
+        self.events.append(("begin", filename.decode("utf-8", "replace") if filename is not None else None))
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        self.events.append(("data", data[start:end]))
+
+    def _on_part_end(self):
+        self.events.append(("end", None))
+
+def _is_zip(filename: str) -> bool:
+    return filename.lower().endswith(".zip")
+
+def _stored_path(job: IngestionJob, filename: str) -> str:
+    # Never trust client file names on disk
+    return os.path.join(job.directory, f"{len(job.files):06d}{os.path.splitext(filename)[1].lower()}")
+
+async def receive_upload(content_type: str, body, owner_id: Optional[uuid.UUID] = None) -> IngestionJob:
+    """Stream a multipart body of resumes and zips to disk"""
+    kind, options = parse_options_header(content_type or "")
+    boundary = options.get(b"boundary")
+    if kind != b"multipart/form-data" or not boundary:
+        raise UploadError("Expected a multipart/form-data upload")
+
+    directory = os.path.join(settings.resume_upload_dir, uuid.uuid4().hex)
+    os.makedirs(directory, exist_ok=True)
+    job = IngestionJob(directory, owner_id)
+    receiver = _MultipartReceiver(boundary)
+    current, out, written = None, None, 0
+    try:
+        async for chunk in body:
+            receiver.parser.write(chunk)
+            for event, value in receiver.events:
+                if event == "begin":
+                    current, written = None, 0
+                    if value is None:
+                        continue  # plain form field
+                    name = os.path.basename(value.replace("\\", "/"))
+                    if len(job.files) >= settings.resume_ingest_max_files:
+                        raise UploadError(f"At most {settings.resume_ingest_max_files} files per upload")
+                    if not (_is_zip(name) or is_supported(name)):
+                        job.add_file(name).finish(SKIPPED, "Unsupported file type")
+                        continue
+                    path = _stored_path(job, name)
+                    current = job.add_file(name, path)
+                    out = await aiofiles.open(path, "wb")
+                elif event == "data" and out is not None:
+                    written += len(value)
+                    limit = settings.resume_max_archive_bytes if _is_zip(current.name) else settings.resume_max_file_bytes
+                    if written > limit:
+                        await out.close()
+                        out = None
+                        os.remove(current.path)
+                        current.finish(SKIPPED, "File too large")
+                        continue
+                    await out.write(value)
+                elif event == "end" and out is not None:
+                    await out.close()
+                    out = None
+            receiver.events.clear()
+        receiver.parser.finalize()
+        if out is not None:
+            raise UploadError("Upload ended in the middle of a file")
+        if not job.files:
+            raise UploadError("No files in upload")
+    except MultipartParseError as e:
+        if out is not None:
+            await out.close()
+        shutil.rmtree(directory, ignore_errors=True)
+        raise UploadError(f"Malformed multipart body: {e}")
+    except BaseException:
+        # Rejected, truncated or abandoned (client disconnect, cancellation)
+        if out is not None:
+            await out.close()
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
+    return job
+
+# Pipeline
+def _copy_member(archive: zipfile.ZipFile, member: zipfile.ZipInfo, path: str, limit: int) -> Optional[int]:
+    """Copy one zip member to disk; its size, or None if it expands past `limit`"""
+    copied = 0
+    with archive.open(member) as source, open(path, "wb") as target:
+        while True:
+            chunk = source.read(settings.upload_chunk_size)
+            if not chunk:
+                return copied
+            copied += len(chunk)
+            if copied > limit:
+                return None
+            target.write(chunk)
+
+async def _expand(job: IngestionJob, archive_file: IngestionFile, files: asyncio.Queue):
+    try:
+        archive = await asyncio.to_thread(zipfile.ZipFile, archive_file.path)
+    except (zipfile.BadZipFile, OSError) as e:
+        archive_file.finish(FAILED, f"Invalid zip: {e}")
+        return
+    # Members count toward the per-upload file limit and every archive of the
+    # job shares one extracted-size budget, so zip bombs stop early
+    stopped = None
+    with archive:
+        for member in archive.infolist():
+            name = member.filename
+            if member.is_dir() or os.path.basename(name).startswith(".") or "__MACOSX" in name:
+                continue
+            if len(job.files) >= settings.resume_ingest_max_files:
+                stopped = f"At most {settings.resume_ingest_max_files} files per upload"
+                break
+            if not is_supported(name):
+                job.add_file(f"{archive_file.name}/{name}").finish(SKIPPED, "Unsupported file type")
+                continue
+            if member.file_size > settings.resume_max_file_bytes:
+                job.add_file(f"{archive_file.name}/{name}").finish(SKIPPED, "File too large")
+                continue
+            budget = settings.resume_max_extracted_bytes - job.extracted_bytes
+            if member.file_size > budget:
+                stopped = f"At most {settings.resume_max_extracted_bytes} bytes extracted per upload"
+                break
+            path = _stored_path(job, name)
+            item = job.add_file(f"{archive_file.name}/{name}", path)
+            limit = min(settings.resume_max_file_bytes, budget)
+            try:
+                copied = await asyncio.to_thread(_copy_member, archive, member, path, limit)
+            except (zipfile.BadZipFile, OSError, RuntimeError) as e:
+                item.finish(FAILED, f"Could not extract: {e}")
+                continue
+            if copied is None:
+                # The member lied about its size
+                os.remove(path)
+                item.finish(SKIPPED, "File too large")
+                if limit < settings.resume_max_file_bytes:
+                    stopped = f"At most {settings.resume_max_extracted_bytes} bytes extracted per upload"
+                    break
+                continue
+            job.extracted_bytes += copied
+            await files.put(item)
+    if stopped:
+        archive_file.finish(FAILED, f"Not fully extracted: {stopped}")
+    else:
+        archive_file.finish(DONE)
+    os.remove(archive_file.path)
+
+async def _produce(job: IngestionJob, files: asyncio.Queue):
+    for item in list(job.files):
+        if item.status != QUEUED:
+            continue
+        if _is_zip(item.name):
+            item.status = PROCESSING
+            await _expand(job, item, files)
+        else:
+            await files.put(item)
+
+async def _extract(files: asyncio.Queue, results: asyncio.Queue):
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    while True:
+        item = await files.get()
+        if item is None:
+            return
+        item.status = PROCESSING
+        try:
+            parsed = await loop.run_in_executor(pool, parse_resume, item.path)
+        except Exception as e:
+            item.finish(FAILED, f"Could not read resume: {e}")
+        else:
+            if not parsed["resume_text"]:
+                item.finish(FAILED, "No text found in resume")
+            elif not parsed["email"]:
+                item.finish(FAILED, "No email address found in resume")
+            else:
+                await results.put((item, parsed))
+        finally:
+            if item.path and os.path.exists(item.path):
+                os.remove(item.path)
+
+_FILLABLE = ("name", "phone", "linkedin_url", "skills", "experience_years")
+
+async def write_candidates(batch: List[Tuple[IngestionFile, Dict[str, Any]]]):
+    """Upsert a batch of parsed resumes by email"""
+    async with AsyncSessionLocal() as db:
+        emails = {parsed["email"] for _, parsed in batch}
+        # Parsed emails are lowercase; stored ones may not be (ix_candidates_email_lower)
+        result = await db.execute(select(Candidate).where(func.lower(Candidate.email).in_(emails)))
+        by_email = {}
+        for candidate in result.scalars():
+            by_email.setdefault(candidate.email.lower(), candidate)
+        for item, parsed in batch:
+            candidate = by_email.get(parsed["email"])
+            if candidate is None:
+                candidate = Candidate(email=parsed["email"], source="upload")
+                db.add(candidate)
+                by_email[parsed["email"]] = candidate
+            candidate.resume_text = parsed["resume_text"]
+            candidate.parsed_data = {
+                **{key: value for key, value in parsed.items() if key != "resume_text"},
+                "file": item.name,
+            }
+            for field in _FILLABLE:
+                if parsed[field] and not getattr(candidate, field):
+                    setattr(candidate, field, parsed[field])
+        await db.flush()
+        await db.commit()
+    for item, parsed in batch:
+        item.candidate_id = by_email[parsed["email"]].id
+
+async def _write(job: IngestionJob, results: asyncio.Queue, writer: Callable[[List], Awaitable[None]]):
+    done = False
+    while not done:
+        batch = [await results.get()]
+        while len(batch) < settings.resume_ingest_batch_size:
+            if results.empty():
+                break
+            batch.append(results.get_nowait())
+        if batch[-1] is None:
+            batch.pop()
+            done = True
+        if not batch:
+            continue
+        try:
+            await writer(batch)
+        except Exception as e:
+            logger.error(f"Ingestion job {job.id}: could not save {len(batch)} candidates: {e}")
+            for item, _ in batch:
+                item.finish(FAILED, "Could not save candidate")
+        else:
+            for item, _ in batch:
+                item.finish(DONE)
+        await _publish(job)
+
+async def run_ingestion(job: IngestionJob, writer: Callable[[List], Awaitable[None]] = write_candidates):
+    """Extract every queued file of the job and save the candidates"""
+    job.status = PROCESSING
+    await _publish(job)
+    files: asyncio.Queue = asyncio.Queue(maxsize=settings.resume_ingest_queue_size)
+    results: asyncio.Queue = asyncio.Queue(maxsize=settings.resume_ingest_batch_size * 2)
+    # Two extractors per pool process keep the pool busy between results
+    extractors = [asyncio.create_task(_extract(files, results)) for _ in range(ingest_workers() * 2)]
+    saver = asyncio.create_task(_write(job, results, writer))
+    try:
+        await _produce(job, files)
+        for _ in extractors:
+            await files.put(None)
+        await asyncio.gather(*extractors)
+        await results.put(None)
+        await saver
+        job.status = DONE
+    except BaseException:
+        job.status = FAILED
+        for task in extractors + [saver]:
+            task.cancel()
+        raise
+    finally:
+        job.finished_at = datetime.utcnow()
+        await asyncio.to_thread(shutil.rmtree, job.directory, True)
+        await _publish(job)
+
+def start_ingestion(job: IngestionJob):
+    """Run the job in the background of this worker"""
+    _jobs[job.id] = job
+    while len(_jobs) > _MAX_JOBS:
+        _jobs.popitem(last=False)
+
+    async def run():
+        try:
+            await run_ingestion(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Ingestion job {job.id} failed: {e}")
+
+    task = asyncio.create_task(run())
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
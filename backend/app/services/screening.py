@@ -0,0 +1,527 @@
+"""
+Batched, rate-aware AI screening of applications.
+
+Applications are turned into prompts and queued on a per-worker
+ScreeningScheduler:
+
+    queue (bounded) ──► N workers ──► rate budget ──► LLM client ──► results ──► DB (batches)
+
+Workers share one budget of requests-per-minute and tokens-per-minute
+token buckets, kept in Redis so the configured OpenAI limits hold no
+matter how many calls are in flight on how many API workers. Each call
+reserves its prompt estimate plus max_tokens and settles with the real
+usage afterwards.
+Retryable errors back off exponentially with full jitter; a Retry-After
+from a 429 also pauses the whole budget. Results fill Application.ai_score
+and ai_analysis through one executemany UPDATE per batch.
+
+Prompts whose result is already in the content-addressed screening cache
+(app.services.screening_cache) skip the LLM entirely.
+"""
+import asyncio
+import json
+import random
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import bindparam, or_, select, tuple_, update
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import Application, Candidate, Job
+from app.services.llm import LLMClient, LLMError, Messages, estimate_prompt_tokens, get_llm_client
+from app.services.pagination import keyset_order
+from app.services.pipeline_stats import PipelineDeltas, application_states, apply_deltas
+from app.services.screening_cache import ScreeningCache, screening_cache_key
+from app.utils.cache import get_async_redis
+from app.utils.metrics import register_collector
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROMPT_VERSION = "screening-v1"
+
+SYSTEM_PROMPT = (
+    "You are a recruiting assistant. Compare the resume with the job and reply "
+    "with a JSON object: {\"score\": 0-100 match score, \"summary\": one or two "
+    "sentences, \"strengths\": [short strings], \"concerns\": [short strings]}."
+)
+
+def prompt_parts(title: str, description: Optional[str], requirements: Any,
+                 resume_text: Optional[str], skills: Optional[List[str]]) -> Tuple[str, str]:
+    """(job, resume) text as sent to the model"""
+    job = f"{title}\n{description or ''}"
+    if requirements:
+        job += f"\nRequirements: {json.dumps(requirements, ensure_ascii=False)}"
+    resume = (resume_text or "")[:settings.ai_screening_max_resume_chars]
+    if skills:
+        resume = f"Skills: {', '.join(map(str, skills))}\n{resume}"
+    return job, resume
+
+def build_messages(title: str, description: Optional[str], requirements: Any,
+                   resume_text: Optional[str], skills: Optional[List[str]]) -> Messages:
+    job, resume = prompt_parts(title, description, requirements, resume_text, skills)
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"JOB:\n{job}\n\nRESUME:\n{resume}"},
+    ]
+
+def parse_screening(text: str) -> Tuple[float, Dict[str, Any]]:
+    """(score, analysis) from the model's JSON reply"""
+    data = json.loads(text)
+    score = float(data["score"])
+    return max(0.0, min(100.0, score)), {
+        "summary": str(data.get("summary", "")),
+        "strengths": [str(s) for s in data.get("strengths") or []],
+        "concerns": [str(s) for s in data.get("concerns") or []],
+    }
+
+class RateBudget:
+    """
+    Requests- and tokens-per-minute token buckets. Buckets hold ten
+    seconds' worth so a full minute's budget is not spent in one burst.
+    """
+
+    BURST_SECONDS = 10
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._request_capacity = max(1.0, rpm * self.BURST_SECONDS / 60)
+        self._token_capacity = max(1.0, tpm * self.BURST_SECONDS / 60)
+        self._requests = self._request_capacity
+        self._tokens = self._token_capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        # Held while waiting, so callers are served in arrival order
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self._request_capacity, self._requests + elapsed * self.rpm / 60)
+        self._tokens = min(self._token_capacity, self._tokens + elapsed * self.tpm / 60)
+
+    async def acquire(self, tokens: int):
+        tokens = min(tokens, self._token_capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._requests >= 1 and self._tokens >= tokens:
+                        self._requests -= 1
+                        self._tokens -= tokens
+                        return
+                    wait = max(
+                        (1 - self._requests) * 60 / self.rpm,
+                        (tokens - self._tokens) * 60 / self.tpm
+                    )
+                await asyncio.sleep(wait)
+
+    async def settle(self, reserved: int, used: int):
+        """Return the unused part of a reservation (or charge the overrun)"""
+        self._tokens = min(self._token_capacity, self._tokens + reserved - used)
+
+    async def pause(self, seconds: float):
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+# The same buckets as GCRA "theoretical arrival times" (see app.utils.rate_limit).
+# KEYS: requests bucket, tokens bucket, pause flag.
+# ARGV: request interval ms, request burst ms, token interval ms, token burst ms, tokens.
+# Returns 0 once both buckets are charged, else the milliseconds to wait.
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local paused = redis.call('PTTL', KEYS[3])
+if paused > 0 then
+  return paused
+end
+local costs = {tonumber(ARGV[1]), tonumber(ARGV[3]) * tonumber(ARGV[5])}
+local bursts = {tonumber(ARGV[2]), tonumber(ARGV[4])}
+local tats = {}
+local wait = 0
+for i = 1, 2 do
+  tats[i] = math.max(tonumber(redis.call('GET', KEYS[i]) or now), now) + costs[i]
+  wait = math.max(wait, tats[i] - now - bursts[i])
+end
+if wait > 0 then
+  return math.ceil(wait)
+end
+for i = 1, 2 do
+  redis.call('SET', KEYS[i], string.format('%.3f', tats[i]), 'PX', math.ceil(tats[i] - now))
+end
+return 0
+"""
+
+# KEYS: tokens bucket. ARGV: token interval ms, tokens returned (negative: overrun).
+_SETTLE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local tat = math.max(tonumber(redis.call('GET', KEYS[1]) or now), now) - tonumber(ARGV[1]) * tonumber(ARGV[2])
+if tat > now then
+  redis.call('SET', KEYS[1], string.format('%.3f', tat), 'PX', math.ceil(tat - now))
+else
+  redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+class SharedRateBudget:
+    """
+    The RateBudget buckets kept in Redis, so the configured limits hold
+    across all API workers rather than per worker. While Redis is
+    unavailable each worker falls back to a local RateBudget with its share
+    (1 / WEB_WORKERS) of the limits.
+    """
+
+    PREFIX = "screening:budget"
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._request_interval = 60000 / rpm
+        self._token_interval = 60000 / tpm
+        self._token_capacity = max(1.0, tpm * RateBudget.BURST_SECONDS / 60)
+        self._keys = [f"{self.PREFIX}:requests", f"{self.PREFIX}:tokens", f"{self.PREFIX}:paused"]
+        workers = max(settings.web_workers, 1)
+        self.local = RateBudget(max(rpm // workers, 1), max(tpm // workers, 1))
+        self._client = None
+        self._scripts = None
+        self._redis_failed_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def _redis(self):
+        """Scripts bound to the Redis client, or None to use the local budget"""
+        # After a Redis error stay local for a while instead of failing every call
+        if self._redis_failed_at is not None and time.monotonic() - self._redis_failed_at < settings.rate_limit_redis_retry:
+            return None
+        client = await get_async_redis()
+        if client is None:
+            return None
+        if client is not self._client:
+            self._client = client
+            self._scripts = (client.register_script(_ACQUIRE_SCRIPT), client.register_script(_SETTLE_SCRIPT))
+        return self._scripts
+
+    def _failed(self, e: Exception):
+        self._redis_failed_at = time.monotonic()
+        logger.warning(f"Screening rate budget falling back to this worker's share: {e}")
+
+    async def acquire(self, tokens: int):
+        tokens = min(tokens, self._token_capacity)
+        # Callers of this worker queue locally, one at a time against Redis
+        async with self._lock:
+            while True:
+                scripts = await self._redis()
+                if scripts is None:
+                    return await self.local.acquire(tokens)
+                try:
+                    wait_ms = int(await scripts[0](keys=self._keys, args=[
+                        self._request_interval, RateBudget.BURST_SECONDS * 1000,
+                        self._token_interval, RateBudget.BURST_SECONDS * 1000, tokens
+                    ]))
+                except Exception as e:
+                    self._failed(e)
+                    continue
+                if not wait_ms:
+                    return
+                await asyncio.sleep(wait_ms / 1000)
+
+    async def settle(self, reserved: int, used: int):
+        scripts = await self._redis()
+        if scripts is None:
+            return await self.local.settle(reserved, used)
+        try:
+            await scripts[1](keys=self._keys[1:2], args=[self._token_interval, reserved - used])
+        except Exception as e:
+            self._failed(e)
+
+    async def pause(self, seconds: float):
+        await self.local.pause(seconds)
+        scripts = await self._redis()
+        if scripts is None:
+            return
+        try:
+            await self._client.set(self._keys[2], 1, px=max(int(seconds * 1000), 1))
+        except Exception as e:
+            self._failed(e)
+
+class ScreeningTask:
+    def __init__(self, application_id: UUID, messages: Messages, cache_key: Optional[str] = None):
+        self.application_id = application_id
+        self.messages = messages
+        self.cache_key = cache_key
+
+def screening_task(application_id: UUID, title: str, description: Optional[str], requirements: Any,
+                   resume_text: Optional[str], skills: Optional[List[str]], model: str) -> ScreeningTask:
+    job, resume = prompt_parts(title, description, requirements, resume_text, skills)
+    return ScreeningTask(
+        application_id,
+        build_messages(title, description, requirements, resume_text, skills),
+        screening_cache_key(PROMPT_VERSION, model, settings.openai_temperature, job, resume)
+    )
+
+# (application_id, ai_score, ai_analysis) as written to the application
+Result = Tuple[UUID, Optional[float], Dict[str, Any]]
+
+async def write_results(results: List[Result]):
+    """Write a batch of screening results in one executemany UPDATE"""
+    table = Application.__table__
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("_id"))
+        .values(ai_score=bindparam("ai_score"), ai_analysis=bindparam("ai_analysis"), updated_at=bindparam("updated_at"))
+    )
+    now = datetime.utcnow()
+    async with AsyncSessionLocal() as db:
+        connection = await db.connection()
+        # Core writes bypass the ORM hook, so move the pipeline stats here
+        states = await connection.run_sync(application_states, [application_id for application_id, _, _ in results])
+        await connection.execute(statement, [
+            {"_id": application_id, "ai_score": score, "ai_analysis": analysis, "updated_at": now}
+            for application_id, score, analysis in results
+        ])
+        deltas = PipelineDeltas()
+        for application_id, score, _ in results:
+            state = states.get(application_id)
+            if state is not None:
+                deltas.move(state, (state[0], state[1], score))
+        await connection.run_sync(apply_deltas, deltas)
+        await db.commit()
+
+class ScreeningScheduler:
+    def __init__(
+        self,
+        client: Optional[LLMClient] = None,
+        writer: Callable[[List[Result]], Awaitable[None]] = write_results,
+        concurrency: Optional[int] = None,
+        rpm: Optional[int] = None,
+        tpm: Optional[int] = None,
+        use_cache: bool = True
+    ):
+        self.client = client or get_llm_client()
+        self.cache = ScreeningCache() if use_cache and settings.screening_cache_enabled else None
+        self.writer = writer
+        self.concurrency = concurrency or settings.ai_screening_concurrency
+        self.budget = SharedRateBudget(rpm or settings.ai_screening_rpm, tpm or settings.ai_screening_tpm)
+        self._queue: "asyncio.Queue[ScreeningTask]" = asyncio.Queue(maxsize=settings.ai_screening_queue_size)
+        # Results, each with the (cache key, entry) to store for fresh LLM answers
+        self._results: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self._inflight = set()  # application ids queued or being screened
+        # cache key -> applications waiting on the same prompt's answer
+        self._followers: Dict[str, List[UUID]] = {}
+        self.stats = {
+            "queued": 0, "cached": 0, "screened": 0, "failed": 0, "retries": 0,
+            "rate_limited": 0, "prompt_tokens": 0, "completion_tokens": 0,
+        }
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+            self._tasks.append(asyncio.create_task(self._write()))
+
+    async def submit(self, tasks: Iterable[ScreeningTask]):
+        """
+        Queue tasks, waiting while the queue is full. Tasks with a cached
+        result skip the LLM and go straight to the writer.
+        """
+        tasks = [task for task in tasks if task.application_id not in self._inflight]
+        self._inflight.update(task.application_id for task in tasks)
+        cached = {}
+        if self.cache is not None:
+            cached = await self.cache.lookup([task.cache_key for task in tasks if task.cache_key])
+        for task in tasks:
+            entry = cached.get(task.cache_key)
+            if entry is not None:
+                version, model, score, analysis = entry
+                self.stats["cached"] += 1
+                self._results.put_nowait((task.application_id, score, {
+                    "prompt_version": version, "model": model, **analysis,
+                    "cached": True, "screened_at": datetime.utcnow().isoformat(),
+                }, None))
+                continue
+            if task.cache_key in self._followers:
+                # Same prompt already queued: reuse its answer
+                self._followers[task.cache_key].append(task.application_id)
+                self.stats["cached"] += 1
+                continue
+            if task.cache_key:
+                self._followers[task.cache_key] = []
+            await self._queue.put(task)
+            self.stats["queued"] += 1
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    async def join(self):
+        """Wait until everything queued so far is screened and written"""
+        await self._queue.join()
+        await self._results.join()
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _complete(self, task: ScreeningTask):
+        max_tokens = settings.openai_max_tokens
+        for attempt in range(settings.ai_screening_max_retries + 1):
+            reserved = estimate_prompt_tokens(task.messages) + max_tokens
+            await self.budget.acquire(reserved)
+            try:
+                response = await self.client.complete(task.messages, max_tokens, settings.openai_temperature)
+            except LLMError as e:
+                await self.budget.settle(reserved, 0)
+                if not e.retryable or attempt == settings.ai_screening_max_retries:
+                    raise
+                self.stats["retries"] += 1
+                if e.retry_after:
+                    self.stats["rate_limited"] += 1
+                    await self.budget.pause(e.retry_after)
+                # Full jitter: spread retries so workers don't stampede together
+                backoff = min(settings.ai_screening_backoff_max, settings.ai_screening_backoff_base * 2 ** attempt)
+                await asyncio.sleep(max(random.uniform(0, backoff), e.retry_after or 0))
+                continue
+            await self.budget.settle(reserved, response.total_tokens)
+            self.stats["prompt_tokens"] += response.prompt_tokens
+            self.stats["completion_tokens"] += response.completion_tokens
+            return response
+
+    async def _work(self):
+        while True:
+            task = await self._queue.get()
+            analysis: Dict[str, Any] = {"prompt_version": PROMPT_VERSION, "model": self.client.model}
+            entry = None
+            try:
+                response = await self._complete(task)
+                score, parsed = parse_screening(response.text)
+                analysis.update(parsed, model=response.model)
+                if task.cache_key:
+                    entry = (task.cache_key, (PROMPT_VERSION, response.model, score, parsed))
+                self.stats["screened"] += 1
+            except Exception as e:
+                logger.warning(f"Screening application {task.application_id} failed: {e}")
+                score = None
+                analysis["error"] = str(e)[:500]
+                self.stats["failed"] += 1
+            analysis["screened_at"] = datetime.utcnow().isoformat()
+            self._results.put_nowait((task.application_id, score, analysis, entry))
+            for application_id in self._followers.pop(task.cache_key, None) or ():
+                self._results.put_nowait((application_id, score, {**analysis, "cached": True}, None))
+            self._queue.task_done()
+
+    async def _write(self):
+        while True:
+            batch = [await self._results.get()]
+            deadline = time.monotonic() + settings.ai_screening_flush_interval
+            while len(batch) < settings.ai_screening_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._results.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self.writer([(application_id, score, analysis) for application_id, score, analysis, _ in batch])
+                if self.cache is not None:
+                    await self.cache.store(dict(entry for _, _, _, entry in batch if entry is not None))
+            except Exception as e:
+                logger.error(f"Could not save {len(batch)} screening results: {e}")
+            finally:
+                for application_id, _, _, _ in batch:
+                    self._inflight.discard(application_id)
+                    self._results.task_done()
+
+def screening_query(organization_id: UUID, job_id: Optional[UUID] = None,
+                    application_ids: Optional[List[UUID]] = None, rescreen: bool = False):
+    """Prompt inputs for the organization's applications that can be screened"""
+    query = (
+        select(
+            Application.id, Application.created_at, Job.title, Job.description, Job.requirements,
+            Candidate.resume_text, Candidate.skills
+        )
+        .join(Job, Job.id == Application.job_id)
+        .join(Candidate, Candidate.id == Application.candidate_id)
+        .where(Job.organization_id == organization_id)
+        .where(or_(Candidate.resume_text.isnot(None), Candidate.skills.isnot(None)))
+    )
+    if job_id is not None:
+        query = query.where(Application.job_id == job_id)
+    if application_ids is not None:
+        query = query.where(Application.id.in_(application_ids))
+    if not rescreen:
+        # Unscored, including earlier failures
+        query = query.where(Application.ai_score.is_(None))
+    return query
+
+async def queue_applications(query, scheduler: "ScreeningScheduler"):
+    """
+    Queue matching applications in keyset batches. Each batch is read in
+    its own short session, so no connection is held while submit() waits
+    for room in the queue.
+    """
+    size = settings.ai_screening_batch_size
+    after = None
+    while True:
+        batch = query if after is None else query.where(tuple_(Application.created_at, Application.id) < after)
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(keyset_order(batch, Application).limit(size))).all()
+        await scheduler.submit(
+            screening_task(row.id, row.title, row.description, row.requirements, row.resume_text, row.skills, scheduler.client.model)
+            for row in rows
+        )
+        if len(rows) < size:
+            return
+        after = (rows[-1].created_at, rows[-1].id)
+
+_scheduler: Optional[ScreeningScheduler] = None
+_background = set()
+
+@register_collector
+def _screening_metrics():
+    if _scheduler is None:
+        return
+    stats = _scheduler.stats
+    yield "screening_applications_total", "counter", "Applications by screening outcome", [
+        ({"outcome": outcome}, stats[outcome]) for outcome in ("screened", "cached", "failed")
+    ]
+    yield "screening_pending", "gauge", "Applications queued or in flight for screening", [({}, _scheduler.pending)]
+    yield "screening_retries_total", "counter", "LLM calls retried, including rate-limited ones", [({}, stats["retries"])]
+    yield "screening_rate_limited_total", "counter", "Retries that waited for the provider's Retry-After", [({}, stats["rate_limited"])]
+    yield "screening_tokens_total", "counter", "LLM tokens used for screening", [
+        ({"kind": "prompt"}, stats["prompt_tokens"]), ({"kind": "completion"}, stats["completion_tokens"])
+    ]
+    if _scheduler.cache is not None:
+        yield "screening_cache_hit_ratio", "gauge", "Share of screening cache lookups that hit", [({}, _scheduler.cache.hit_rate)]
+        yield "screening_cache_lookups_total", "counter", "Screening cache lookups by where they were answered", [
+            ({"source": source}, _scheduler.cache.stats[key])
+            for source, key in (("redis", "redis_hits"), ("database", "db_hits"), ("miss", "misses"))
+        ]
+
+def get_screening_scheduler() -> ScreeningScheduler:
+    """This worker's scheduler, started on first use"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ScreeningScheduler()
+        _scheduler.start()
+    return _scheduler
+
+def schedule_screening(query):
+    """Queue matching applications in the background"""
+    task = asyncio.create_task(queue_applications(query, get_screening_scheduler()))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+async def stop_screening_scheduler():
+    global _scheduler
+    for task in list(_background):
+        task.cancel()
+    if _scheduler is not None:
+        await _scheduler.stop()
+        _scheduler = None
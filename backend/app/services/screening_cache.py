@@ -0,0 +1,127 @@
+"""
+Content-addressed cache of LLM screening results.
+
+Entries are keyed by `screening_cache_key`: a sha256 over the prompt
+template version, model, temperature and the whitespace-normalised job and
+resume text actually sent. Identical prompts therefore hit no matter which
+application, job copy or re-run produced them, and anything that could
+change the answer changes the key.
+
+The screening_results table is the durable store; Redis (or the in-memory
+fallback) sits in front of it for the hot set. Changing PROMPT_VERSION
+makes old entries unreachable; `invalidate` deletes them in bulk.
+"""
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import delete, select
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, dialect_insert
+from app.models import ScreeningResult
+from app.utils.cache import cache_key, delete_many, get_many, set_many
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (prompt_version, model, score, analysis)
+Entry = Tuple[str, str, float, Dict[str, Any]]
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+def screening_cache_key(prompt_version: str, model: str, temperature: float, job: str, resume: str) -> str:
+    payload = json.dumps([prompt_version, model, temperature, _normalize(job), _normalize(resume)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def _redis_key(key: str) -> str:
+    return cache_key("screening", key)
+
+class ScreeningCache:
+    def __init__(self):
+        self.stats = {"hits": 0, "redis_hits": 0, "db_hits": 0, "misses": 0, "stored": 0, "invalidated": 0}
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    async def lookup(self, keys: List[str]) -> Dict[str, Entry]:
+        """Cached entries for the keys that have one"""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        found: Dict[str, Entry] = {}
+        try:
+            cached = await get_many([_redis_key(key) for key in keys])
+        except Exception as e:
+            logger.warning(f"Screening cache lookup failed: {e}")
+            cached = {}
+        for key in keys:
+            entry = cached.get(_redis_key(key))
+            if entry is not None:
+                found[key] = tuple(entry)
+        self.stats["redis_hits"] += len(found)
+
+        missing = [key for key in keys if key not in found]
+        if missing:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(select(ScreeningResult).where(ScreeningResult.key.in_(missing)))
+                from_db = {
+                    row.key: (row.prompt_version, row.model, row.score, row.analysis)
+                    for row in result.scalars()
+                }
+            if from_db:
+                self.stats["db_hits"] += len(from_db)
+                found.update(from_db)
+                await self._warm(from_db)
+
+        self.stats["hits"] += len(found)
+        self.stats["misses"] += len(keys) - len(found)
+        return found
+
+    async def _warm(self, entries: Dict[str, Entry]):
+        try:
+            await set_many({_redis_key(key): list(entry) for key, entry in entries.items()}, expire=settings.screening_cache_ttl)
+        except Exception as e:
+            logger.warning(f"Screening cache warm-up failed: {e}")
+
+    async def store(self, entries: Dict[str, Entry]):
+        """Persist fresh results; an existing entry for the same key wins"""
+        if not entries:
+            return
+        async with AsyncSessionLocal() as db:
+            connection = await db.connection()
+            insert = dialect_insert(connection.dialect.name)
+            rows = [
+                {"key": key, "prompt_version": version, "model": model, "score": score, "analysis": analysis}
+                for key, (version, model, score, analysis) in entries.items()
+            ]
+            await connection.execute(insert(ScreeningResult).on_conflict_do_nothing(index_elements=["key"]), rows)
+            await db.commit()
+        self.stats["stored"] += len(entries)
+        await self._warm(entries)
+
+    async def invalidate(self, prompt_version: Optional[str] = None, keep_version: Optional[str] = None, batch_size: int = 1000) -> int:
+        """
+        Delete entries of `prompt_version`, or of every version other than
+        `keep_version`; returns how many were removed.
+        """
+        if prompt_version is not None:
+            condition = ScreeningResult.prompt_version == prompt_version
+        elif keep_version is not None:
+            condition = ScreeningResult.prompt_version != keep_version
+        else:
+            raise ValueError("Pass prompt_version or keep_version")
+
+        removed = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                keys = list((await db.execute(select(ScreeningResult.key).where(condition).limit(batch_size))).scalars())
+                if not keys:
+                    break
+                await db.execute(delete(ScreeningResult).where(ScreeningResult.key.in_(keys)))
+                await db.commit()
+            await delete_many([_redis_key(key) for key in keys])
+            removed += len(keys)
+        self.stats["invalidated"] += removed
+        return removed
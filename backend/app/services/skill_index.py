@@ -0,0 +1,376 @@
+"""
+In-process inverted index for boolean candidate filtering.
+
+Maps normalised skills, locations and organizations to compressed bitmaps
+of candidate doc ids, so a recruiter filter such as
+
+    python AND (aws OR gcp) AND NOT php
+
+is a handful of bitmap operations instead of a scan over Candidate.skills.
+A candidate belongs to an organization once they have applied to one of
+its jobs.
+
+Each API worker builds its index in the background at startup
+(`start_skill_index`). Commits in this worker are applied immediately via
+ORM hooks; changes made by other workers are pulled in every
+SKILL_INDEX_REFRESH_INTERVAL seconds by `refresh()` using the
+updated_at/created_at columns. Those cannot see deletions, so every
+SKILL_INDEX_REBUILD_INTERVAL seconds the index is rebuilt from scratch
+and swapped in, dropping candidates and applications deleted elsewhere.
+"""
+import asyncio
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import Application, Candidate, Job
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Roaring bitmaps when available, plain sets otherwise
+try:
+    from pyroaring import BitMap as Bitmap
+    _ordered_bitmaps = True
+except ImportError:
+    Bitmap = set
+    _ordered_bitmaps = False
+
+class SkillQueryError(ValueError):
+    """Raised for a malformed boolean skill expression"""
+
+def normalize_term(value: str) -> str:
+    return re.sub(r"\s+", " ", value.strip().lower())
+
+# Expression parsing: NOT binds tighter than AND, AND tighter than OR.
+# Bare words between operators form one term ("machine learning"); quotes
+# allow operator words inside a term ("\"and design\"").
+_TOKEN = re.compile(r'\(|\)|"[^"]*"|[^\s()"]+')
+_OPERATORS = {"and", "or", "not"}
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    tokens: List[Tuple[str, str]] = []
+    for raw in _TOKEN.findall(expression):
+        lowered = raw.lower()
+        if raw in ("(", ")"):
+            tokens.append((raw, raw))
+        elif lowered in _OPERATORS:
+            tokens.append((lowered, raw))
+        else:
+            word = raw[1:-1] if raw.startswith('"') else raw
+            if tokens and tokens[-1][0] == "term" and not raw.startswith('"'):
+                tokens[-1] = ("term", f"{tokens[-1][1]} {word}")
+            else:
+                tokens.append(("term", word))
+    return tokens
+
+class _Parser:
+    def __init__(self, expression: str, resolve, universe):
+        self.tokens = _tokenize(expression)
+        self.position = 0
+        self.resolve = resolve
+        self.universe = universe
+
+    def parse(self):
+        if not self.tokens:
+            raise SkillQueryError("Empty skill expression")
+        result = self._or()
+        if self.position != len(self.tokens):
+            raise SkillQueryError(f"Unexpected '{self.tokens[self.position][1]}'")
+        return result
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def _or(self):
+        result = self._and()
+        while self._peek() == "or":
+            self.position += 1
+            result = result | self._and()
+        return result
+
+    def _and(self):
+        result = self._not()
+        while self._peek() == "and":
+            self.position += 1
+            result = result & self._not()
+        return result
+
+    def _not(self):
+        if self._peek() == "not":
+            self.position += 1
+            return self.universe - self._not()
+        return self._atom()
+
+    def _atom(self):
+        kind = self._peek()
+        if kind == "(":
+            self.position += 1
+            result = self._or()
+            if self._peek() != ")":
+                raise SkillQueryError("Missing ')'")
+            self.position += 1
+            return result
+        if kind == "term":
+            term = self.tokens[self.position][1]
+            self.position += 1
+            return self.resolve(term)
+        raise SkillQueryError("Expected a skill" if kind is None else f"Unexpected '{self.tokens[self.position][1]}'")
+
+class SkillIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._doc_of: Dict[UUID, int] = {}
+        self._id_of: List[Optional[UUID]] = []
+        self._all = Bitmap()
+        self._skills: Dict[str, Bitmap] = {}
+        self._locations: Dict[str, Bitmap] = {}
+        self._organizations: Dict[UUID, Bitmap] = {}
+        self._doc_terms: Dict[int, Tuple[Tuple[str, ...], Optional[str]]] = {}
+        self._job_organization: Dict[UUID, UUID] = {}
+        # Applications seen before their job (created by another worker)
+        self._orphan_applications: Dict[UUID, List[UUID]] = {}
+        self.synced_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    def _doc(self, candidate_id: UUID) -> int:
+        doc = self._doc_of.get(candidate_id)
+        if doc is None:
+            doc = len(self._id_of)
+            self._doc_of[candidate_id] = doc
+            self._id_of.append(candidate_id)
+        return doc
+
+    @staticmethod
+    def _unpost(postings: Dict, key, doc: int):
+        bitmap = postings.get(key)
+        if bitmap is not None:
+            bitmap.discard(doc)
+            if not bitmap:
+                del postings[key]
+
+    def upsert_candidate(self, candidate_id: UUID, skills: Optional[Iterable[str]], location: Optional[str]):
+        skills = tuple(sorted({normalize_term(s) for s in skills or () if isinstance(s, str) and s.strip()}))
+        location = normalize_term(location) if location else None
+        with self._lock:
+            doc = self._doc(candidate_id)
+            old_skills, old_location = self._doc_terms.get(doc, ((), None))
+            for skill in set(old_skills) - set(skills):
+                self._unpost(self._skills, skill, doc)
+            for skill in skills:
+                self._skills.setdefault(skill, Bitmap()).add(doc)
+            if old_location != location:
+                self._unpost(self._locations, old_location, doc)
+                if location:
+                    self._locations.setdefault(location, Bitmap()).add(doc)
+            self._doc_terms[doc] = (skills, location)
+            self._all.add(doc)
+
+    def remove_candidate(self, candidate_id: UUID):
+        with self._lock:
+            doc = self._doc_of.pop(candidate_id, None)
+            if doc is None:
+                return
+            skills, location = self._doc_terms.pop(doc, ((), None))
+            for skill in skills:
+                self._unpost(self._skills, skill, doc)
+            self._unpost(self._locations, location, doc)
+            for bitmap in self._organizations.values():
+                bitmap.discard(doc)
+            self._all.discard(doc)
+            self._id_of[doc] = None
+
+    def register_job(self, job_id: UUID, organization_id: UUID):
+        with self._lock:
+            self._job_organization[job_id] = organization_id
+            for candidate_id in self._orphan_applications.pop(job_id, ()):
+                self.add_application(candidate_id, job_id)
+
+    def add_application(self, candidate_id: UUID, job_id: UUID):
+        with self._lock:
+            organization_id = self._job_organization.get(job_id)
+            if organization_id is None:
+                self._orphan_applications.setdefault(job_id, []).append(candidate_id)
+            else:
+                self._organizations.setdefault(organization_id, Bitmap()).add(self._doc(candidate_id))
+
+    def _skill_bitmap(self, term: str):
+        return self._skills.get(normalize_term(term), Bitmap())
+
+    def evaluate(self, expression: Optional[str] = None, organization_id: Optional[UUID] = None, location: Optional[str] = None):
+        """Bitmap of doc ids matching the expression and filters"""
+        with self._lock:
+            if expression and expression.strip():
+                result = _Parser(expression, self._skill_bitmap, self._all).parse()
+            else:
+                result = self._all
+            if organization_id is not None:
+                result = result & self._organizations.get(organization_id, Bitmap())
+            if location:
+                result = result & self._locations.get(normalize_term(location), Bitmap())
+            return result & self._all
+
+    def count(self, expression: Optional[str] = None, **filters) -> int:
+        return len(self.evaluate(expression, **filters))
+
+    def search(self, expression: Optional[str] = None, offset: int = 0, limit: int = 50, **filters) -> Tuple[int, List[UUID]]:
+        """(total matches, candidate ids for the requested page)"""
+        matches = self.evaluate(expression, **filters)
+        docs = matches if _ordered_bitmaps else sorted(matches)
+        page = []
+        for position, doc in enumerate(docs):
+            if position >= offset + limit:
+                break
+            if position >= offset:
+                page.append(self._id_of[doc])
+        return len(matches), page
+
+    def skill_counts(self, limit: int = 50) -> List[Tuple[str, int]]:
+        """Most common skills, for filter suggestions"""
+        with self._lock:
+            counts = [(skill, len(bitmap)) for skill, bitmap in self._skills.items()]
+        return sorted(counts, key=lambda item: -item[1])[:limit]
+
+    async def refresh(self, db: AsyncSession, since: Optional[datetime] = None):
+        """Pull candidates, jobs and applications changed since `since`"""
+        started = datetime.utcnow()
+        job_query = select(Job.id, Job.organization_id)
+        candidate_query = select(Candidate.id, Candidate.skills, Candidate.location)
+        application_query = select(Application.candidate_id, Application.job_id)
+        if since is not None:
+            job_query = job_query.where(Job.created_at >= since)
+            candidate_query = candidate_query.where(Candidate.updated_at >= since)
+            application_query = application_query.where(Application.created_at >= since)
+
+        for row in (await db.execute(job_query)).all():
+            self.register_job(row.id, row.organization_id)
+        stream = await db.stream(candidate_query.execution_options(yield_per=settings.skill_index_batch_size))
+        async for rows in stream.partitions():
+            for row in rows:
+                self.upsert_candidate(row.id, row.skills, row.location)
+        stream = await db.stream(application_query.execution_options(yield_per=settings.skill_index_batch_size))
+        async for rows in stream.partitions():
+            for row in rows:
+                self.add_application(row.candidate_id, row.job_id)
+        self.synced_at = started
+
+_index: Optional[SkillIndex] = None
+_backlog: Optional[List[Tuple]] = None  # changes committed while a build runs
+_maintainer: Optional[asyncio.Task] = None
+
+def get_skill_index() -> Optional[SkillIndex]:
+    """This worker's index, or None until its first build has finished"""
+    return _index
+
+async def build_skill_index() -> SkillIndex:
+    """Build a fresh index and swap it in, replaying commits made meanwhile"""
+    global _index, _backlog
+    _backlog = []
+    try:
+        index = SkillIndex()
+        async with AsyncSessionLocal() as db:
+            await index.refresh(db)
+        # No await from here on: no commit can slip between replay and swap
+        for change in _backlog:
+            _apply(index, change)
+        _index = index
+    finally:
+        _backlog = None
+    return index
+
+async def _maintain():
+    built_at = None
+    while True:
+        try:
+            if _index is None or time.monotonic() - built_at >= settings.skill_index_rebuild_interval:
+                started = time.perf_counter()
+                index = await build_skill_index()
+                built_at = time.monotonic()
+                logger.info(f"Skill index built: {len(index)} candidates in {time.perf_counter() - started:.1f}s")
+            else:
+                async with AsyncSessionLocal() as db:
+                    # Re-read rows stamped shortly before the last refresh started: a
+                    # transaction may stamp updated_at before the refresh and commit after it
+                    overlap = timedelta(seconds=settings.skill_index_refresh_overlap)
+                    await _index.refresh(db, since=_index.synced_at - overlap)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Skill index update failed: {e}", exc_info=True)
+        await asyncio.sleep(settings.skill_index_refresh_interval)
+
+async def start_skill_index():
+    """Build the index in the background and keep it current"""
+    global _maintainer
+    if _maintainer is None:
+        _maintainer = asyncio.create_task(_maintain())
+
+async def stop_skill_index():
+    global _maintainer, _index
+    if _maintainer is not None:
+        task, _maintainer = _maintainer, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    _index = None
+
+def _apply(index: SkillIndex, change: Tuple):
+    kind, *args = change
+    if kind == "candidate":
+        index.upsert_candidate(*args)
+    elif kind == "remove":
+        index.remove_candidate(*args)
+    elif kind == "job":
+        index.register_job(*args)
+    elif kind == "application":
+        index.add_application(*args)
+
+# ORM hooks: apply this worker's own commits immediately
+_PENDING_KEY = "skill_index_changes"
+
+def _changed(obj, *names) -> bool:
+    attrs = inspect(obj).attrs
+    return any(attrs[name].history.has_changes() for name in names)
+
+@event.listens_for(Session, "after_flush")
+def _collect_skill_changes(session, flush_context):
+    changes = session.info.setdefault(_PENDING_KEY, [])
+    for obj in session.new:
+        if isinstance(obj, Job):
+            changes.append(("job", obj.id, obj.organization_id))
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Candidate) and (obj in session.new or _changed(obj, "skills", "location")):
+            changes.append(("candidate", obj.id, obj.skills, obj.location))
+    for obj in session.new:
+        if isinstance(obj, Application):
+            changes.append(("application", obj.candidate_id, obj.job_id))
+    for obj in session.deleted:
+        if isinstance(obj, Candidate):
+            changes.append(("remove", obj.id))
+
+@event.listens_for(Session, "after_commit")
+def _apply_skill_changes(session):
+    changes = session.info.pop(_PENDING_KEY, None)
+    if not changes:
+        return
+    if _index is not None:
+        for change in changes:
+            _apply(_index, change)
+    # A build in progress may have read these rows before the commit
+    if _backlog is not None:
+        _backlog.extend(changes)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_skill_changes(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -1,6 +1,17 @@
-import json
-from typing import Optional, Any
+import asyncio
+import functools
+import hashlib
+import math
+import random
+import time
+import uuid
+from typing import Optional, Any, Callable, Dict, Iterable, List
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from app.core.config import settings
+from app.utils.codec import encode_value, decode_value
+from app.utils.memory_cache import MemoryCache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -8,62 +19,403 @@ logger = logging.getLogger(__name__)
 # Try to import redis, fallback to in-memory cache if not available
 try:
     import redis
-    redis_available = True
-    redis_client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
-    # Test connection
-    redis_client.ping()
-    logger.info("Redis connection established")
-except Exception as e:
+    import redis.asyncio
+except ImportError:
+    redis = None
+
+# Clients are created on first use, so importing this module never touches
+# Redis. redis_available stays None until the first cache call decides
+# between Redis and the in-memory fallback.
+redis_available: Optional[bool] = None
+_sync_client = None
+_async_client = None
+_memory_cache: Optional[MemoryCache] = None
+_async_client_lock = asyncio.Lock()
+
+def _use_memory_cache(error: Exception):
+    global redis_available, _memory_cache
     redis_available = False
-    logger.warning(f"Redis not available: {e}. Using in-memory cache.")
-    
-    # Simple in-memory cache for development
-    class InMemoryCache:
-        def __init__(self):
-            self.store = {}
-        
-        def get(self, key: str) -> Optional[str]:
-            return self.store.get(key)
-        
-        def set(self, key: str, value: str, ex: Optional[int] = None):
-            self.store[key] = value
-            # Note: expiration not implemented in simple cache
-        
-        def setex(self, key: str, seconds: int, value: str):
-            self.set(key, value, ex=seconds)
-        
-        def delete(self, key: str):
-            if key in self.store:
-                del self.store[key]
-        
-        def exists(self, key: str) -> bool:
-            return key in self.store
-    
-    redis_client = InMemoryCache()
+    logger.warning(f"Redis not available: {error}. Using in-memory cache.")
+    if _memory_cache is None:
+        # Bounded TTL/LRU in-memory cache for development and Redis outages
+        _memory_cache = MemoryCache(
+            max_entries=settings.memory_cache_max_entries,
+            max_bytes=settings.memory_cache_max_bytes
+        )
+
+def _get_client():
+    """Blocking client for sync callers (ORM hooks, scripts)"""
+    global _sync_client, redis_available
+    if redis_available is None:
+        try:
+            if redis is None:
+                raise ImportError("redis package not installed")
+            client = redis.Redis.from_url(
+                settings.redis_url,
+                socket_connect_timeout=settings.redis_connect_timeout
+            )
+            client.ping()
+            _sync_client = client
+            redis_available = True
+            logger.info("Redis connection established")
+        except Exception as e:
+            _use_memory_cache(e)
+    if not redis_available:
+        return _memory_cache
+    if _sync_client is None:
+        _sync_client = redis.Redis.from_url(settings.redis_url)
+    return _sync_client
+
+async def _get_async_client():
+    """Asyncio client on a shared per-worker connection pool"""
+    if redis_available is None or (redis_available and _async_client is None):
+        # Concurrent first callers would each build a pool and leak all but one
+        async with _async_client_lock:
+            await _connect_async()
+    return _async_client if redis_available else _memory_cache
+
+async def _connect_async():
+    global _async_client, redis_available
+    if not (redis_available is None or (redis_available and _async_client is None)):
+        return
+    try:
+        if redis is None:
+            raise ImportError("redis package not installed")
+        pool = redis.asyncio.ConnectionPool.from_url(
+            settings.redis_url,
+            max_connections=settings.redis_max_connections,
+            socket_connect_timeout=settings.redis_connect_timeout
+        )
+        client = redis.asyncio.Redis(connection_pool=pool)
+        if redis_available is None:
+            await client.ping()
+            redis_available = True
+            logger.info("Redis connection established")
+        _async_client = client
+    except Exception as e:
+        _use_memory_cache(e)
+
+async def get_async_redis():
+    """Shared asyncio Redis client, or None while using the in-memory cache"""
+    client = await _get_async_client()
+    return client if redis_available else None
+
+def get_redis():
+    """Blocking Redis client, or None while using the in-memory cache"""
+    client = _get_client()
+    return client if redis_available else None
+
+async def close_cache():
+    """Release the asyncio connection pool (call on shutdown)"""
+    global _async_client
+    if _async_client is not None:
+        client, _async_client = _async_client, None
+        await client.aclose(close_connection_pool=True)
+
+# L1: small per-worker cache in front of Redis (L2). It is only consulted
+# while this worker is subscribed to invalidations, so a write on any
+# worker evicts the key everywhere.
+l1_cache = MemoryCache(max_entries=settings.l1_cache_max_entries)
+INVALIDATION_CHANNEL = "cache:invalidate"
+_worker_id = uuid.uuid4().hex
+_listener: Optional[asyncio.Task] = None
+
+# Lookup counters for metrics: L1 hit, L2 (Redis or fallback) hit, miss
+_lookups = {"l1_hits": 0, "l2_hits": 0, "misses": 0, "errors": 0}
+
+def cache_stats() -> Dict[str, Any]:
+    """Lookup counters, hit ratio and the in-process caches' own stats"""
+    lookups = _lookups["l1_hits"] + _lookups["l2_hits"] + _lookups["misses"]
+    return {
+        **_lookups,
+        "hit_ratio": (_lookups["l1_hits"] + _lookups["l2_hits"]) / lookups if lookups else 0.0,
+        "backend": {True: "redis", False: "memory"}.get(redis_available, "unknown"),
+        "l1": l1_cache.stats(),
+        "fallback": _memory_cache.stats() if _memory_cache is not None else None,
+    }
+
+def _l1_active() -> bool:
+    return _listener is not None
+
+async def _listen_for_invalidations(pubsub):
+    global _listener
+    try:
+        async for message in pubsub.listen():
+            if message["type"] != "message":
+                continue
+            sender, _, payload = message["data"].decode().partition("|")
+            if sender != _worker_id:
+                l1_cache.delete(*payload.split("\n"))
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        # Lost the subscription: L1 can no longer be trusted
+        logger.warning(f"Cache invalidation listener failed: {e}. Disabling L1 cache.")
+    finally:
+        _listener = None
+        l1_cache.flushall()
+        await pubsub.aclose()
+
+async def start_invalidation_listener():
+    """Subscribe this worker to cache invalidations and enable the L1 tier"""
+    global _listener
+    client = await _get_async_client()
+    if not redis_available or _listener is not None:
+        return
+    try:
+        pubsub = client.pubsub()
+        await pubsub.subscribe(INVALIDATION_CHANNEL)
+        _listener = asyncio.create_task(_listen_for_invalidations(pubsub))
+    except Exception as e:
+        logger.warning(f"Cache invalidation listener not started: {e}. L1 cache disabled.")
+
+async def stop_invalidation_listener():
+    """Unsubscribe and drop everything held in L1"""
+    if _listener is None:
+        return
+    task = _listener
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+def _invalidation_message(keys: Iterable[str]) -> str:
+    return f"{_worker_id}|" + "\n".join(keys)
 
 def cache_key(prefix: str, identifier: str) -> str:
     """Generate a cache key"""
     return f"{prefix}:{identifier}"
 
+def _encode(value: Any) -> bytes:
+    return encode_value(value)
+
+def _decode(data: Optional[bytes]) -> Optional[Any]:
+    return decode_value(data) if data else None
+
+# Blocking API, for code that cannot await (ORM event hooks, scripts)
+
 def get_cached(key: str) -> Optional[Any]:
-    """Get value from cache"""
+    """Get value from cache (L1, then L2)"""
     try:
-        data = redis_client.get(key)
-        return json.loads(data) if data else None
+        data = l1_cache.get(key) if _l1_active() else None
+        if data is not None:
+            _lookups["l1_hits"] += 1
+        else:
+            data = _get_client().get(key)
+            _lookups["l2_hits" if data else "misses"] += 1
+            if data and _l1_active():
+                l1_cache.setex(key, settings.l1_cache_ttl, data)
+        return _decode(data)
     except Exception as e:
+        _lookups["errors"] += 1
         logger.error(f"Cache get error: {e}")
         return None
 
 def set_cached(key: str, value: Any, expire: int = 3600):
     """Set value in cache with expiration"""
     try:
-        redis_client.setex(key, expire, json.dumps(value, default=str))
+        data = _encode(value)
+        client = _get_client()
+        client.setex(key, expire, data)
+        if _l1_active():
+            l1_cache.setex(key, min(expire, settings.l1_cache_ttl), data)
+            client.publish(INVALIDATION_CHANNEL, _invalidation_message([key]))
     except Exception as e:
         logger.error(f"Cache set error: {e}")
 
 def delete_cached(key: str):
     """Delete value from cache"""
     try:
-        redis_client.delete(key)
+        client = _get_client()
+        client.delete(key)
+        if _l1_active():
+            l1_cache.delete(key)
+            client.publish(INVALIDATION_CHANNEL, _invalidation_message([key]))
+    except Exception as e:
+        logger.error(f"Cache delete error: {e}")
+
+# Asyncio API, for handlers and services
+
+async def get_cached_async(key: str) -> Optional[Any]:
+    """Get value from cache (L1, then L2) without blocking the event loop"""
+    return (await get_many([key]))[key]
+
+async def set_cached_async(key: str, value: Any, expire: int = 3600):
+    """Set value in cache with expiration without blocking the event loop"""
+    await set_many({key: value}, expire=expire)
+
+async def delete_cached_async(key: str):
+    """Delete value from cache without blocking the event loop"""
+    await delete_many([key])
+
+async def get_many(keys: List[str]) -> Dict[str, Optional[Any]]:
+    """Get several values in one round trip (L1 first, then one MGET)"""
+    results: Dict[str, Optional[Any]] = {}
+    try:
+        missing = []
+        for key in keys:
+            data = l1_cache.get(key) if _l1_active() else None
+            if data is None:
+                missing.append(key)
+            else:
+                results[key] = _decode(data)
+        _lookups["l1_hits"] += len(keys) - len(missing)
+        if missing:
+            client = await _get_async_client()
+            values = client.mget(missing)
+            if redis_available:
+                values = await values
+            for key, data in zip(missing, values):
+                _lookups["l2_hits" if data else "misses"] += 1
+                if data and _l1_active():
+                    l1_cache.setex(key, settings.l1_cache_ttl, data)
+                results[key] = _decode(data)
+    except Exception as e:
+        _lookups["errors"] += 1
+        logger.error(f"Cache get error: {e}")
+    return {key: results.get(key) for key in keys}
+
+async def set_many(items: Dict[str, Any], expire: int = 3600):
+    """Set several values with one pipelined round trip"""
+    if not items:
+        return
+    try:
+        encoded = {key: _encode(value) for key, value in items.items()}
+        client = await _get_async_client()
+        if redis_available:
+            async with client.pipeline(transaction=False) as pipe:
+                for key, data in encoded.items():
+                    pipe.setex(key, expire, data)
+                if _l1_active():
+                    pipe.publish(INVALIDATION_CHANNEL, _invalidation_message(encoded))
+                await pipe.execute()
+        else:
+            for key, data in encoded.items():
+                client.setex(key, expire, data)
+        if _l1_active():
+            for key, data in encoded.items():
+                l1_cache.setex(key, min(expire, settings.l1_cache_ttl), data)
+    except Exception as e:
+        logger.error(f"Cache set error: {e}")
+
+async def delete_many(keys: List[str]):
+    """Delete several values with one pipelined round trip"""
+    if not keys:
+        return
+    try:
+        client = await _get_async_client()
+        if redis_available:
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.delete(*keys)
+                if _l1_active():
+                    pipe.publish(INVALIDATION_CHANNEL, _invalidation_message(keys))
+                await pipe.execute()
+        else:
+            client.delete(*keys)
+        if _l1_active():
+            l1_cache.delete(*keys)
+    except Exception as e:
+        logger.error(f"Cache delete error: {e}")
+
+# Caching decorator with single-flight recompute and early refresh.
+# Entries are stored as {"v": value, "d": recompute seconds, "e": expiry
+# epoch}; a reader refreshes early with probability rising towards expiry
+# ("XFetch"), so hot keys are recomputed before they vanish.
+_inflight: Dict[str, asyncio.Future] = {}
+_LOCK_WAIT_STEP = 0.05
+
+def _key_part(value: Any) -> Optional[str]:
+    if isinstance(value, (AsyncSession, Session)):
+        return None
+    if hasattr(value, "__table__") and hasattr(value, "id"):
+        return f"{value.__tablename__}:{value.id}"
+    return repr(value)
+
+def _default_key(*args, **kwargs) -> str:
+    parts = [_key_part(arg) for arg in args]
+    parts += [f"{name}={_key_part(value)}" for name, value in sorted(kwargs.items())]
+    raw = "|".join(part for part in parts if part is not None)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+def _should_refresh(entry: Dict[str, Any], beta: float) -> bool:
+    jitter = -math.log(1.0 - random.random())
+    return time.time() + entry.get("d", 0) * beta * jitter >= entry.get("e", 0)
+
+async def _acquire_recompute_lock(lock_key: str, token: str, ttl: int) -> bool:
+    """Cross-worker lock so only one process recomputes an expired key"""
+    try:
+        client = await get_async_redis()
+        if client is None:
+            return True
+        return bool(await client.set(lock_key, token, ex=ttl, nx=True))
     except Exception as e:
-        logger.error(f"Cache delete error: {e}")
\ No newline at end of file
+        logger.error(f"Cache lock error: {e}")
+        return True
+
+async def _release_recompute_lock(lock_key: str, token: str):
+    try:
+        client = await get_async_redis()
+        if client is not None and await client.get(lock_key) == token.encode():
+            await client.delete(lock_key)
+    except Exception as e:
+        logger.error(f"Cache unlock error: {e}")
+
+async def _recompute(key: str, func: Callable, args, kwargs, ttl: int, stale: Optional[Dict[str, Any]]):
+    lock_key = f"{key}:lock"
+    token = uuid.uuid4().hex
+    lock_ttl = max(1, settings.cache_recompute_lock_timeout)
+    if not await _acquire_recompute_lock(lock_key, token, lock_ttl):
+        # Another worker is recomputing: serve the current value if there is
+        # one, otherwise wait for the new value up to the lock timeout
+        if stale is not None:
+            return stale["v"]
+        deadline = time.monotonic() + lock_ttl
+        while time.monotonic() < deadline:
+            await asyncio.sleep(_LOCK_WAIT_STEP)
+            entry = await get_cached_async(key)
+            if entry is not None:
+                return entry["v"]
+        token = None
+    try:
+        started = time.monotonic()
+        value = jsonable_encoder(await func(*args, **kwargs))
+        delta = time.monotonic() - started
+        await set_cached_async(key, {"v": value, "d": delta, "e": time.time() + ttl}, expire=ttl)
+        return value
+    finally:
+        if token:
+            await _release_recompute_lock(lock_key, token)
+
+def cached(prefix: str, ttl: Optional[int] = None, beta: float = 1.0, key_builder: Optional[Callable[..., str]] = None):
+    """Cache an async function's result under `prefix`.
+
+    Concurrent misses for the same key share one in-flight call per worker,
+    and a Redis lock keeps other workers from recomputing at the same time.
+    Results are returned JSON-encoded (dicts instead of Pydantic models), on
+    hits and misses alike. Session arguments are left out of the key; ORM
+    objects are keyed by table and id. Pass `key_builder` to override.
+    """
+    expire = ttl or settings.redis_cache_ttl
+    build_key = key_builder or _default_key
+
+    def decorator(func: Callable):
+        if not asyncio.iscoroutinefunction(func):
+            raise TypeError("@cached only supports async functions")
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = cache_key(prefix, build_key(*args, **kwargs))
+            entry = await get_cached_async(key)
+            if entry is not None and not _should_refresh(entry, beta):
+                return entry["v"]
+
+            flight = _inflight.get(key)
+            if flight is None:
+                flight = asyncio.ensure_future(_recompute(key, func, args, kwargs, expire, entry))
+                _inflight[key] = flight
+                flight.add_done_callback(lambda _: _inflight.pop(key, None))
+            return await asyncio.shield(flight)
+
+        return wrapper
+    return decorator
@@ -0,0 +1,112 @@
+"""
+Value codecs for app.utils.cache.
+
+Cached values are stored as a 2-byte header followed by the payload:
+
+    byte 0  format version (FORMAT_VERSION)
+    byte 1  codec id (low 7 bits) | COMPRESSED flag (high bit)
+
+Payloads larger than settings.cache_compress_threshold are zlib-compressed
+when that actually saves space. Values without a header are legacy JSON
+text written before codecs existed, and still decode.
+"""
+import json
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Union
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+FORMAT_VERSION = 1
+COMPRESSED = 0x80
+
+class Codec(ABC):
+    """Serializer plugged into the cache; `codec_id` must stay stable"""
+    codec_id: int
+    name: str
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        """Encode a value as the payload bytes"""
+
+    @abstractmethod
+    def loads(self, payload: bytes) -> Any:
+        """Decode a payload written by dumps"""
+
+class JSONCodec(Codec):
+    codec_id = 0
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, default=str, separators=(",", ":")).encode()
+
+    def loads(self, payload: bytes) -> Any:
+        return json.loads(payload)
+
+class MsgpackCodec(Codec):
+    codec_id = 1
+    name = "msgpack"
+
+    def dumps(self, value: Any) -> bytes:
+        # default=str matches the JSON path for UUIDs, datetimes, ...
+        return msgpack.packb(value, default=str, use_bin_type=True)
+
+    def loads(self, payload: bytes) -> Any:
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+_codecs_by_id: Dict[int, Codec] = {}
+_codecs_by_name: Dict[str, Codec] = {}
+
+def register_codec(codec: Codec):
+    """Make a codec available for encoding (by name) and decoding (by id)"""
+    if not 0 <= codec.codec_id < COMPRESSED:
+        raise ValueError(f"codec_id must be in [0, {COMPRESSED})")
+    _codecs_by_id[codec.codec_id] = codec
+    _codecs_by_name[codec.name] = codec
+
+register_codec(JSONCodec())
+if msgpack is not None:
+    register_codec(MsgpackCodec())
+
+def get_codec(name: str) -> Codec:
+    codec = _codecs_by_name.get(name)
+    if codec is None:
+        logger.warning(f"Cache codec '{name}' not available. Using json.")
+        codec = _codecs_by_name["json"]
+    return codec
+
+def encode_value(value: Any, codec: Codec = None) -> bytes:
+    """Serialize a value for the cache, compressing large payloads"""
+    codec = codec or get_codec(settings.cache_codec)
+    payload = codec.dumps(value)
+    flags = codec.codec_id
+    threshold = settings.cache_compress_threshold
+    if threshold and len(payload) > threshold:
+        compressed = zlib.compress(payload, settings.cache_compress_level)
+        if len(compressed) < len(payload):
+            payload = compressed
+            flags |= COMPRESSED
+    return bytes((FORMAT_VERSION, flags)) + payload
+
+def decode_value(data: Union[bytes, str]) -> Any:
+    """Inverse of encode_value; also reads legacy header-less JSON"""
+    if isinstance(data, str) or data[0] >= 0x20:
+        # json.dumps output always starts with a printable character
+        return json.loads(data)
+    if data[0] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported cache format version {data[0]}")
+    flags = data[1]
+    codec = _codecs_by_id.get(flags & ~COMPRESSED)
+    if codec is None:
+        raise ValueError(f"Unknown cache codec id {flags & ~COMPRESSED}")
+    payload = data[2:]
+    if flags & COMPRESSED:
+        payload = zlib.decompress(payload)
+    return codec.loads(payload)
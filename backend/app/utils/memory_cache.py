@@ -0,0 +1,169 @@
+"""
+Bounded in-process cache used when Redis is unreachable.
+
+Mirrors the subset of the redis-py client that app.utils.cache relies on
+(get/mget/set/setex/delete/exists) with per-key TTL and an LRU bound on entry
+count and approximate byte size. Expired keys are dropped lazily on access
+and by a periodic sweep driven from normal operations, so no background
+thread is needed.
+"""
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Union
+
+Value = Union[str, bytes]
+
+class MemoryCache:
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 0,
+        sweep_interval: float = 1.0,
+        sweep_batch: int = 1000
+    ):
+        """
+        max_entries / max_bytes: LRU bounds (0 disables the byte bound).
+        sweep_interval: seconds between periodic expiry sweeps.
+        sweep_batch: max expired keys removed per sweep, to bound lock time.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self.sweep_batch = sweep_batch
+        # key -> (value, expires_at or None, size); order is LRU -> MRU
+        self._store: "OrderedDict[str, tuple]" = OrderedDict()
+        # (expires_at, key) min-heap; stale entries are skipped on pop
+        self._expiry_heap = []
+        self._bytes = 0
+        self._next_sweep = time.monotonic() + sweep_interval
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _size(key: str, value: Value) -> int:
+        return len(key) + len(value)
+
+    def _remove(self, key: str):
+        value, expires_at, size = self._store.pop(key)
+        self._bytes -= size
+
+    def _is_expired(self, expires_at: Optional[float], now: float) -> bool:
+        return expires_at is not None and expires_at <= now
+
+    def _sweep(self, now: float):
+        """Drop up to sweep_batch expired keys in expiry order"""
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now and removed < self.sweep_batch:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._store.get(key)
+            if entry is not None and entry[1] == expires_at:
+                self._remove(key)
+                self.expirations += 1
+                removed += 1
+        # Keys overwritten or deleted leave stale heap entries behind
+        if len(heap) > 2 * len(self._store) + 64:
+            self._expiry_heap = [
+                (entry[1], key) for key, entry in self._store.items() if entry[1] is not None
+            ]
+            heapq.heapify(self._expiry_heap)
+        self._next_sweep = now + self.sweep_interval
+
+    def _maybe_sweep(self, now: float):
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+    def _evict(self):
+        """Evict least recently used keys until within bounds"""
+        while self._store and (
+            len(self._store) > self.max_entries
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            key = next(iter(self._store))
+            self._remove(key)
+            self.evictions += 1
+
+    def get(self, key: str) -> Optional[Value]:
+        now = time.monotonic()
+        with self._lock:
+            self._maybe_sweep(now)
+            entry = self._store.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if self._is_expired(entry[1], now):
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._store.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: Value, ex: Optional[int] = None):
+        now = time.monotonic()
+        expires_at = now + ex if ex else None
+        size = self._size(key, value)
+        with self._lock:
+            self._maybe_sweep(now)
+            if key in self._store:
+                self._remove(key)
+            self._store[key] = (value, expires_at, size)
+            self._bytes += size
+            if expires_at is not None:
+                heapq.heappush(self._expiry_heap, (expires_at, key))
+            self._evict()
+        return True
+
+    def setex(self, key: str, seconds: int, value: Value):
+        return self.set(key, value, ex=seconds)
+
+    def mget(self, keys) -> List[Optional[Value]]:
+        return [self.get(key) for key in keys]
+
+    def delete(self, *keys: str) -> int:
+        removed = 0
+        with self._lock:
+            for key in keys:
+                if key in self._store:
+                    self._remove(key)
+                    removed += 1
+        return removed
+
+    def exists(self, key: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None:
+                return False
+            if self._is_expired(entry[1], now):
+                self._remove(key)
+                self.expirations += 1
+                return False
+            return True
+
+    def flushall(self):
+        with self._lock:
+            self._store.clear()
+            self._expiry_heap = []
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._store),
+                "bytes": self._bytes,
+            }
@@ -0,0 +1,263 @@
+"""
+Request, database and cache metrics in Prometheus text format.
+
+A deliberately small registry: counters, gauges and fixed-bucket
+histograms keyed by label tuples, updated from the event loop without locks
+and rendered on demand by `/metrics`. Values are per worker process; run one
+scrape target per worker (or label them by instance) when using several.
+
+- MetricsMiddleware: per-route latency histogram keyed by the route
+  template (e.g. /api/v1/jobs/{job_id}/stats), request counter by status,
+  in-flight gauge, and DB queries/time spent per request.
+- SQLAlchemy cursor events on every Engine feed query count and latency;
+  a contextvar set by the middleware attributes them to the request.
+- Collectors registered with `register_collector` are called at scrape
+  time for values owned elsewhere (cache stats, pool checkouts, ...).
+"""
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.database import async_engine
+from app.core.replicas import replicas
+from app.utils.cache import cache_stats
+
+# Starlette appends "; charset=utf-8" to text/* media types
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+Labels = Tuple[str, ...]
+# (name, labels, value) of one exposition line
+Sample = Tuple[str, Dict[str, str], float]
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _line(name: str, labels: Dict[str, str], value: float) -> str:
+    if labels:
+        rendered = ",".join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+        return f"{name}{{{rendered}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+class Metric(ABC):
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        _metrics.append(self)
+
+    @abstractmethod
+    def samples(self) -> Iterable[Sample]:
+        """One Sample per exposition line"""
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in list(self._values.items()):
+            yield self.name, dict(zip(self.labelnames, labels)), value
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, labels: Labels = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+    def set(self, labels: Labels = (), value: float = 0):
+        self._values[labels] = value
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last is +Inf), sum, count]
+        self._values: Dict[Labels, list] = {}
+
+    def observe(self, labels: Labels, value: float):
+        series = self._values.get(labels)
+        if series is None:
+            series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, (counts, total, count) in list(self._values.items()):
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", {**base, "le": _format_value(float(bound))}, cumulative
+            yield f"{self.name}_sum", base, total
+            yield f"{self.name}_count", base, count
+
+_metrics: List[Metric] = []
+# Collectors return (name, type, help, samples) tuples
+Collected = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+_collectors: List[Callable[[], Iterable[Collected]]] = []
+
+def register_collector(collector: Callable[[], Iterable[Collected]]):
+    """Call `collector` at every scrape for values owned by another module"""
+    _collectors.append(collector)
+    return collector
+
+def render() -> str:
+    """All metrics in Prometheus text exposition format"""
+    lines = []
+    for metric in _metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        lines.extend(_line(name, labels, value) for name, labels, value in metric.samples())
+    for collector in _collectors:
+        try:
+            collected = list(collector())
+        except Exception as e:
+            lines.append(f"# collector {collector.__name__} failed: {_escape(e)}")
+            continue
+        for name, type_, help, samples in collected:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {type_}")
+            lines.extend(_line(name, labels, value) for labels, value in samples)
+    return "\n".join(lines) + "\n"
+
+# HTTP
+REQUESTS = Counter("http_requests_total", "HTTP requests by route template and status", ("method", "route", "status"))
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "Time to send the full response", ("method", "route"))
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests being processed")
+IN_FLIGHT.set((), 0)
+
+# Database
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed")
+DB_QUERY_LATENCY = Histogram("db_query_duration_seconds", "Time per SQL statement", buckets=QUERY_BUCKETS)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "http_request_db_queries", "SQL statements executed per request", ("method", "route"), buckets=COUNT_BUCKETS
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "http_request_db_seconds", "Time in SQL statements per request", ("method", "route"), buckets=LATENCY_BUCKETS
+)
+
+# [queries, seconds] of the request being served
+_request_db: ContextVar[Optional[list]] = ContextVar("request_db", default=None)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _query_started(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _query_finished(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_metrics_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    DB_QUERIES.inc()
+    DB_QUERY_LATENCY.observe((), elapsed)
+    # SQLAlchemy runs async-engine statements in greenlets that share the
+    # request task's context, so this reaches the middleware's accumulator
+    request_db = _request_db.get()
+    if request_db is not None:
+        request_db[0] += 1
+        request_db[1] += elapsed
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route request metrics"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        request_db = [0, 0.0]
+        token = _request_db.set(request_db)
+        IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec()
+            _request_db.reset(token)
+            # Route template, set by the router; unmatched paths share one
+            # series so scanners cannot blow up label cardinality
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            labels = (scope["method"], route)
+            REQUESTS.inc((scope["method"], route, str(status[0])))
+            REQUEST_LATENCY.observe(labels, elapsed)
+            DB_QUERIES_PER_REQUEST.observe(labels, request_db[0])
+            DB_TIME_PER_REQUEST.observe(labels, request_db[1])
+
+
+@register_collector
+def _cache_metrics() -> Iterable[Collected]:
+    stats = cache_stats()
+    yield "cache_lookups_total", "counter", "Cache lookups by result (L1 hit, L2 hit, miss, error)", [
+        ({"result": result}, stats[key])
+        for result, key in (("l1_hit", "l1_hits"), ("l2_hit", "l2_hits"), ("miss", "misses"), ("error", "errors"))
+    ]
+    yield "cache_hit_ratio", "gauge", "Share of cache lookups served from L1 or L2", [({}, stats["hit_ratio"])]
+    yield "cache_redis_up", "gauge", "1 while Redis backs the cache, 0 on the in-memory fallback", [
+        ({}, 1 if stats["backend"] == "redis" else 0)
+    ]
+    caches = [("l1", stats["l1"])] + ([("fallback", stats["fallback"])] if stats["fallback"] else [])
+    for name, type_, help in (
+        ("entries", "gauge", "Entries held by an in-process cache"),
+        ("bytes", "gauge", "Approximate bytes held by an in-process cache"),
+        ("evictions", "counter", "LRU evictions from an in-process cache"),
+    ):
+        yield f"memory_cache_{name}", type_, help, [({"cache": cache}, values[name]) for cache, values in caches]
+
+@register_collector
+def _pool_metrics() -> Iterable[Collected]:
+    pool = async_engine.pool
+    if not hasattr(pool, "checkedout"):
+        # StaticPool (SQLite) has a single shared connection
+        return
+    yield "db_pool_size", "gauge", "Configured connection pool size", [({}, pool.size())]
+    yield "db_pool_checked_out", "gauge", "Connections in use", [({}, pool.checkedout())]
+    yield "db_pool_checked_in", "gauge", "Idle connections in the pool", [({}, pool.checkedin())]
+    yield "db_pool_overflow", "gauge", "Connections open beyond pool_size", [({}, pool.overflow())]
+
+@register_collector
+def _replica_metrics() -> Iterable[Collected]:
+    stats = replicas.stats()
+    if not stats:
+        return
+    yield "db_replica_up", "gauge", "1 while a read replica is in rotation", [
+        ({"replica": r["replica"]}, 1 if r["healthy"] else 0) for r in stats
+    ]
+    yield "db_replica_lag_seconds", "gauge", "Replay lag at the last check", [
+        ({"replica": r["replica"]}, r["lag"]) for r in stats if r["lag"] is not None
+    ]
@@ -0,0 +1,73 @@
+"""
+Pure ASGI middleware for response headers and request logging.
+
+`@app.middleware("http")` functions run through BaseHTTPMiddleware, which
+starts a task per request and pipes the response body through a memory
+stream. These wrap `send` instead: headers are added to the
+`http.response.start` message and timing happens around the inner call,
+so streamed responses (NDJSON exports) pass through untouched.
+"""
+import time
+from typing import Iterable, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+Header = Tuple[bytes, bytes]
+
+SECURITY_HEADERS: List[Header] = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+]
+
+class SecurityHeadersMiddleware:
+    """Sets fixed headers on every HTTP response, replacing any the app set"""
+
+    def __init__(self, app, headers: Iterable[Header] = SECURITY_HEADERS):
+        self.app = app
+        self.headers = list(headers)
+        self.names = {name for name, _ in self.headers}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = [header for header in message.get("headers", []) if header[0].lower() not in self.names]
+                message["headers"] = headers + self.headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+class RequestLoggingMiddleware:
+    """Logs method, path, status and time until the response is fully sent"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            process_time = time.perf_counter() - start_time
+            logger.info(
+                f"{scope['method']} {scope['path']} "
+                f"completed in {process_time:.3f}s "
+                f"with status {status[0]}"
+            )
@@ -0,0 +1,253 @@
+"""
+Request rate limiting keyed by user, organization or client IP.
+
+Each limit is a GCRA token bucket (one "theoretical arrival time" per key),
+so a check is a single GET/SET per window. With Redis all windows of a
+request are checked and updated atomically by one Lua script, i.e. one
+round trip; while Redis is unreachable the same algorithm runs in-process
+per worker (limits then apply per worker instead of cluster-wide).
+
+The default limits come from settings.rate_limit_per_minute/_per_hour and
+apply to every API route via `enforce_rate_limit`; decorate an endpoint with
+`rate_limit(...)` to give it its own limits and bucket.
+"""
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+from fastapi import Request
+from app.core.config import settings
+from app.core.security import decode_access_token
+from app.utils.cache import get_async_redis
+import logging
+
+logger = logging.getLogger(__name__)
+
+SCOPES = ("user", "organization", "ip")
+
+# KEYS: one bucket per window. ARGV: (period_ms, interval_ms) per window.
+# Returns {allowed, retry_after_ms, remaining_1, reset_ms_1, ...}; nothing is
+# written unless every window admits the request.
+_GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local tats = {}
+local retry = 0
+for i = 1, #KEYS do
+  local period = tonumber(ARGV[2 * i - 1])
+  local interval = tonumber(ARGV[2 * i])
+  local tat = math.max(tonumber(redis.call('GET', KEYS[i]) or now), now)
+  tats[i] = tat
+  local allow_at = tat + interval - period
+  if allow_at > now then
+    retry = math.max(retry, allow_at - now)
+  end
+end
+local result = {retry == 0 and 1 or 0, retry}
+for i = 1, #KEYS do
+  local period = tonumber(ARGV[2 * i - 1])
+  local interval = tonumber(ARGV[2 * i])
+  local tat = tats[i]
+  if retry == 0 then
+    tat = tat + interval
+    redis.call('SET', KEYS[i], tat, 'PX', tat - now)
+  end
+  table.insert(result, math.max(math.floor((now + period - tat) / interval), 0))
+  table.insert(result, tat - now)
+end
+return result
+"""
+
+class RateLimitExceeded(Exception):
+    def __init__(self, result: "RateLimitResult"):
+        super().__init__("Rate limit exceeded")
+        self.result = result
+
+class RateLimitResult:
+    __slots__ = ("allowed", "limit", "remaining", "reset", "retry_after")
+
+    def __init__(self, allowed: bool, limit: int, remaining: int, reset: float, retry_after: float):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = remaining
+        self.reset = reset
+        self.retry_after = retry_after
+
+    def headers(self) -> List[Tuple[bytes, bytes]]:
+        """X-RateLimit-* headers of the window closest to its limit"""
+        return [
+            (b"x-ratelimit-limit", str(self.limit).encode()),
+            (b"x-ratelimit-remaining", str(self.remaining).encode()),
+            (b"x-ratelimit-reset", str(math.ceil(self.reset)).encode()),
+        ]
+
+def _result(windows: List[Tuple[int, int]], allowed: bool, retry_ms: float, states: List[Tuple[int, float]]) -> RateLimitResult:
+    # Report the window with the fewest requests left
+    index = min(range(len(states)), key=lambda i: states[i][0])
+    remaining, reset_ms = states[index]
+    return RateLimitResult(allowed, windows[index][0], remaining, reset_ms / 1000, retry_ms / 1000)
+
+class LocalLimiter:
+    """In-process GCRA buckets, bounded LRU; an evicted key simply starts full"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+
+    def check(self, keys: List[str], windows: List[Tuple[int, int]]) -> RateLimitResult:
+        now = time.monotonic() * 1000
+        tats = []
+        retry = 0.0
+        for key, (limit, period) in zip(keys, windows):
+            period_ms = period * 1000
+            interval = period_ms / limit
+            tat = max(self._tats.get(key, now), now)
+            tats.append(tat)
+            allow_at = tat + interval - period_ms
+            if allow_at > now:
+                retry = max(retry, allow_at - now)
+
+        states = []
+        for key, (limit, period), tat in zip(keys, windows, tats):
+            period_ms = period * 1000
+            interval = period_ms / limit
+            if not retry:
+                tat += interval
+                self._tats[key] = tat
+                self._tats.move_to_end(key)
+            states.append((max(math.floor((now + period_ms - tat) / interval), 0), tat - now))
+        while len(self._tats) > self.max_keys:
+            self._tats.popitem(last=False)
+        return _result(windows, not retry, retry, states)
+
+class RedisLimiter:
+    def __init__(self, client):
+        self.client = client
+        self._script = client.register_script(_GCRA_SCRIPT)
+
+    async def check(self, keys: List[str], windows: List[Tuple[int, int]]) -> RateLimitResult:
+        args = []
+        for limit, period in windows:
+            period_ms = period * 1000
+            args += [period_ms, max(period_ms // limit, 1)]
+        reply = await self._script(keys=keys, args=args)
+        allowed, retry_ms = int(reply[0]), int(reply[1])
+        states = [(int(reply[i]), int(reply[i + 1])) for i in range(2, len(reply), 2)]
+        return _result(windows, bool(allowed), retry_ms, states)
+
+class RateLimit:
+    """
+    Limits for one bucket namespace. per_minute/per_hour of 0 disable that
+    window; scope picks the identity the bucket is keyed by.
+    """
+
+    def __init__(self, name: str, per_minute: int = 0, per_hour: int = 0, scope: str = "user"):
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown rate limit scope {scope!r}; expected one of {SCOPES}")
+        self.name = name
+        self.scope = scope
+        self.windows = [(limit, period) for limit, period in ((per_minute, 60), (per_hour, 3600)) if limit > 0]
+
+    def keys(self, identity: str) -> List[str]:
+        return [f"ratelimit:{self.name}:{identity}:{period}" for _, period in self.windows]
+
+def rate_limit(per_minute: int = 0, per_hour: int = 0, scope: Optional[str] = None) -> Callable:
+    """
+    Per-route override of the default limits, e.g.
+
+        @router.post("/login")
+        @rate_limit(per_minute=10, scope="ip")
+        async def login(...): ...
+
+    The route gets its own buckets; pass no limits to exempt it.
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint._rate_limit = RateLimit(
+            f"{endpoint.__module__}.{endpoint.__qualname__}",
+            per_minute=per_minute,
+            per_hour=per_hour,
+            scope=scope or settings.rate_limit_scope
+        )
+        return endpoint
+    return decorator
+
+_default: Optional[RateLimit] = None
+_local: Optional[LocalLimiter] = None
+_redis_limiter: Optional[RedisLimiter] = None
+_redis_failed_at: Optional[float] = None
+
+def default_rate_limit() -> RateLimit:
+    global _default
+    if _default is None:
+        _default = RateLimit(
+            "default",
+            per_minute=settings.rate_limit_per_minute,
+            per_hour=settings.rate_limit_per_hour,
+            scope=settings.rate_limit_scope
+        )
+    return _default
+
+def _identity(request: Request, scope: str) -> str:
+    if scope != "ip":
+        authorization = request.headers.get("authorization")
+        if authorization and authorization[:7].lower() == "bearer ":
+            payload = decode_access_token(authorization[7:])
+            if payload:
+                if scope == "organization" and payload.get("org"):
+                    return f"org:{payload['org']}"
+                if payload.get("sub"):
+                    return f"user:{payload['sub']}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+async def check_rate_limit(policy: RateLimit, identity: str) -> RateLimitResult:
+    """Count one request against the policy's buckets for this identity"""
+    global _local, _redis_limiter, _redis_failed_at
+    keys = policy.keys(identity)
+    # After a Redis error stay local for a few seconds instead of paying a
+    # failed round trip on every request
+    if _redis_failed_at is None or time.monotonic() - _redis_failed_at > settings.rate_limit_redis_retry:
+        client = await get_async_redis()
+        if client is not None:
+            if _redis_limiter is None or _redis_limiter.client is not client:
+                _redis_limiter = RedisLimiter(client)
+            try:
+                return await _redis_limiter.check(keys, policy.windows)
+            except Exception as e:
+                _redis_failed_at = time.monotonic()
+                logger.warning(f"Rate limiter falling back to in-process buckets: {e}")
+    if _local is None:
+        _local = LocalLimiter(settings.rate_limit_local_max_keys)
+    return _local.check(keys, policy.windows)
+
+async def enforce_rate_limit(request: Request):
+    """Router dependency: apply the route's limits or the default ones"""
+    if not settings.rate_limit_enabled:
+        return
+    route = request.scope.get("route")
+    policy = getattr(getattr(route, "endpoint", None), "_rate_limit", None) or default_rate_limit()
+    if not policy.windows:
+        return
+    result = await check_rate_limit(policy, _identity(request, policy.scope))
+    request.state.rate_limit = result
+    if not result.allowed:
+        raise RateLimitExceeded(result)
+
+class RateLimitHeadersMiddleware:
+    """Adds X-RateLimit-* headers to responses of rate-limited requests"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                result = scope.get("state", {}).get("rate_limit")
+                if result is not None:
+                    message["headers"] = list(message.get("headers", [])) + result.headers()
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,74 @@
+"""
+Resume text extraction for PDF, DOCX and plain-text files.
+
+Kept free of app imports so it is cheap to load in the ingestion process
+pool (app.services.resume_ingestion), where `parse_resume` runs.
+"""
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt"}
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+_LINKEDIN = re.compile(r"(?:https?://)?(?:[\w]+\.)?linkedin\.com/in/[\w%-]+/?", re.IGNORECASE)
+_EXPERIENCE = re.compile(r"(\d{1,2})\+?\s*(?:years?|yrs?)(?:\s+of)?\s+(?:\w+\s+)?experience", re.IGNORECASE)
+_SKILLS_HEADING = re.compile(r"^\s*(?:technical\s+)?skills\s*:?\s*(.*)$", re.IGNORECASE)
+
+def is_supported(filename: str) -> bool:
+    return os.path.splitext(filename)[1].lower() in SUPPORTED_EXTENSIONS
+
+def extract_text(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".pdf":
+        from PyPDF2 import PdfReader
+        reader = PdfReader(path)
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+    if extension == ".docx":
+        from docx import Document
+        document = Document(path)
+        lines = [paragraph.text for paragraph in document.paragraphs]
+        for table in document.tables:
+            for row in table.rows:
+                lines.append(" | ".join(cell.text for cell in row.cells))
+        return "\n".join(lines)
+    if extension == ".txt":
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return f.read()
+    raise ValueError(f"Unsupported file type: {extension or 'none'}")
+
+def _guess_name(lines: List[str]) -> Optional[str]:
+    # The first short line without contact details is usually the name
+    for line in lines[:5]:
+        if 1 < len(line.split()) <= 4 and not any(ch.isdigit() for ch in line) and "@" not in line:
+            return line
+    return None
+
+def _skills(lines: List[str]) -> List[str]:
+    for position, line in enumerate(lines):
+        match = _SKILLS_HEADING.match(line)
+        if not match:
+            continue
+        listed = match.group(1) or (lines[position + 1] if position + 1 < len(lines) else "")
+        skills = [s.strip(" .•-") for s in re.split(r"[,;|•]", listed)]
+        return [s for s in dict.fromkeys(skills) if s and len(s) <= 50]
+    return []
+
+def parse_resume(path: str) -> Dict[str, Any]:
+    """Extract text and basic contact/skill fields from a resume file"""
+    text = extract_text(path).replace("\x00", "").strip()
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    email = _EMAIL.search(text)
+    phone = _PHONE.search(text)
+    linkedin = _LINKEDIN.search(text)
+    experience = _EXPERIENCE.search(text)
+    return {
+        "resume_text": text,
+        "email": email.group(0).lower() if email else None,
+        "name": _guess_name(lines),
+        "phone": phone.group(0).strip() if phone else None,
+        "linkedin_url": linkedin.group(0) if linkedin else None,
+        "skills": _skills(lines),
+        "experience_years": experience.group(1) if experience else None,
+    }
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""
+Benchmark: IVF candidate index build, query latency and recall
+
+Builds an index of N synthetic clustered embeddings in a temporary
+directory, then reports build/train time, ANN vs exact query latency
+(p50/p99) and recall@k of the ANN search against the exact scan.
+
+Usage (from backend directory):
+    python -m benchmarks.bench_ann_index [--n 100000] [--dim 384] [--nlist 1024] [--nprobe 16]
+"""
+import argparse
+import tempfile
+import time
+import uuid
+import numpy as np
+from app.services.ann_index import IVFIndex
+
+def percentile(samples, pct: float) -> float:
+    return float(np.percentile(np.asarray(samples), pct))
+
+def synthetic_vectors(rng, centres: np.ndarray, n: int) -> np.ndarray:
+    """Gaussian blobs around fixed centres, a rough stand-in for resumes"""
+    labels = rng.integers(0, len(centres), n)
+    return centres[labels] + 0.6 * rng.standard_normal((n, centres.shape[1])).astype(np.float32)
+
+def time_queries(index: IVFIndex, queries: np.ndarray, k: int, exact: bool):
+    samples = []
+    for query in queries:
+        started = time.perf_counter()
+        index.search(query, k, exact=exact)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+def main(n: int, dim: int, nlist: int, nprobe: int, k: int, queries: int):
+    rng = np.random.default_rng(42)
+    centres = rng.standard_normal((2000, dim)).astype(np.float32)
+    with tempfile.TemporaryDirectory() as path:
+        index = IVFIndex(path, dim=dim, nlist=nlist, nprobe=nprobe)
+        started = time.perf_counter()
+        batch = 50_000
+        for start in range(0, n, batch):
+            size = min(batch, n - start)
+            index.add([uuid.uuid4() for _ in range(size)], synthetic_vectors(rng, centres, size))
+        inserted = time.perf_counter() - started
+        started = time.perf_counter()
+        index.train()
+        trained = time.perf_counter() - started
+
+        query_vectors = synthetic_vectors(rng, centres, queries)
+        ann = time_queries(index, query_vectors, k, exact=False)
+        exact = time_queries(index, query_vectors[:min(queries, 20)], k, exact=True)
+        recall = index.recall(query_vectors[:min(queries, 50)], k)
+
+        print(f"📊 n={n} dim={dim} nlist={nlist} nprobe={nprobe} k={k}\n")
+        print(f"insert   {inserted:8.2f} s  ({n / inserted:,.0f} vectors/s)")
+        print(f"train    {trained:8.2f} s")
+        print(f"ann      p50 {percentile(ann, 50) * 1000:8.2f} ms   p99 {percentile(ann, 99) * 1000:8.2f} ms")
+        print(f"exact    p50 {percentile(exact, 50) * 1000:8.2f} ms   p99 {percentile(exact, 99) * 1000:8.2f} ms")
+        print(f"recall@{k} {recall:.3f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--nlist", type=int, default=1024)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    main(args.n, args.dim, args.nlist, args.nprobe, args.k, args.queries)
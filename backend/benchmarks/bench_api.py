@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+"""
+Benchmark: API throughput and latency with stored baselines
+
+Drives app.main.app in-process over an ASGI transport against the
+configured DATABASE_URL (SQLite or Postgres). Seeds one organization with
+jobs, candidates and applications, then runs each scenario with
+CONCURRENCY clients and reports requests/s and p50/p95/p99 latency:
+register, login, /auth/me, /health and the job, candidate and application
+lists. Seeded rows are removed afterwards.
+
+--save writes the results to a JSON baseline; --compare runs again and
+flags scenarios whose throughput fell or p95 rose by more than
+--threshold against that baseline (exit status 1 if any did). Compare runs
+made on the same machine, database and concurrency.
+
+Usage (from backend directory):
+    python -m benchmarks.bench_api [--requests 2000] [--concurrency 16] [--save baseline.json]
+    python -m benchmarks.bench_api --compare baseline.json [--threshold 0.15]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+import httpx
+from sqlalchemy import delete, insert, or_, select
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, async_engine
+from app.core.migrations import migrate_database
+from app.models import Application, Candidate, Job, Organization, PipelineStat, User
+
+PASSWORD = "BenchPassw0rd!"
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+async def run(client: httpx.AsyncClient, request: Callable[[int], Dict[str, Any]], requests: int, concurrency: int) -> Dict[str, float]:
+    """Issue `requests` calls from `concurrency` workers; request(i) gives method, url and kwargs"""
+    remaining = iter(range(requests))
+    samples: List[float] = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        for i in remaining:
+            call = request(i)
+            started = time.perf_counter()
+            response = await client.request(call.pop("method", "GET"), call.pop("url"), **call)
+            samples.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": requests / elapsed,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+    }
+
+async def seed(run_id: str, jobs: int, candidates: int, applications: int) -> Dict[str, Any]:
+    """One organization with a user, jobs, candidates and applications"""
+    now = datetime.utcnow()
+    async with AsyncSessionLocal() as db:
+        organization = Organization(name=f"bench-api-{run_id}")
+        db.add(organization)
+        await db.flush()
+        connection = await db.connection()
+        job_ids = [uuid.uuid4() for _ in range(jobs)]
+        candidate_ids = [uuid.uuid4() for _ in range(candidates)]
+        await connection.execute(insert(Job), [
+            {"id": job_id, "organization_id": organization.id, "title": f"Engineer {i}", "status": "active",
+             "created_at": now - timedelta(minutes=i)}
+            for i, job_id in enumerate(job_ids)
+        ])
+        for offset in range(0, candidates, 5000):
+            await connection.execute(insert(Candidate), [
+                {"id": candidate_ids[i], "email": f"bench-api-{run_id}-{i}@example.com", "name": f"Candidate {i}",
+                 "source": "bench", "created_at": now - timedelta(seconds=i)}
+                for i in range(offset, min(offset + 5000, candidates))
+            ])
+        for offset in range(0, applications, 5000):
+            await connection.execute(insert(Application), [
+                {"id": uuid.uuid4(), "job_id": job_ids[i % jobs], "candidate_id": candidate_ids[i % candidates],
+                 "status": "pending", "created_at": now - timedelta(seconds=i)}
+                for i in range(offset, min(offset + 5000, applications))
+            ])
+        await db.commit()
+        return {"organization_id": organization.id, "job_ids": job_ids}
+
+async def cleanup(run_id: str, seeded: Dict[str, Any]):
+    prefix = f"bench-api-{run_id}"
+    async with AsyncSessionLocal() as db:
+        organization_ids = select(Organization.id).where(Organization.name.like(f"{prefix}%"))
+        job_ids = select(Job.id).where(Job.organization_id.in_(organization_ids))
+        await db.execute(delete(PipelineStat).where(or_(
+            PipelineStat.scope_id.in_(organization_ids), PipelineStat.scope_id.in_(job_ids)
+        )))
+        await db.execute(delete(Application).where(Application.job_id.in_(job_ids)))
+        await db.execute(delete(Candidate).where(Candidate.email.like(f"{prefix}%")))
+        await db.execute(delete(Job).where(Job.organization_id.in_(organization_ids)))
+        await db.execute(delete(User).where(User.email.like(f"{prefix}%")))
+        await db.execute(delete(Organization).where(Organization.name.like(f"{prefix}%")))
+        await db.commit()
+
+async def benchmark(args) -> Dict[str, Any]:
+    # Measure the endpoints, not the per-IP auth limits or request logging;
+    # failed requests are counted in the errors column instead of logged
+    settings.rate_limit_enabled = False
+    logging.disable(logging.ERROR)
+    await migrate_database()
+    from app.main import app
+
+    run_id = uuid.uuid4().hex[:8]
+    seeded = await seed(run_id, args.jobs, args.candidates, args.applications)
+    results: Dict[str, Dict[str, float]] = {}
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+            email = f"bench-api-{run_id}-user@example.com"
+            await client.post("/api/v1/auth/register", json={"email": email, "password": PASSWORD, "full_name": "Bench"})
+            async with AsyncSessionLocal() as db:
+                user = (await db.execute(select(User).where(User.email == email))).scalar_one()
+                user.organization_id = seeded["organization_id"]
+                await db.commit()
+            token = (await client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})).json()["access_token"]
+            auth = {"Authorization": f"Bearer {token}"}
+
+            page = f"limit={args.page}"
+            scenarios: Dict[str, Callable[[int], Dict[str, Any]]] = {
+                "register": lambda i: {"method": "POST", "url": "/api/v1/auth/register", "json": {
+                    "email": f"bench-api-{run_id}-{uuid.uuid4().hex[:12]}@example.com", "password": PASSWORD,
+                    "full_name": "Bench", "organization_name": f"bench-api-{run_id}-{i}"
+                }},
+                "login": lambda i: {"method": "POST", "url": "/api/v1/auth/login", "json": {"email": email, "password": PASSWORD}},
+                "auth_me": lambda i: {"url": "/api/v1/auth/me", "headers": auth},
+                "health": lambda i: {"url": "/health"},
+                "list_jobs": lambda i: {"url": f"/api/v1/jobs?{page}", "headers": auth},
+                "list_candidates": lambda i: {"url": f"/api/v1/candidates?{page}", "headers": auth},
+                "list_applications": lambda i: {"url": f"/api/v1/applications?{page}", "headers": auth},
+            }
+            selected = args.only or list(scenarios)
+            print(f"📊 {async_engine.dialect.name}, concurrency {args.concurrency}\n")
+            print(f"{'scenario':<20} {'requests':>8} {'errors':>6} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+            for name in selected:
+                # Password hashing dominates register/login; fewer requests keep the run short
+                requests = args.auth_requests if name in ("register", "login") else args.requests
+                concurrency = args.concurrency
+                if name == "register" and async_engine.dialect.name == "sqlite":
+                    # Sessions share SQLite's single connection (StaticPool), so
+                    # concurrent write transactions would interleave
+                    concurrency = 1
+                await run(client, scenarios[name], min(requests, 50), concurrency)  # warm up
+                result = results[name] = await run(client, scenarios[name], requests, concurrency)
+                print(
+                    f"{name:<20} {result['requests']:>8} {result['errors']:>6} {result['rps']:>10,.0f} "
+                    f"{result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f}"
+                )
+    finally:
+        await cleanup(run_id, seeded)
+    return {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "database": async_engine.dialect.name,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+            "machine": platform.node(),
+        },
+        "results": results,
+    }
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """Print the change per scenario; returns the names that regressed"""
+    for key in ("database", "concurrency", "machine"):
+        if baseline["meta"].get(key) != current["meta"].get(key):
+            print(f"⚠️  baseline {key} {baseline['meta'].get(key)!r} differs from {current['meta'].get(key)!r}")
+    print(f"\n{'scenario':<20} {'req/s':>18} {'change':>8} {'p95 ms':>18} {'change':>8}")
+    regressions = []
+    for name, result in current["results"].items():
+        base: Optional[Dict[str, float]] = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<20} {'(not in baseline)':>18}")
+            continue
+        rps_change = result["rps"] / base["rps"] - 1
+        p95_change = result["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0.0
+        regressed = rps_change < -threshold or p95_change > threshold or result["errors"] > base["errors"]
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:<20} {base['rps']:>8,.0f} → {result['rps']:>7,.0f} {rps_change:>+8.0%} "
+            f"{base['p95_ms']:>8.2f} → {result['p95_ms']:>7.2f} {p95_change:>+8.0%}"
+            f"{'  ❌ regression' if regressed else ''}"
+        )
+    return regressions
+
+async def main(args):
+    current = await benchmark(args)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per scenario")
+    parser.add_argument("--auth-requests", type=int, default=200, help="requests for register and login")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--page", type=int, default=50, help="list page size")
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--candidates", type=int, default=20000)
+    parser.add_argument("--applications", type=int, default=50000)
+    parser.add_argument("--only", nargs="+", metavar="SCENARIO", help="run only these scenarios")
+    parser.add_argument("--save", metavar="PATH", help="write results to a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed relative slowdown")
+    asyncio.run(main(parser.parse_args()))
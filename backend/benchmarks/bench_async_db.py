@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""
+Benchmark: blocking Session vs AsyncSession under concurrent requests
+
+Runs CONCURRENCY coroutines that each execute one slow query, first through
+the synchronous SessionLocal (what get_db used to yield) and then through
+AsyncSessionLocal. A heartbeat task measures how long the event loop stalls,
+which is what every other request on the worker would feel.
+
+Usage (from backend directory):
+    python -m benchmarks.bench_async_db [--concurrency 50] [--delay 0.05]
+"""
+import argparse
+import asyncio
+import time
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.database import SessionLocal, AsyncSessionLocal
+
+def slow_query(delay: float):
+    """A query that keeps the database busy for roughly `delay` seconds"""
+    if settings.database_url.startswith("sqlite"):
+        # SQLite has no sleep(); count through a recursive CTE instead
+        rows = int(delay * 4_000_000)
+        return text(
+            "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c "
+            f"WHERE x < {rows}) SELECT count(*) FROM c"
+        )
+    return text(f"SELECT pg_sleep({delay})")
+
+async def heartbeat(stop: asyncio.Event, lags: list):
+    """Record how late the loop wakes a 1ms sleeper"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - started - 0.001)
+
+async def blocking_request(query):
+    db = SessionLocal()
+    try:
+        db.execute(query).scalar()
+    finally:
+        db.close()
+
+async def async_request(query):
+    async with AsyncSessionLocal() as db:
+        (await db.execute(query)).scalar()
+
+async def run(label: str, handler, concurrency: int, query):
+    stop = asyncio.Event()
+    lags = []
+    beat = asyncio.create_task(heartbeat(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(handler(query) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await beat
+    print(
+        f"{label:<10} {concurrency / elapsed:8.1f} req/s   "
+        f"wall {elapsed:6.2f}s   max loop stall {max(lags or [0]) * 1000:8.1f} ms"
+    )
+
+async def main(concurrency: int, delay: float):
+    query = slow_query(delay)
+    print(f"📊 {concurrency} concurrent requests, ~{delay * 1000:.0f} ms query "
+          f"({settings.database_url.split(':')[0]})\n")
+    # Warm both pools so connection setup is not measured
+    await blocking_request(text("SELECT 1"))
+    await async_request(text("SELECT 1"))
+    await run("sync", blocking_request, concurrency, query)
+    await run("async", async_request, concurrency, query)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.delay))
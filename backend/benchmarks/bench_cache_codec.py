@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+Benchmark: cache codec vs the old JSON path
+
+Encodes and decodes payloads shaped like Candidate.parsed_data,
+Application.ai_analysis and an AI screening transcript, and reports
+encode/decode time and stored bytes for:
+    json        json.dumps(value, default=str), the pre-codec format
+    <codec>     each registered codec without compression
+    <codec>+z   each registered codec through encode_value (zlib above
+                cache_compress_threshold)
+
+Usage (from backend directory):
+    python -m benchmarks.bench_cache_codec [--iterations 2000]
+"""
+import argparse
+import json
+import random
+import time
+import uuid
+from datetime import datetime
+from app.core.config import settings
+from app.utils.codec import _codecs_by_name, encode_value, decode_value
+
+SKILLS = ["python", "aws", "gcp", "react", "postgres", "kubernetes", "go", "docker", "terraform", "sql"]
+
+def parsed_data_payload():
+    return {
+        "name": "Jane Candidate",
+        "email": "jane@example.com",
+        "skills": random.sample(SKILLS, 6),
+        "experience": [
+            {
+                "company": f"Company {i}",
+                "title": "Senior Software Engineer",
+                "start": datetime(2015 + i, 1, 1),
+                "end": datetime(2016 + i, 6, 1),
+                "summary": "Built and operated distributed services handling "
+                           "millions of requests per day. " * 3,
+            }
+            for i in range(6)
+        ],
+        "education": [{"school": "State University", "degree": "BSc Computer Science", "year": 2014}],
+    }
+
+def ai_analysis_payload():
+    return {
+        "application_id": uuid.uuid4(),
+        "score": 87.5,
+        "strengths": ["Strong Python background", "Cloud experience on AWS and GCP"],
+        "gaps": ["No PHP experience"],
+        "skill_scores": {skill: round(random.random() * 100, 2) for skill in SKILLS},
+        "summary": "The candidate meets most of the requirements for the role. " * 5,
+    }
+
+def transcript_payload():
+    return {
+        "turns": [
+            {
+                "role": "assistant" if i % 2 == 0 else "candidate",
+                "text": "Can you describe a project where you improved system performance? " * 2,
+                "at": datetime(2024, 1, 1, 12, i % 60),
+            }
+            for i in range(40)
+        ]
+    }
+
+def measure(encode, decode, value, iterations: int):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        data = encode(value)
+    encoded = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(iterations):
+        decode(data)
+    decoded = time.perf_counter() - started
+    return encoded / iterations * 1e6, decoded / iterations * 1e6, len(data)
+
+def main(iterations: int):
+    payloads = {
+        "parsed_data": parsed_data_payload(),
+        "ai_analysis": ai_analysis_payload(),
+        "transcript": transcript_payload(),
+    }
+    variants = {"json": (lambda v: json.dumps(v, default=str).encode(), json.loads)}
+    for name, codec in _codecs_by_name.items():
+        variants[name] = (codec.dumps, codec.loads)
+        variants[f"{name}+z"] = (lambda v, c=codec: encode_value(v, c), decode_value)
+
+    print(f"📊 {iterations} iterations, compress threshold {settings.cache_compress_threshold} bytes\n")
+    print(f"{'payload':<12} {'variant':<12} {'encode µs':>10} {'decode µs':>10} {'bytes':>8} {'vs json':>8}")
+    for payload_name, value in payloads.items():
+        baseline = None
+        for variant, (encode, decode) in variants.items():
+            enc_us, dec_us, size = measure(encode, decode, value, iterations)
+            baseline = baseline or size
+            print(f"{payload_name:<12} {variant:<12} {enc_us:10.1f} {dec_us:10.1f} {size:8d} {size / baseline:7.0%}")
+        print()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.iterations)
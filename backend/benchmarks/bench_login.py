@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Benchmark: login latency under a concurrent login burst
+
+Drives app.main.app in-process over an ASGI transport. Seeds one user, then
+fires CONCURRENCY logins while polling /health, and reports p50/p99 for both.
+With --inline the bcrypt call runs on the event loop (the old behaviour), so
+the /health numbers show how much a login burst stalls unrelated endpoints.
+
+Usage (from backend directory):
+    python -m benchmarks.bench_login [--concurrency 32] [--inline]
+"""
+import argparse
+import asyncio
+import time
+import httpx
+from app.core import security
+from app.core.database import async_engine, Base
+from app.main import app
+
+EMAIL = "bench-login@example.com"
+PASSWORD = "benchpass123"
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def report(label: str, samples):
+    print(
+        f"{label:<8} n={len(samples):<5} "
+        f"p50 {percentile(samples, 50) * 1000:8.1f} ms   "
+        f"p99 {percentile(samples, 99) * 1000:8.1f} ms   "
+        f"max {max(samples) * 1000:8.1f} ms"
+    )
+
+async def timed(client: httpx.AsyncClient, method: str, url: str, samples: list, statuses: list, **kwargs):
+    started = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    samples.append(time.perf_counter() - started)
+    statuses.append(response.status_code)
+
+async def poll_health(client: httpx.AsyncClient, stop: asyncio.Event, samples: list):
+    statuses = []
+    while not stop.is_set():
+        await timed(client, "GET", "/health", samples, statuses)
+        await asyncio.sleep(0.005)
+
+async def main(concurrency: int, inline: bool):
+    if inline:
+        async def run_inline(func, *args):
+            return func(*args)
+        security._run_hash_job = run_inline
+    # Measure hashing, not the per-IP login limit
+    security.settings.rate_limit_enabled = False
+
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+        await client.post("/api/v1/auth/register", json={"email": EMAIL, "password": PASSWORD})
+
+        login_samples, login_statuses, health_samples = [], [], []
+        stop = asyncio.Event()
+        poller = asyncio.create_task(poll_health(client, stop, health_samples))
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            timed(client, "POST", "/api/v1/auth/login", login_samples, login_statuses,
+                  json={"email": EMAIL, "password": PASSWORD})
+            for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await poller
+
+    mode = "inline" if inline else f"executor({security.settings.password_hash_workers} workers)"
+    print(f"📊 {concurrency} concurrent logins, bcrypt rounds={security.settings.bcrypt_rounds}, {mode}\n")
+    report("login", login_samples)
+    report("/health", health_samples or [0.0])
+    rejected = login_statuses.count(503)
+    print(f"\n{concurrency / elapsed:.1f} logins/s, {rejected} rejected with 503, "
+          f"statuses: {dict((s, login_statuses.count(s)) for s in set(login_statuses))}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--inline", action="store_true", help="hash on the event loop (old behaviour)")
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.inline))
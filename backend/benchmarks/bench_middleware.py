@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Benchmark: BaseHTTPMiddleware decorators vs pure ASGI middleware
+
+Drives the app in-process with N concurrent clients and reports requests
+per second on /health and on an authenticated, DB-backed list
+(/api/v1/jobs), first with the security-header and request-logging
+middleware as the old `@app.middleware("http")` functions, then with the
+pure ASGI classes the app uses now. Uses the configured DATABASE_URL.
+
+Usage (from backend directory):
+    python -m benchmarks.bench_middleware [--requests 5000] [--concurrency 32]
+"""
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+import httpx
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.config import settings
+from app.core.migrations import migrate_database
+from app.utils.middleware import RequestLoggingMiddleware, SecurityHeadersMiddleware
+
+logger = logging.getLogger("app.main")
+
+# The decorators app.main used before the pure ASGI middleware
+async def add_security_headers(request, call_next):
+    response = await call_next(request)
+    response.headers["X-Content-Type-Options"] = "nosniff"
+    response.headers["X-Frame-Options"] = "DENY"
+    response.headers["X-XSS-Protection"] = "1; mode=block"
+    response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+    return response
+
+async def log_requests(request, call_next):
+    start_time = time.time()
+    response = await call_next(request)
+    process_time = time.time() - start_time
+    logger.info(
+        f"{request.method} {request.url.path} "
+        f"completed in {process_time:.3f}s "
+        f"with status {response.status_code}"
+    )
+    return response
+
+LEGACY = {
+    SecurityHeadersMiddleware: add_security_headers,
+    RequestLoggingMiddleware: log_requests,
+}
+
+def use_middleware(app, original: list, legacy: bool):
+    """Swap the two middleware classes for their decorator versions in place"""
+    app.user_middleware = [
+        Middleware(BaseHTTPMiddleware, dispatch=LEGACY[middleware.cls])
+        if legacy and middleware.cls in LEGACY else middleware
+        for middleware in original
+    ]
+    app.middleware_stack = None
+
+async def run(client: httpx.AsyncClient, url: str, headers: dict, requests: int, concurrency: int) -> float:
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            response = await client.get(url, headers=headers)
+            assert response.status_code == 200, response.text
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return requests / (time.perf_counter() - started)
+
+async def main(requests: int, concurrency: int):
+    # Request log lines are formatted either way; keep them off the console
+    logging.disable(logging.INFO)
+    settings.rate_limit_enabled = False
+    await migrate_database()
+    from app.main import app
+    original = list(app.user_middleware)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+        email = f"bench-middleware-{uuid.uuid4().hex[:8]}@example.com"
+        await client.post("/api/v1/auth/register", json={
+            "email": email, "password": "BenchPassw0rd!", "full_name": "Bench", "organization_name": "bench-middleware"
+        })
+        token = (await client.post("/api/v1/auth/login", json={"email": email, "password": "BenchPassw0rd!"})).json()["access_token"]
+        auth = {"Authorization": f"Bearer {token}"}
+
+        print(f"📊 {requests:,} requests, concurrency {concurrency}\n")
+        print(f"{'endpoint':<16} {'decorators':>14} {'pure ASGI':>14} {'change':>8}")
+        for label, url, headers in (("/health", "/health", {}), ("/api/v1/jobs", "/api/v1/jobs", auth)):
+            results = {}
+            for legacy in (True, False):
+                use_middleware(app, original, legacy)
+                await run(client, url, headers, min(requests // 10, 200), concurrency)  # warm up
+                results[legacy] = await run(client, url, headers, requests, concurrency)
+            print(f"{label:<16} {results[True]:10,.0f} r/s {results[False]:10,.0f} r/s {results[False] / results[True] - 1:+7.0%}")
+    use_middleware(app, original, legacy=False)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""
+Benchmark: OFFSET vs keyset pagination, and NDJSON export
+
+Seeds N applications for one organization, then times fetching a page at
+increasing depths with LIMIT/OFFSET and with a (created_at, id) cursor, and
+streams the full export reporting time to first byte, throughput and peak
+RSS growth. Uses the configured DATABASE_URL.
+
+Usage (from backend directory):
+    python -m benchmarks.bench_pagination [--n 500000] [--page 50]
+"""
+import argparse
+import asyncio
+import resource
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import delete, insert, select
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, async_engine, Base
+from app.models import Application, Candidate, Job, Organization
+from app.schemas import ApplicationResponse
+from app.services.pagination import encode_cursor, export_ndjson, keyset_order, keyset_page, schema_columns
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+async def seed(n: int) -> uuid.UUID:
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as db:
+        organization = Organization(name="bench-pagination")
+        db.add(organization)
+        await db.flush()
+        job = Job(organization_id=organization.id, title="Backend Engineer")
+        candidate = Candidate(email="bench-pagination@example.com")
+        db.add_all([job, candidate])
+        await db.commit()
+        connection = await db.connection()
+        started = datetime(2024, 1, 1)
+        for offset in range(0, n, 10000):
+            await connection.execute(insert(Application), [
+                {"id": uuid.uuid4(), "job_id": job.id, "candidate_id": candidate.id, "status": "pending",
+                 "created_at": started + timedelta(seconds=i // 3)}
+                for i in range(offset, min(offset + 10000, n))
+            ])
+        await db.commit()
+        return job.id
+
+async def cleanup(job_id: uuid.UUID):
+    async with AsyncSessionLocal() as db:
+        job = await db.get(Job, job_id)
+        await db.execute(delete(Application).where(Application.job_id == job_id))
+        await db.execute(delete(Candidate).where(Candidate.email == "bench-pagination@example.com"))
+        await db.execute(delete(Job).where(Job.id == job_id))
+        await db.execute(delete(Organization).where(Organization.id == job.organization_id))
+        await db.commit()
+
+async def main(n: int, page: int):
+    job_id = await seed(n)
+    query = select(Application).where(Application.job_id == job_id)
+    print(f"📊 {n:,} applications, page size {page}\n")
+    print(f"{'depth':>10} {'offset':>12} {'keyset':>12}")
+    async with AsyncSessionLocal() as db:
+        for depth in (0, n // 100, n // 10, n // 2, n - page):
+            started = time.perf_counter()
+            await db.execute(keyset_order(query, Application).offset(depth).limit(page))
+            offset_ms = (time.perf_counter() - started) * 1000
+
+            # Cursor of the row just before `depth`, as a client would hold it
+            cursor = None
+            if depth:
+                row = (await db.execute(
+                    keyset_order(select(Application.created_at, Application.id).where(Application.job_id == job_id), Application)
+                    .offset(depth - 1).limit(1)
+                )).one()
+                cursor = encode_cursor(row.created_at, row.id)
+            started = time.perf_counter()
+            await keyset_page(db, query, Application, ApplicationResponse, cursor, page)
+            keyset_ms = (time.perf_counter() - started) * 1000
+            print(f"{depth:>10,} {offset_ms:9.1f} ms {keyset_ms:9.1f} ms")
+
+    rss_before = peak_rss_mb()
+    columns = select(*schema_columns(Application, ApplicationResponse)).where(Application.job_id == job_id)
+    async with AsyncSessionLocal() as db:
+        started = time.perf_counter()
+        first_byte = None
+        rows = size = 0
+        async for chunk in export_ndjson(db, columns, Application, ApplicationResponse, settings.export_batch_size):
+            if first_byte is None:
+                first_byte = time.perf_counter() - started
+            rows += chunk.count("\n")
+            size += len(chunk)
+        elapsed = time.perf_counter() - started
+    print(f"\nexport   {rows:,} rows, {size / 1e6:.1f} MB in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s)")
+    print(f"first byte after {first_byte * 1000:.1f} ms; peak RSS grew {peak_rss_mb() - rss_before:.1f} MB")
+    await cleanup(job_id)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--n", type=int, default=500000)
+    parser.add_argument("--page", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.n, args.page))
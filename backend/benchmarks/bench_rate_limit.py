@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""
+Benchmark: per-request cost of the rate limiter
+
+Times `check_rate_limit` for the default minute+hour policy over many
+identities, first with the in-process buckets and then, if REDIS_URL is
+reachable, with the Lua script (one round trip per check). Also drives
+/health and a rate-limited API route in-process to show the end-to-end
+overhead of the dependency.
+
+Usage (from backend directory):
+    python -m benchmarks.bench_rate_limit [--n 100000] [--identities 1000]
+"""
+import argparse
+import asyncio
+import logging
+import time
+import httpx
+from app.core.config import settings
+from app.utils import rate_limit
+from app.utils.cache import get_async_redis
+
+def report(label: str, n: int, elapsed: float, unit: str = "check"):
+    print(f"{label:<22} {elapsed / n * 1e6:8.2f} µs/{unit:<8} {n / elapsed:12,.0f} {unit}s/s")
+
+async def time_checks(n: int, identities: int) -> float:
+    policy = rate_limit.RateLimit("bench", per_minute=n, per_hour=n * 60)
+    started = time.perf_counter()
+    for i in range(n):
+        await rate_limit.check_rate_limit(policy, f"user:{i % identities}")
+    return time.perf_counter() - started
+
+async def time_requests(client: httpx.AsyncClient, url: str, n: int) -> float:
+    started = time.perf_counter()
+    for _ in range(n):
+        await client.get(url)
+    return time.perf_counter() - started
+
+async def main(n: int, identities: int):
+    logging.disable(logging.WARNING)
+    # In-process buckets: force the fallback path
+    rate_limit._redis_failed_at = time.monotonic()
+    settings.rate_limit_redis_retry = 1e9
+    report("in-process", n, await time_checks(n, identities))
+
+    settings.rate_limit_redis_retry = 0
+    rate_limit._redis_failed_at = None
+    if await get_async_redis() is not None:
+        report("redis (lua)", n // 10, await time_checks(n // 10, identities))
+    else:
+        print("redis (lua)            skipped: Redis not reachable")
+
+    # End to end: the limiter runs before auth, so a 401 still pays for it
+    from app.main import app
+    settings.rate_limit_per_minute = settings.rate_limit_per_hour = n * 10
+    rate_limit._default = None
+    requests = min(n // 10, 5000)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+        await client.get("/api/v1/auth/me")
+        settings.rate_limit_enabled = False
+        unlimited = await time_requests(client, "/api/v1/auth/me", requests)
+        settings.rate_limit_enabled = True
+        limited = await time_requests(client, "/api/v1/auth/me", requests)
+    report("request, limiter off", requests, unlimited, "request")
+    report("request, limiter on", requests, limited, "request")
+    print(f"\noverhead per request: {(limited - unlimited) / requests * 1e6:.1f} µs")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--n", type=int, default=100000)
+    parser.add_argument("--identities", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.n, args.identities))
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""
+Benchmark: resume ingestion throughput in files per second
+
+Generates N synthetic resumes (a mix of PDF, DOCX and TXT), zips them and
+runs the ingestion pipeline end to end: zip expansion, text extraction on
+the process pool and batched hand-off to the writer. The writer is a no-op
+unless --db is given, so by default this measures extraction throughput.
+
+Usage (from backend directory):
+    python -m benchmarks.bench_resume_ingest [--n 2000] [--workers 0] [--db]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+import zipfile
+from docx import Document
+from app.core.config import settings
+from app.services import resume_ingestion
+from app.services.resume_ingestion import IngestionJob, run_ingestion, write_candidates
+
+FIRST_NAMES = ["Asha", "Ben", "Chen", "Dana", "Elif", "Farid", "Grace", "Hiro", "Ines", "Jonas"]
+LAST_NAMES = ["Kumar", "Lopez", "Moreau", "Nakamura", "Okafor", "Petrov", "Quinn", "Rossi", "Silva", "Tanaka"]
+SKILLS = ["Python", "FastAPI", "PostgreSQL", "AWS", "Docker", "React", "Go", "Kubernetes", "Java", "SQL"]
+
+def resume_lines(i: int, rng: random.Random):
+    skills = ", ".join(rng.sample(SKILLS, 4))
+    lines = [
+        f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        f"candidate{i}@example.com  +1 555 010 {i % 10000:04d}",
+        f"Backend engineer with {rng.randint(1, 15)} years of experience",
+        f"Skills: {skills}",
+    ]
+    lines += [f"Built and operated service {j} handling {rng.randint(1, 900)}k requests per day" for j in range(20)]
+    return lines
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def write_pdf(path: str, lines):
+    """Minimal single-page PDF with one text line per resume line"""
+    stream = "BT /F1 10 Tf 50 780 Td 12 TL " + " ".join(f"({_pdf_escape(line)}) '" for line in lines) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    body, offsets = "%PDF-1.4\n", []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{obj}\nendobj\n"
+    xref = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    body += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    with open(path, "w", encoding="latin-1") as f:
+        f.write(body)
+
+def write_docx(path: str, lines):
+    document = Document()
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(path)
+
+def write_txt(path: str, lines):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+WRITERS = {".pdf": write_pdf, ".docx": write_docx, ".txt": write_txt}
+
+def build_archive(directory: str, n: int) -> str:
+    rng = random.Random(42)
+    archive = os.path.join(directory, "resumes.zip")
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(n):
+            extension = (".pdf", ".docx", ".txt")[i % 3]
+            path = os.path.join(directory, f"resume{i}{extension}")
+            WRITERS[extension](path, resume_lines(i, rng))
+            zf.write(path, f"resumes/resume{i}{extension}")
+            os.remove(path)
+    return archive
+
+async def discard(batch):
+    pass
+
+async def main(n: int, use_db: bool):
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        archive = build_archive(directory, n)
+        print(f"📦 generated {n} resumes ({os.path.getsize(archive) / 1e6:.1f} MB zip) in {time.perf_counter() - started:.1f}s")
+
+        if use_db:
+            from app.core.database import async_engine, Base
+            async with async_engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+
+        job_directory = os.path.join(directory, "job")
+        os.makedirs(job_directory)
+        job = IngestionJob(job_directory)
+        item = job.add_file("resumes.zip", os.path.join(job_directory, "upload.zip"))
+        os.replace(archive, item.path)
+
+        # Warm the pool so process start-up is not counted
+        await asyncio.gather(*[
+            asyncio.get_running_loop().run_in_executor(resume_ingestion._get_pool(), os.getpid)
+            for _ in range(resume_ingestion.ingest_workers())
+        ])
+        started = time.perf_counter()
+        await run_ingestion(job, writer=write_candidates if use_db else discard)
+        elapsed = time.perf_counter() - started
+        resume_ingestion.shutdown_ingestion()
+
+        counts = job.counts()
+        print(f"📊 workers={resume_ingestion.ingest_workers()} batch={settings.resume_ingest_batch_size} db={use_db}\n")
+        print(f"ingested {counts['done'] - 1:6d} files in {elapsed:.2f}s  →  {(counts['done'] - 1) / elapsed:,.1f} files/s")
+        print(f"failed   {counts['failed']:6d}   skipped {counts['skipped']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--n", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=0, help="Process pool size (0 = one per core)")
+    parser.add_argument("--db", action="store_true", help="Write candidates to DATABASE_URL")
+    args = parser.parse_args()
+    settings.resume_ingest_workers = args.workers
+    asyncio.run(main(args.n, args.db))
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+Bulk import candidates from a CSV or JSONL file (e.g. an ATS export)
+
+CSV files need a header row using CandidateImport field names (email, name,
+phone, location, linkedin_url, linkedin_id, resume_text, skills,
+experience_years, source); skills may be separated by ";" or ",".
+
+Usage (from backend directory):
+    python import_candidates.py export.csv [--format csv] [--batch-size 1000] [--errors errors.jsonl]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from app.core.config import settings
+from app.core.database import async_engine
+from app.core.migrations import SchemaVersionError, prepare_database
+from app.services.candidate_import import FORMATS, detect_format, import_candidates
+
+async def run(path: str, fmt: str, batch_size: int, errors_path: str = None):
+    try:
+        await prepare_database()
+    except SchemaVersionError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    errors = open(errors_path, "w") if errors_path else None
+    started = time.perf_counter()
+    shown = 0
+    try:
+        async for event in import_candidates(path, fmt, batch_size):
+            if "row" in event:
+                if errors:
+                    errors.write(json.dumps(event) + "\n")
+                elif shown < 20:
+                    print(f"  ⚠️  row {event['row']}: {'; '.join(event['errors'])}")
+                    shown += 1
+                continue
+            rate = event["processed"] / max(time.perf_counter() - started, 1e-9)
+            print(
+                f"{'✅' if event.get('done') else '⏳'} {event['processed']:,} rows  "
+                f"inserted {event['inserted']:,}  updated {event['updated']:,}  "
+                f"duplicates {event['duplicates']:,}  failed {event['failed']:,}  ({rate:,.0f} rows/s)"
+            )
+    finally:
+        if errors:
+            errors.close()
+        await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import candidates from CSV or JSONL")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=settings.candidate_import_batch_size)
+    parser.add_argument("--errors", help="Write rejected rows to this JSONL file")
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(filename=args.path)
+    if fmt is None:
+        print("❌ Could not tell the format from the file name; pass --format csv|jsonl")
+        sys.exit(1)
+    asyncio.run(run(args.path, fmt, args.batch_size, args.errors))
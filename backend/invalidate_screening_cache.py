@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""
+Drop cached AI screening results
+
+The cache is shared by every organization, so invalidating it is an
+operator task rather than an API call. By default removes the results of
+every prompt version except the current one; run it after changing the
+screening prompt or model to reclaim space.
+
+Usage (from backend directory):
+    python invalidate_screening_cache.py [--prompt-version VERSION]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from app.core.database import async_engine
+from app.core.migrations import SchemaVersionError, prepare_database
+from app.services.screening import PROMPT_VERSION
+from app.services.screening_cache import ScreeningCache
+
+async def run(prompt_version: str = None):
+    try:
+        await prepare_database()
+    except SchemaVersionError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    started = time.perf_counter()
+    try:
+        if prompt_version is None:
+            removed = await ScreeningCache().invalidate(keep_version=PROMPT_VERSION)
+        else:
+            removed = await ScreeningCache().invalidate(prompt_version=prompt_version)
+    finally:
+        await async_engine.dispose()
+    scope = f"prompt version {prompt_version}" if prompt_version else f"all but the current version ({PROMPT_VERSION})"
+    print(f"✅ Removed {removed:,} cached screening results of {scope} in {time.perf_counter() - started:.2f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--prompt-version", help="version to drop; defaults to every version except the current one")
+    args = parser.parse_args()
+    asyncio.run(run(args.prompt_version))
@@ -102,11 +102,12 @@ def create_database():
     """Create database tables"""
     print("\nCreating database tables...")
     try:
-        from app.core.database import engine, Base
-        from app.models import User, Organization, Job, Candidate, Application
+        from app.core.database import engine
+        from app.core.migrations import upgrade
         
-        Base.metadata.create_all(bind=engine)
-        print("✓ Database tables created")
+        with engine.begin() as connection:
+            upgrade(connection)
+        print("✓ Database tables created (migrated to the latest revision)")
         return True
     except Exception as e:
         print(f"❌ Database error: {e}")
@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+"""
+Rebuild the semantic candidate index from the candidates table
+
+Re-embeds every candidate into a side directory and swaps it in. Safe to
+run while the API is serving: the worker that maintains the index stops
+applying changes during the rebuild, swaps the new index in and then
+applies the changes queued meanwhile. Run it after the first deployment
+of semantic search, or after changing EMBEDDING_BACKEND / EMBEDDING_MODEL.
+
+Usage (from backend directory):
+    python rebuild_candidate_index.py [--batch-size 1000]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from app.core.database import async_engine
+from app.core.migrations import SchemaVersionError, prepare_database
+from app.services.candidate_matching import rebuild_candidate_index
+
+async def run(batch_size: int):
+    try:
+        await prepare_database()
+    except SchemaVersionError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    started = time.perf_counter()
+    try:
+        size = await rebuild_candidate_index(batch_size)
+    finally:
+        await async_engine.dispose()
+    print(f"✅ Rebuilt candidate index: {size:,} candidates in {time.perf_counter() - started:.2f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.batch_size))
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""
+Reconcile the pipeline_stats table with the applications it counts
+
+Recomputes per-job and per-organization status counts and score histograms
+from scratch and rewrites only the rows that drifted. Safe to run while the
+API is serving; schedule it (e.g. hourly from cron) to repair changes made
+outside the ORM and screening write paths.
+
+Usage (from backend directory):
+    python rebuild_pipeline_stats.py [--organization ORGANIZATION_ID]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from uuid import UUID
+from app.core.database import async_engine
+from app.core.migrations import SchemaVersionError, prepare_database
+from app.services.pipeline_stats import rebuild_pipeline_stats
+
+async def run(organization_id: UUID = None):
+    try:
+        await prepare_database()
+    except SchemaVersionError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    started = time.perf_counter()
+    try:
+        result = await rebuild_pipeline_stats(organization_id)
+    finally:
+        await async_engine.dispose()
+    scope = f"organization {organization_id}" if organization_id else "all organizations"
+    print(
+        f"✅ Rebuilt pipeline stats for {scope}: {result['rows']:,} rows, "
+        f"{result['corrected']:,} corrected in {time.perf_counter() - started:.2f}s"
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--organization", type=UUID, help="only this organization's jobs")
+    args = parser.parse_args()
+    asyncio.run(run(args.organization))
@@ -1,10 +1,71 @@
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
 import uvicorn
 from app.core.config import settings
 
+def profile_imports(top: int = 15):
+    """Import app.main in a fresh interpreter with -X importtime and summarize"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(own) / 1e6, int(cumulative) / 1e6))
+    if not modules:
+        print(result.stderr)
+        return
+
+    total = next(cumulative for name, _, cumulative in modules if name == "app.main")
+    print(f"Import of app.main: {total * 1000:.0f} ms\n")
+
+    print(f"{'app module (incl. its imports)':<44} {'cumulative':>10} {'self':>9}")
+    app_modules = sorted((m for m in modules if m[0].startswith("app.")), key=lambda m: m[2], reverse=True)
+    for name, own, cumulative in app_modules[:top]:
+        print(f"{name:<44} {cumulative * 1000:7.1f} ms {own * 1000:6.1f} ms")
+
+    packages = defaultdict(float)
+    for name, own, _ in modules:
+        packages[name.split(".")[0]] += own
+    print(f"\n{'package (own import time)':<44} {'self':>10}")
+    for name, own in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"{name:<44} {own * 1000:7.1f} ms")
+
+async def profile_lifespan(app, startup_timings):
+    started = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter() - started
+    print(f"\nStartup (lifespan): {ready * 1000:.0f} ms")
+    for step, seconds in startup_timings.items():
+        print(f"{step:<44} {seconds * 1000:7.1f} ms")
+
+def profile_startup():
+    """Report import time per module and time per startup step, then exit"""
+    profile_imports()
+    started = time.perf_counter()
+    from app.main import app, startup_timings
+    print(f"\nImport of app.main (this process): {(time.perf_counter() - started) * 1000:.0f} ms")
+    asyncio.run(profile_lifespan(app, startup_timings))
+
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app",
-        host=settings.api_host,
-        port=settings.api_port,
-        reload=settings.debug
-    )
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the Hireova API")
+    parser.add_argument("--profile-startup", action="store_true", help="report import and startup time per module and step, then exit")
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        profile_startup()
+    else:
+        uvicorn.run(
+            "app.main:app",
+            host=settings.api_host,
+            port=settings.api_port,
+            reload=settings.debug
+        )
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Production launcher: gunicorn with uvicorn workers.
+
+- WEB_WORKERS worker processes (0 = one per CPU core), forked from a master
+  that imports the app once (preload) unless --no-preload is given.
+- Workers are recycled after WORKER_MAX_REQUESTS requests (plus jitter, so
+  they do not all restart together) and get WORKER_GRACEFUL_TIMEOUT seconds
+  to finish in-flight requests on shutdown.
+- `kill -HUP <master pid>` replaces the workers gracefully. With preload the
+  new workers reuse the code loaded by the master; start with --no-preload
+  to have HUP pick up a new release as well.
+- Per-worker pool sizes come from DATABASE_CONNECTION_BUDGET, and the
+  launcher refuses to start if the workers could open more connections than
+  the database's max_connections (see app.core.connection_budget).
+- Migrations that the API would run on startup (outside production) run
+  once here, before the workers start.
+
+Usage (from backend directory):
+    python serve.py [--workers 4] [--bind 0.0.0.0:8000] [--budget 80] [--no-preload] [--check]
+"""
+import argparse
+import asyncio
+import os
+import sys
+from gunicorn.app.base import BaseApplication
+from app.core.config import settings
+from app.core.connection_budget import ConnectionBudgetError, apply_plan, check_budget, plan_pools
+
+def post_fork(server, worker):
+    # Connections opened by the master (preload) must not be shared with the
+    # workers; drop them from each worker's pools without closing them
+    from app.core.database import async_engine, engine
+    async_engine.sync_engine.dispose(close=False)
+    engine.dispose(close=False)
+
+async def migrate_once():
+    from app.core.database import async_engine
+    from app.core.migrations import migrate_database
+    try:
+        await migrate_database()
+    finally:
+        await async_engine.dispose()
+
+class HireovaApplication(BaseApplication):
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app.main import app
+        return app
+
+def gunicorn_options(workers: int, bind: str, preload: bool):
+    return {
+        "bind": bind,
+        "workers": workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": preload,
+        "max_requests": settings.worker_max_requests,
+        "max_requests_jitter": settings.worker_max_requests_jitter,
+        "timeout": settings.worker_timeout,
+        "graceful_timeout": settings.worker_graceful_timeout,
+        "post_fork": post_fork,
+        "accesslog": None,  # RequestLoggingMiddleware logs requests
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Hireova API with multiple workers")
+    parser.add_argument("--workers", type=int, default=settings.web_workers or os.cpu_count() or 1)
+    parser.add_argument("--bind", default=f"{settings.api_host}:{settings.api_port}")
+    parser.add_argument("--budget", type=int, default=None, help="total database connections for all workers (default DATABASE_CONNECTION_BUDGET)")
+    parser.add_argument("--no-preload", dest="preload", action="store_false", help="import the app in each worker, so HUP reloads code")
+    parser.add_argument("--check", action="store_true", help="print the pool plan and check it against the database, then exit")
+    args = parser.parse_args()
+
+    try:
+        plan = plan_pools(args.workers, args.budget)
+        check_budget(plan)
+    except ConnectionBudgetError as e:
+        sys.exit(f"Refusing to start: {e}")
+    print(
+        f"{plan.workers} workers, pool_size={plan.pool_size} max_overflow={plan.max_overflow} "
+        f"per worker, {plan.total} database connections at most"
+    )
+    if args.check:
+        sys.exit(0)
+
+    # Before the app (and app.core.database) is imported by the master or the workers
+    apply_plan(plan)
+    # Migrate here rather than in every worker's startup, where they would
+    # race each other; the workers then only check the schema version
+    from app.core.migrations import migrates_on_startup
+    if migrates_on_startup():
+        asyncio.run(migrate_once())
+        settings.migrate_on_startup = False
+    HireovaApplication(gunicorn_options(plan.workers, args.bind, args.preload)).run()
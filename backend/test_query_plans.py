@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+"""
+Check that the hiring pipeline's hot queries use their indexes
+
+Migrates a scratch database (a temporary SQLite file, or --database-url,
+inside a transaction that is rolled back), seeds it, and captures the
+EXPLAIN plan of each canonical query. A query whose plan no longer uses
+its expected index fails the run, so a dropped index or a query change
+that defeats it is caught.
+
+Usage (from backend directory):
+    python test_query_plans.py [--database-url postgresql://...] [--verbose]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, func, insert, select, text
+from app.core.migrations import upgrade
+from app.models import Application, Candidate, Job, Organization
+from app.services.pagination import keyset_order
+from app.services.screening import screening_query
+
+def seed(connection):
+    """Two organizations, 40 jobs, 2000 candidates, 20000 applications"""
+    organizations = [uuid.uuid4(), uuid.uuid4()]
+    connection.execute(insert(Organization), [{"id": id, "name": f"Org {i}"} for i, id in enumerate(organizations)])
+    started = datetime(2024, 1, 1)
+    jobs = [
+        {"id": uuid.uuid4(), "organization_id": organizations[i % 2], "title": f"Job {i}",
+         "status": ("active", "paused", "closed")[i % 3], "created_at": started + timedelta(days=i)}
+        for i in range(40)
+    ]
+    connection.execute(insert(Job), jobs)
+    candidates = [
+        {"id": uuid.uuid4(), "email": f"candidate{i}@example.com", "resume_text": "python sql",
+         "created_at": started + timedelta(minutes=i)}
+        for i in range(2000)
+    ]
+    connection.execute(insert(Candidate), candidates)
+    connection.execute(insert(Application), [
+        {"id": uuid.uuid4(), "job_id": jobs[i % 40]["id"], "candidate_id": candidates[i % 2000]["id"],
+         "status": ("pending", "screening", "interviewed", "rejected", "hired")[i % 5],
+         "ai_score": (i * 37 % 100) if i % 2 else None, "created_at": started + timedelta(seconds=i)}
+        for i in range(20000)
+    ])
+    return organizations[0], jobs[0]["id"], candidates[0]["id"]
+
+def canonical_queries(organization_id, job_id, candidate_id):
+    """(name, statement, expected index) for each hot access path"""
+    return [
+        ("top applicants for a job by score",
+         select(Application).where(Application.job_id == job_id, Application.ai_score.isnot(None))
+         .order_by(Application.ai_score.desc()).limit(20),
+         "ix_applications_job_score"),
+        ("active jobs for my organization",
+         keyset_order(select(Job).where(Job.organization_id == organization_id, Job.status == "active"), Job).limit(50),
+         "ix_jobs_organization_status"),
+        ("jobs page for my organization",
+         keyset_order(select(Job).where(Job.organization_id == organization_id), Job).limit(50),
+         "ix_jobs_organization_created"),
+        ("a job's applications at one stage",
+         select(Application).where(Application.job_id == job_id, Application.status == "screening"),
+         "ix_applications_job_status"),
+        ("a job's applications page",
+         keyset_order(select(Application).where(Application.job_id == job_id), Application).limit(50),
+         "ix_applications_job_created"),
+        ("a candidate's applications",
+         select(Application).where(Application.candidate_id == candidate_id),
+         "ix_applications_candidate"),
+        ("candidates by email (imports, resume ingestion)",
+         select(Candidate.id).where(func.lower(Candidate.email).in_(["candidate1@example.com", "candidate2@example.com"])),
+         "ix_candidates_email_lower"),
+        ("screening backlog for a job",
+         screening_query(organization_id, job_id=job_id),
+         "ix_applications_job_unscreened"),
+    ]
+
+def explain(connection, statement):
+    """Plan lines and the names of the indexes the plan uses"""
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+    if connection.dialect.name == "postgresql":
+        plan = connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        plan = plan if isinstance(plan, list) else json.loads(plan)
+        indexes, lines = [], []
+
+        def walk(node, depth=0):
+            lines.append("  " * depth + node["Node Type"] + (f" using {node['Index Name']}" if "Index Name" in node else ""))
+            if "Index Name" in node:
+                indexes.append(node["Index Name"])
+            for child in node.get("Plans", []):
+                walk(child, depth + 1)
+
+        walk(plan[0]["Plan"])
+        return lines, indexes
+    lines = [row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+    indexes = [name for line in lines for name in re.findall(r"USING (?:COVERING )?INDEX (\w+)", line)]
+    return lines, indexes
+
+def run(database_url: str, verbose: bool) -> bool:
+    engine = create_engine(database_url)
+    passed = True
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            upgrade(connection)
+            organization_id, job_id, candidate_id = seed(connection)
+            connection.execute(text("ANALYZE"))
+            if connection.dialect.name == "postgresql":
+                # Tiny tables: ask whether an index *can* serve the query
+                connection.execute(text("SET LOCAL enable_seqscan = off"))
+
+            print(f"Query plans on {connection.dialect.name}\n")
+            for name, statement, expected in canonical_queries(organization_id, job_id, candidate_id):
+                lines, indexes = explain(connection, statement)
+                ok = expected in indexes
+                passed = passed and ok
+                print(f"{'✓' if ok else '✗'} {name}: {', '.join(indexes) or 'no index'}")
+                if verbose or not ok:
+                    if not ok:
+                        print(f"  expected {expected}")
+                    for line in lines:
+                        print(f"    {line}")
+        finally:
+            transaction.rollback()
+    engine.dispose()
+    return passed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite database")
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    print("🔍 Hireova query plan check\n")
+    if args.database_url:
+        passed = run(args.database_url, args.verbose)
+    else:
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        try:
+            passed = run(f"sqlite:///{path}", args.verbose)
+        finally:
+            os.remove(path)
+
+    if not passed:
+        print("\n❌ Some queries no longer use their indexes")
+        sys.exit(1)
+    print("\n✅ All hot queries use their indexes")
+
+if __name__ == "__main__":
+    main()